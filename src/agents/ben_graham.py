@@ -7,10 +7,31 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 from src.utils.llm import call_llm
 import math
 
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+BEN_GRAHAM_LINE_ITEMS = {
+    "line_items": [
+        "earnings_per_share",
+        "revenue",
+        "net_income",
+        "book_value_per_share",
+        "total_assets",
+        "total_liabilities",
+        "current_assets",
+        "current_liabilities",
+        "dividends_and_other_cash_distributions",
+        "outstanding_shares",
+    ],
+    "period": "annual",
+    "limit": 10,
+}
+
+
 class BenGrahamSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -29,15 +50,13 @@ def ben_graham_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    analysis_data = {}
-    graham_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("ben_graham_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)
 
         progress.update_status("ben_graham_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(ticker, ["earnings_per_share", "revenue", "net_income", "book_value_per_share", "total_assets", "total_liabilities", "current_assets", "current_liabilities", "dividends_and_other_cash_distributions", "outstanding_shares"], end_date, period="annual", limit=10)
+        financial_line_items = search_line_items(ticker, end_date=end_date, **BEN_GRAHAM_LINE_ITEMS)
 
         progress.update_status("ben_graham_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -64,19 +83,27 @@ def ben_graham_agent(state: AgentState):
         else:
             signal = "neutral"
 
-        analysis_data[ticker] = {"signal": signal, "score": total_score, "max_score": max_possible_score, "earnings_analysis": earnings_analysis, "strength_analysis": strength_analysis, "valuation_analysis": valuation_analysis}
+        return {"signal": signal, "score": total_score, "max_score": max_possible_score, "earnings_analysis": earnings_analysis, "strength_analysis": strength_analysis, "valuation_analysis": valuation_analysis}
 
-        progress.update_status("ben_graham_agent", ticker, "Generating Ben Graham analysis")
-        graham_output = generate_graham_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    graham_analysis = generate_persona_signals(
+        agent_name="ben_graham_agent",
+        persona="Ben Graham",
+        analysis_data=analysis_data,
+        system_prompt=BEN_GRAHAM_SYSTEM_PROMPT,
+        signal_model=BenGrahamSignal,
+        generate_single=lambda ticker, llm_call: generate_graham_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        graham_analysis[ticker] = {"signal": graham_output.signal, "confidence": graham_output.confidence, "reasoning": graham_output.reasoning}
-
-        progress.update_status("ben_graham_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+    )
 
     # Wrap results in a single message for the chain
     message = HumanMessage(content=json.dumps(graham_analysis), name="ben_graham_agent")
@@ -276,22 +303,7 @@ def analyze_valuation_graham(metrics: list, financial_line_items: list, market_c
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_graham_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> BenGrahamSignal:
-    """
-    Generates an investment decision in the style of Benjamin Graham:
-    - Value emphasis, margin of safety, net-nets, conservative balance sheet, stable earnings.
-    - Return the result in a JSON structure: { signal, confidence, reasoning }.
-    """
-
-    template = ChatPromptTemplate.from_messages([
-        (
-            "system",
-            """You are a Benjamin Graham AI agent, making investment decisions using his principles:
+BEN_GRAHAM_SYSTEM_PROMPT = """You are a Benjamin Graham AI agent, making investment decisions using his principles:
             1. Insist on a margin of safety by buying below intrinsic value (e.g., using Graham Number, net-net).
             2. Emphasize the company's financial strength (low leverage, ample current assets).
             3. Prefer stable earnings over multiple years.
@@ -311,6 +323,25 @@ def generate_graham_output(
                         
             Return a rational recommendation: bullish, bearish, or neutral, with a confidence level (0-100) and thorough reasoning.
             """
+
+
+def generate_graham_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> BenGrahamSignal:
+    """
+    Generates an investment decision in the style of Benjamin Graham:
+    - Value emphasis, margin of safety, net-nets, conservative balance sheet, stable earnings.
+    - Return the result in a JSON structure: { signal, confidence, reasoning }.
+    """
+
+    template = ChatPromptTemplate.from_messages([
+        (
+            "system",
+            BEN_GRAHAM_SYSTEM_PROMPT
         ),
         (
             "human",
@@ -337,7 +368,7 @@ def generate_graham_output(
     def create_default_ben_graham_signal():
         return BenGrahamSignal(signal="neutral", confidence=0.0, reasoning="Error in generating analysis; defaulting to neutral.")
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -7,10 +7,31 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 from src.utils.llm import call_llm
 import math
 
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+BILL_ACKMAN_LINE_ITEMS = {
+    "line_items": [
+        "revenue",
+        "operating_margin",
+        "debt_to_equity",
+        "free_cash_flow",
+        "total_assets",
+        "total_liabilities",
+        "dividends_and_other_cash_distributions",
+        "outstanding_shares",
+        # Optional: intangible_assets if available
+        # "intangible_assets"
+    ],
+    "period": "annual",
+    "limit": 5,
+}
+
+
 class BillAckmanSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -26,34 +47,15 @@ def bill_ackman_agent(state: AgentState):
     data = state["data"]
     end_date = data["end_date"]
     tickers = data["tickers"]
-    
-    analysis_data = {}
-    ackman_analysis = {}
-    
-    for ticker in tickers:
+
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("bill_ackman_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
         
         progress.update_status("bill_ackman_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust long-term view.
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                # Optional: intangible_assets if available
-                # "intangible_assets"
-            ],
-            end_date,
-            period="annual",
-            limit=5
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **BILL_ACKMAN_LINE_ITEMS)
         
         progress.update_status("bill_ackman_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -87,7 +89,7 @@ def bill_ackman_agent(state: AgentState):
         else:
             signal = "neutral"
         
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -96,23 +98,27 @@ def bill_ackman_agent(state: AgentState):
             "activism_analysis": activism_analysis,
             "valuation_analysis": valuation_analysis
         }
-        
-        progress.update_status("bill_ackman_agent", ticker, "Generating Bill Ackman analysis")
-        ackman_output = generate_ackman_output(
-            ticker=ticker, 
-            analysis_data=analysis_data,
+
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    ackman_analysis = generate_persona_signals(
+        agent_name="bill_ackman_agent",
+        persona="Bill Ackman",
+        analysis_data=analysis_data,
+        system_prompt=BILL_ACKMAN_SYSTEM_PROMPT,
+        signal_model=BillAckmanSignal,
+        generate_single=lambda ticker, llm_call: generate_ackman_output(
+            ticker=ticker,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-        
-        ackman_analysis[ticker] = {
-            "signal": ackman_output.signal,
-            "confidence": ackman_output.confidence,
-            "reasoning": ackman_output.reasoning
-        }
-        
-        progress.update_status("bill_ackman_agent", ticker, "Done")
-    
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+    )
+
     # Wrap results in a single message for the chain
     message = HumanMessage(
         content=json.dumps(ackman_analysis),
@@ -391,21 +397,7 @@ def analyze_valuation(financial_line_items: list, market_cap: float) -> dict:
     }
 
 
-def generate_ackman_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> BillAckmanSignal:
-    """
-    Generates investment decisions in the style of Bill Ackman.
-    Includes more explicit references to brand strength, activism potential, 
-    catalysts, and management changes in the system prompt.
-    """
-    template = ChatPromptTemplate.from_messages([
-        (
-            "system",
-            """You are a Bill Ackman AI agent, making investment decisions using his principles:
+BILL_ACKMAN_SYSTEM_PROMPT = """You are a Bill Ackman AI agent, making investment decisions using his principles:
 
             1. Seek high-quality businesses with durable competitive advantages (moats), often in well-known consumer or service brands.
             2. Prioritize consistent free cash flow and growth potential over the long term.
@@ -424,6 +416,24 @@ def generate_ackman_output(
 
             Return your final recommendation (signal: bullish, neutral, or bearish) with a 0-100 confidence and a thorough reasoning section.
             """
+
+
+def generate_ackman_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> BillAckmanSignal:
+    """
+    Generates investment decisions in the style of Bill Ackman.
+    Includes more explicit references to brand strength, activism potential, 
+    catalysts, and management changes in the system prompt.
+    """
+    template = ChatPromptTemplate.from_messages([
+        (
+            "system",
+            BILL_ACKMAN_SYSTEM_PROMPT
         ),
         (
             "human",
@@ -454,7 +464,7 @@ def generate_ackman_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return llm_call(
         prompt=prompt, 
         model_name=model_name, 
         model_provider=model_provider, 
@@ -6,8 +6,31 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 from src.utils.llm import call_llm
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+CATHIE_WOOD_LINE_ITEMS = {
+    "line_items": [
+        "revenue",
+        "gross_margin",
+        "operating_margin",
+        "debt_to_equity",
+        "free_cash_flow",
+        "total_assets",
+        "total_liabilities",
+        "dividends_and_other_cash_distributions",
+        "outstanding_shares",
+        "research_and_development",
+        "capital_expenditure",
+        "operating_expense",
+    ],
+    "period": "annual",
+    "limit": 5,
+}
+
+
 class CathieWoodSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -26,36 +49,14 @@ def cathie_wood_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    analysis_data = {}
-    cw_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("cathie_wood_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("cathie_wood_agent", ticker, "Gathering financial line items")
         # Request multiple periods of data (annual or TTM) for a more robust view.
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "gross_margin",
-                "operating_margin",
-                "debt_to_equity",
-                "free_cash_flow",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "outstanding_shares",
-                "research_and_development",
-                "capital_expenditure",
-                "operating_expense",
-
-            ],
-            end_date,
-            period="annual",
-            limit=5
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **CATHIE_WOOD_LINE_ITEMS)
 
         progress.update_status("cathie_wood_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -80,7 +81,7 @@ def cathie_wood_agent(state: AgentState):
         else:
             signal = "neutral"
 
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -89,21 +90,25 @@ def cathie_wood_agent(state: AgentState):
             "valuation_analysis": valuation_analysis
         }
 
-        progress.update_status("cathie_wood_agent", ticker, "Generating Cathie Wood analysis")
-        cw_output = generate_cathie_wood_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    cw_analysis = generate_persona_signals(
+        agent_name="cathie_wood_agent",
+        persona="Cathie Wood",
+        analysis_data=analysis_data,
+        system_prompt=CATHIE_WOOD_SYSTEM_PROMPT,
+        signal_model=CathieWoodSignal,
+        generate_single=lambda ticker, llm_call: generate_cathie_wood_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        cw_analysis[ticker] = {
-            "signal": cw_output.signal,
-            "confidence": cw_output.confidence,
-            "reasoning": cw_output.reasoning
-        }
-
-        progress.update_status("cathie_wood_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+    )
 
     message = HumanMessage(
         content=json.dumps(cw_analysis),
@@ -418,19 +423,7 @@ def analyze_cathie_wood_valuation(financial_line_items: list, market_cap: float)
     }
 
 
-def generate_cathie_wood_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> CathieWoodSignal:
-    """
-    Generates investment decisions in the style of Cathie Wood.
-    """
-    template = ChatPromptTemplate.from_messages([
-        (
-            "system",
-            """You are a Cathie Wood AI agent, making investment decisions using her principles:
+CATHIE_WOOD_SYSTEM_PROMPT = """You are a Cathie Wood AI agent, making investment decisions using her principles:
 
             1. Seek companies leveraging disruptive innovation.
             2. Emphasize exponential growth potential, large TAM.
@@ -457,6 +450,22 @@ def generate_cathie_wood_output(
             For example, if bullish: "The company's AI-driven platform is transforming the $500B healthcare analytics market, with evidence of platform adoption accelerating from 40% to 65% YoY. Their R&D investments of 22% of revenue are creating a technological moat that positions them to capture a significant share of this expanding market. The current valuation doesn't reflect the exponential growth trajectory we expect as..."
             For example, if bearish: "While operating in the genomics space, the company lacks truly disruptive technology and is merely incrementally improving existing techniques. R&D spending at only 8% of revenue signals insufficient investment in breakthrough innovation. With revenue growth slowing from 45% to 20% YoY, there's limited evidence of the exponential adoption curve we look for in transformative companies..."
             """
+
+
+def generate_cathie_wood_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> CathieWoodSignal:
+    """
+    Generates investment decisions in the style of Cathie Wood.
+    """
+    template = ChatPromptTemplate.from_messages([
+        (
+            "system",
+            CATHIE_WOOD_SYSTEM_PROMPT
         ),
         (
             "human",
@@ -487,7 +496,7 @@ def generate_cathie_wood_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -6,8 +6,33 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 from src.utils.llm import call_llm
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+CHARLIE_MUNGER_LINE_ITEMS = {
+    "line_items": [
+        "revenue",
+        "net_income",
+        "operating_income",
+        "return_on_invested_capital",
+        "gross_margin",
+        "operating_margin",
+        "free_cash_flow",
+        "capital_expenditure",
+        "cash_and_equivalents",
+        "total_debt",
+        "shareholders_equity",
+        "outstanding_shares",
+        "research_and_development",
+        "goodwill_and_intangible_assets",
+    ],
+    "period": "annual",
+    "limit": 10,  # Munger examines long-term trends
+}
+
+
 class CharlieMungerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -22,37 +47,14 @@ def charlie_munger_agent(state: AgentState):
     data = state["data"]
     end_date = data["end_date"]
     tickers = data["tickers"]
-    
-    analysis_data = {}
-    munger_analysis = {}
-    
-    for ticker in tickers:
+
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("charlie_munger_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=10)  # Munger looks at longer periods
         
         progress.update_status("charlie_munger_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "net_income",
-                "operating_income",
-                "return_on_invested_capital",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "research_and_development",
-                "goodwill_and_intangible_assets",
-            ],
-            end_date,
-            period="annual",
-            limit=10  # Munger examines long-term trends
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **CHARLIE_MUNGER_LINE_ITEMS)
         
         progress.update_status("charlie_munger_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -108,7 +110,7 @@ def charlie_munger_agent(state: AgentState):
         else:
             signal = "neutral"
         
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -119,23 +121,28 @@ def charlie_munger_agent(state: AgentState):
             # Include some qualitative assessment from news
             "news_sentiment": analyze_news_sentiment(company_news) if company_news else "No news data available"
         }
-        
-        progress.update_status("charlie_munger_agent", ticker, "Generating Charlie Munger analysis")
-        munger_output = generate_munger_output(
-            ticker=ticker, 
-            analysis_data=analysis_data,
+
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    munger_analysis = generate_persona_signals(
+        agent_name="charlie_munger_agent",
+        persona="Charlie Munger",
+        analysis_data=analysis_data,
+        system_prompt=CHARLIE_MUNGER_SYSTEM_PROMPT,
+        signal_model=CharlieMungerSignal,
+        generate_single=lambda ticker, llm_call: generate_munger_output(
+            ticker=ticker,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-        
-        munger_analysis[ticker] = {
-            "signal": munger_output.signal,
-            "confidence": munger_output.confidence,
-            "reasoning": munger_output.reasoning
-        }
-        
-        progress.update_status("charlie_munger_agent", ticker, "Done")
-    
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+        thresholds=(0.75, 0.45),  # bullish at 7.5 and bearish at 4.5 out of 10
+    )
+
     # Wrap results in a single message for the chain
     message = HumanMessage(
         content=json.dumps(munger_analysis),
@@ -659,19 +666,7 @@ def analyze_news_sentiment(news_items: list) -> str:
     return f"Qualitative review of {len(news_items)} recent news items would be needed"
 
 
-def generate_munger_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> CharlieMungerSignal:
-    """
-    Generates investment decisions in the style of Charlie Munger.
-    """
-    template = ChatPromptTemplate.from_messages([
-        (
-            "system",
-            """You are a Charlie Munger AI agent, making investment decisions using his principles:
+CHARLIE_MUNGER_SYSTEM_PROMPT = """You are a Charlie Munger AI agent, making investment decisions using his principles:
 
             1. Focus on the quality and predictability of the business.
             2. Rely on mental models from multiple disciplines to analyze investments.
@@ -704,6 +699,22 @@ def generate_munger_output(
             For example, if bullish: "The high ROIC of 22% demonstrates the company's moat. When applying basic microeconomics, we can see that competitors would struggle to..."
             For example, if bearish: "I see this business making a classic mistake in capital allocation. As I've often said about [relevant Mungerism], this company appears to be..."
             """
+
+
+def generate_munger_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> CharlieMungerSignal:
+    """
+    Generates investment decisions in the style of Charlie Munger.
+    """
+    template = ChatPromptTemplate.from_messages([
+        (
+            "system",
+            CHARLIE_MUNGER_SYSTEM_PROMPT
         ),
         (
             "human",
@@ -734,7 +745,7 @@ def generate_munger_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return llm_call(
         prompt=prompt, 
         model_name=model_name, 
         model_provider=model_provider, 
@@ -3,6 +3,7 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
+from src.utils.parallel import SKIP, map_tickers
 import json
 from pydantic import BaseModel, validator
 from typing_extensions import Literal
@@ -16,10 +17,8 @@ def fundamentals_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Initialize fundamental analysis for each ticker
-    fundamental_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("fundamentals_agent", ticker, "Fetching financial metrics")
 
         # Get the financial metrics
@@ -32,7 +31,7 @@ def fundamentals_agent(state: AgentState):
 
         if not financial_metrics:
             progress.update_status("fundamentals_agent", ticker, "Failed: No financial metrics found")
-            continue
+            return SKIP
 
         # Pull the most recent financial metrics
         metrics = financial_metrics[0]
@@ -135,13 +134,16 @@ def fundamentals_agent(state: AgentState):
         total_signals = len(signals)
         confidence = round(max(bullish_signals, bearish_signals) / total_signals, 2) * 100
 
-        fundamental_analysis[ticker] = {
+        result = {
             "signal": overall_signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
 
         progress.update_status("fundamentals_agent", ticker, "Done")
+        return result
+
+    fundamental_analysis = map_tickers(analyze_ticker, tickers)
 
     # Create the fundamental analysis message
     message = HumanMessage(
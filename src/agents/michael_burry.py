@@ -18,12 +18,30 @@ from src.tools.api import (
 )
 from src.utils.llm import call_llm
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 
 __all__ = [
     "MichaelBurrySignal",
     "michael_burry_agent",
 ]
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+MICHAEL_BURRY_LINE_ITEMS = {
+    "line_items": [
+        "free_cash_flow",
+        "net_income",
+        "total_debt",
+        "cash_and_equivalents",
+        "total_assets",
+        "total_liabilities",
+        "outstanding_shares",
+        "issuance_or_purchase_of_equity_shares",
+    ],
+    "period": "ttm",
+    "limit": 10,
+}
+
 ###############################################################################
 # Pydantic output model
 ###############################################################################
@@ -52,10 +70,8 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
     # We look one year back for insider trades / news flow
     start_date = (datetime.fromisoformat(end_date) - timedelta(days=365)).date().isoformat()
 
-    analysis_data: dict[str, dict] = {}
-    burry_analysis: dict[str, dict] = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         # ------------------------------------------------------------------
         # Fetch raw data
         # ------------------------------------------------------------------
@@ -63,20 +79,7 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching line items")
-        line_items = search_line_items(
-            ticker,
-            [
-                "free_cash_flow",
-                "net_income",
-                "total_debt",
-                "cash_and_equivalents",
-                "total_assets",
-                "total_liabilities",
-                "outstanding_shares",
-                "issuance_or_purchase_of_equity_shares",
-            ],
-            end_date,
-        )
+        line_items = search_line_items(ticker, end_date=end_date, **MICHAEL_BURRY_LINE_ITEMS)
 
         progress.update_status("michael_burry_agent", ticker, "Fetching insider trades")
         insider_trades = get_insider_trades(ticker, end_date=end_date, start_date=start_date)
@@ -128,7 +131,7 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
         # ------------------------------------------------------------------
         # Collect data for LLM reasoning & output
         # ------------------------------------------------------------------
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_score,
@@ -139,21 +142,25 @@ def michael_burry_agent(state: AgentState):  # noqa: C901  (complexity is fine h
             "market_cap": market_cap,
         }
 
-        progress.update_status("michael_burry_agent", ticker, "Generating LLM output")
-        burry_output = _generate_burry_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    burry_analysis = generate_persona_signals(
+        agent_name="michael_burry_agent",
+        persona="Michael Burry",
+        analysis_data=analysis_data,
+        system_prompt=MICHAEL_BURRY_SYSTEM_PROMPT,
+        signal_model=MichaelBurrySignal,
+        generate_single=lambda ticker, llm_call: _generate_burry_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        burry_analysis[ticker] = {
-            "signal": burry_output.signal,
-            "confidence": burry_output.confidence,
-            "reasoning": burry_output.reasoning,
-        }
-
-        progress.update_status("michael_burry_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+    )
 
     # ----------------------------------------------------------------------
     # Return to the graph
@@ -323,20 +330,7 @@ def _analyze_contrarian_sentiment(news):
 # LLM generation
 ###############################################################################
 
-def _generate_burry_output(
-    ticker: str,
-    analysis_data: dict,
-    *,
-    model_name: str,
-    model_provider: str,
-) -> MichaelBurrySignal:
-    """Call the LLM to craft the final trading signal in Burry's voice."""
-
-    template = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are an AI agent emulating Dr. Michael J. Burry. Your mandate:
+MICHAEL_BURRY_SYSTEM_PROMPT = """You are an AI agent emulating Dr. Michael J. Burry. Your mandate:
                 - Hunt for deep value in US equities using hard numbers (free cash flow, EV/EBIT, balance sheet)
                 - Be contrarian: hatred in the press can be your friend if fundamentals are solid
                 - Focus on downside first – avoid leveraged balance sheets
@@ -352,7 +346,24 @@ def _generate_burry_output(
                 
                 For example, if bullish: "FCF yield 12.8%. EV/EBIT 6.2. Debt-to-equity 0.4. Net insider buying 25k shares. Market missing value due to overreaction to recent litigation. Strong buy."
                 For example, if bearish: "FCF yield only 2.1%. Debt-to-equity concerning at 2.3. Management diluting shareholders. Pass."
-                """,
+                """
+
+
+def _generate_burry_output(
+    ticker: str,
+    analysis_data: dict,
+    *,
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> MichaelBurrySignal:
+    """Call the LLM to craft the final trading signal in Burry's voice."""
+
+    template = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                MICHAEL_BURRY_SYSTEM_PROMPT,
             ),
             (
                 "human",
@@ -378,7 +389,7 @@ def _generate_burry_output(
     def create_default_michael_burry_signal():
         return MichaelBurrySignal(signal="neutral", confidence=0.0, reasoning="Parsing error – defaulting to neutral")
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -13,9 +13,32 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import generate_persona_signals
 from src.utils.llm import call_llm
 
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+PETER_LYNCH_LINE_ITEMS = {
+    "line_items": [
+        "revenue",
+        "earnings_per_share",
+        "net_income",
+        "operating_income",
+        "gross_margin",
+        "operating_margin",
+        "free_cash_flow",
+        "capital_expenditure",
+        "cash_and_equivalents",
+        "total_debt",
+        "shareholders_equity",
+        "outstanding_shares",
+    ],
+    "period": "annual",
+    "limit": 5,
+}
+
+
 class PeterLynchSignal(BaseModel):
     """
     Container for the Peter Lynch-style output signal.
@@ -45,35 +68,14 @@ def peter_lynch_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    analysis_data = {}
-    lynch_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("peter_lynch_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
         progress.update_status("peter_lynch_agent", ticker, "Gathering financial line items")
         # Relevant line items for Peter Lynch's approach
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **PETER_LYNCH_LINE_ITEMS)
 
         progress.update_status("peter_lynch_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -124,7 +126,7 @@ def peter_lynch_agent(state: AgentState):
         else:
             signal = "neutral"
 
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -135,21 +137,26 @@ def peter_lynch_agent(state: AgentState):
             "insider_activity": insider_activity,
         }
 
-        progress.update_status("peter_lynch_agent", ticker, "Generating Peter Lynch analysis")
-        lynch_output = generate_lynch_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    lynch_analysis = generate_persona_signals(
+        agent_name="peter_lynch_agent",
+        persona="Peter Lynch",
+        analysis_data=analysis_data,
+        system_prompt=PETER_LYNCH_SYSTEM_PROMPT,
+        signal_model=PeterLynchSignal,
+        generate_single=lambda ticker, llm_call: generate_lynch_output(
             ticker=ticker,
             analysis_data=analysis_data[ticker],
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        lynch_analysis[ticker] = {
-            "signal": lynch_output.signal,
-            "confidence": lynch_output.confidence,
-            "reasoning": lynch_output.reasoning,
-        }
-
-        progress.update_status("peter_lynch_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+        thresholds=(0.75, 0.45),  # bullish at 7.5 and bearish at 4.5 out of 10
+    )
 
     # Wrap up results
     message = HumanMessage(content=json.dumps(lynch_analysis), name="peter_lynch_agent")
@@ -436,20 +443,7 @@ def analyze_insider_activity(insider_trades: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_lynch_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> PeterLynchSignal:
-    """
-    Generates a final JSON signal in Peter Lynch's voice & style.
-    """
-    template = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are a Peter Lynch AI agent. You make investment decisions based on Peter Lynch's well-known principles:
+PETER_LYNCH_SYSTEM_PROMPT = """You are a Peter Lynch AI agent. You make investment decisions based on Peter Lynch's well-known principles:
                 
                 1. Invest in What You Know: Emphasize understandable businesses, possibly discovered in everyday life.
                 2. Growth at a Reasonable Price (GARP): Rely on the PEG ratio as a prime metric.
@@ -472,7 +466,24 @@ def generate_lynch_output(
                   "confidence": 0 to 100,
                   "reasoning": "string"
                 }}
-                """,
+                """
+
+
+def generate_lynch_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> PeterLynchSignal:
+    """
+    Generates a final JSON signal in Peter Lynch's voice & style.
+    """
+    template = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                PETER_LYNCH_SYSTEM_PROMPT,
             ),
             (
                 "human",
@@ -496,7 +507,7 @@ def generate_lynch_output(
             reasoning="Error in analysis; defaulting to neutral"
         )
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -12,10 +12,34 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 from src.utils.llm import call_llm
 import statistics
 
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+PHIL_FISHER_LINE_ITEMS = {
+    "line_items": [
+        "revenue",
+        "net_income",
+        "earnings_per_share",
+        "free_cash_flow",
+        "research_and_development",
+        "operating_income",
+        "operating_margin",
+        "gross_margin",
+        "total_debt",
+        "shareholders_equity",
+        "cash_and_equivalents",
+        "ebit",
+        "ebitda",
+    ],
+    "period": "annual",
+    "limit": 5,
+}
+
+
 class PhilFisherSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -39,10 +63,8 @@ def phil_fisher_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    analysis_data = {}
-    fisher_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("phil_fisher_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -52,27 +74,7 @@ def phil_fisher_agent(state: AgentState):
         #   - Margins & Stability: operating_income, operating_margin, gross_margin
         #   - Management Efficiency & Leverage: total_debt, shareholders_equity, free_cash_flow
         #   - Valuation: net_income, free_cash_flow (for P/E, P/FCF), ebit, ebitda
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "net_income",
-                "earnings_per_share",
-                "free_cash_flow",
-                "research_and_development",
-                "operating_income",
-                "operating_margin",
-                "gross_margin",
-                "total_debt",
-                "shareholders_equity",
-                "cash_and_equivalents",
-                "ebit",
-                "ebitda",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **PHIL_FISHER_LINE_ITEMS)
 
         progress.update_status("phil_fisher_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -127,7 +129,7 @@ def phil_fisher_agent(state: AgentState):
         else:
             signal = "neutral"
 
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -139,21 +141,26 @@ def phil_fisher_agent(state: AgentState):
             "sentiment_analysis": sentiment_analysis,
         }
 
-        progress.update_status("phil_fisher_agent", ticker, "Generating Phil Fisher-style analysis")
-        fisher_output = generate_fisher_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    fisher_analysis = generate_persona_signals(
+        agent_name="phil_fisher_agent",
+        persona="Phil Fisher",
+        analysis_data=analysis_data,
+        system_prompt=PHIL_FISHER_SYSTEM_PROMPT,
+        signal_model=PhilFisherSignal,
+        generate_single=lambda ticker, llm_call: generate_fisher_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        fisher_analysis[ticker] = {
-            "signal": fisher_output.signal,
-            "confidence": fisher_output.confidence,
-            "reasoning": fisher_output.reasoning,
-        }
-
-        progress.update_status("phil_fisher_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+        thresholds=(0.75, 0.45),  # bullish at 7.5 and bearish at 4.5 out of 10
+    )
 
     # Wrap results in a single message
     message = HumanMessage(content=json.dumps(fisher_analysis), name="phil_fisher_agent")
@@ -525,20 +532,7 @@ def analyze_sentiment(news_items: list) -> dict:
     return {"score": score, "details": "; ".join(details)}
 
 
-def generate_fisher_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> PhilFisherSignal:
-    """
-    Generates a JSON signal in the style of Phil Fisher.
-    """
-    template = ChatPromptTemplate.from_messages(
-        [
-            (
-              "system",
-              """You are a Phil Fisher AI agent, making investment decisions using his principles:
+PHIL_FISHER_SYSTEM_PROMPT = """You are a Phil Fisher AI agent, making investment decisions using his principles:
   
               1. Emphasize long-term growth potential and quality of management.
               2. Focus on companies investing in R&D for future products/services.
@@ -562,7 +556,24 @@ def generate_fisher_output(
                 - "signal": "bullish" or "bearish" or "neutral"
                 - "confidence": a float between 0 and 100
                 - "reasoning": a detailed explanation
-              """,
+              """
+
+
+def generate_fisher_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> PhilFisherSignal:
+    """
+    Generates a JSON signal in the style of Phil Fisher.
+    """
+    template = ChatPromptTemplate.from_messages(
+        [
+            (
+              "system",
+              PHIL_FISHER_SYSTEM_PROMPT,
             ),
             (
               "human",
@@ -591,7 +602,7 @@ def generate_fisher_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -1,7 +1,8 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
-from src.tools.api import get_prices, prices_to_df
+from src.utils.parallel import SKIP, map_tickers
+from src.tools.api import get_price_frame
 import json
 
 
@@ -12,24 +13,21 @@ def risk_management_agent(state: AgentState):
     data = state["data"]
     tickers = data["tickers"]
 
-    # Initialize risk analysis for each ticker
-    risk_analysis = {}
     current_prices = {}  # Store prices here to avoid redundant API calls
 
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("risk_management_agent", ticker, "Analyzing price data")
 
-        prices = get_prices(
+        prices_df = get_price_frame(
             ticker=ticker,
             start_date=data["start_date"],
             end_date=data["end_date"],
         )
 
-        if not prices:
+        if prices_df.empty:
             progress.update_status("risk_management_agent", ticker, "Failed: No price data found")
-            continue
-
-        prices_df = prices_to_df(prices)
+            return SKIP
 
         progress.update_status("risk_management_agent", ticker, "Calculating position limits")
 
@@ -52,7 +50,7 @@ def risk_management_agent(state: AgentState):
         # Ensure we don't exceed available cash
         max_position_size = min(remaining_position_limit, portfolio.get("cash", 0))
 
-        risk_analysis[ticker] = {
+        result = {
             "remaining_position_limit": float(max_position_size),
             "current_price": float(current_price),
             "reasoning": {
@@ -65,6 +63,9 @@ def risk_management_agent(state: AgentState):
         }
 
         progress.update_status("risk_management_agent", ticker, "Done")
+        return result
+
+    risk_analysis = map_tickers(analyze_ticker, tickers)
 
     message = HumanMessage(
         content=json.dumps(risk_analysis),
@@ -1,6 +1,7 @@
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
 import pandas as pd
 import numpy as np
 import json
@@ -15,10 +16,8 @@ def sentiment_agent(state: AgentState):
     end_date = data.get("end_date")
     tickers = data.get("tickers")
 
-    # Initialize sentiment analysis for each ticker
-    sentiment_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("sentiment_agent", ticker, "Fetching insider trades")
 
         # Get the insider trades
@@ -73,13 +72,16 @@ def sentiment_agent(state: AgentState):
             confidence = round(max(bullish_signals, bearish_signals) / total_weighted_signals, 2) * 100
         reasoning = f"Weighted Bullish signals: {bullish_signals:.1f}, Weighted Bearish signals: {bearish_signals:.1f}"
 
-        sentiment_analysis[ticker] = {
+        result = {
             "signal": overall_signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
 
         progress.update_status("sentiment_agent", ticker, "Done")
+        return result
+
+    sentiment_analysis = map_tickers(analyze_ticker, tickers)
 
     # Create the sentiment message
     message = HumanMessage(
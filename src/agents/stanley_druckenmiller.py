@@ -13,10 +13,35 @@ from pydantic import BaseModel
 import json
 from typing_extensions import Literal
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
 from src.utils.llm import call_llm
 import statistics
 
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+STANLEY_DRUCKENMILLER_LINE_ITEMS = {
+    "line_items": [
+        "revenue",
+        "earnings_per_share",
+        "net_income",
+        "operating_income",
+        "gross_margin",
+        "operating_margin",
+        "free_cash_flow",
+        "capital_expenditure",
+        "cash_and_equivalents",
+        "total_debt",
+        "shareholders_equity",
+        "outstanding_shares",
+        "ebit",
+        "ebitda",
+    ],
+    "period": "annual",
+    "limit": 5,
+}
+
+
 class StanleyDruckenmillerSignal(BaseModel):
     signal: Literal["bullish", "bearish", "neutral"]
     confidence: float
@@ -38,10 +63,8 @@ def stanley_druckenmiller_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    analysis_data = {}
-    druck_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("stanley_druckenmiller_agent", ticker, "Fetching financial metrics")
         metrics = get_financial_metrics(ticker, end_date, period="annual", limit=5)
 
@@ -51,28 +74,7 @@ def stanley_druckenmiller_agent(state: AgentState):
         #   - Valuation: net_income, free_cash_flow, ebit, ebitda
         #   - Leverage: total_debt, shareholders_equity
         #   - Liquidity: cash_and_equivalents
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "revenue",
-                "earnings_per_share",
-                "net_income",
-                "operating_income",
-                "gross_margin",
-                "operating_margin",
-                "free_cash_flow",
-                "capital_expenditure",
-                "cash_and_equivalents",
-                "total_debt",
-                "shareholders_equity",
-                "outstanding_shares",
-                "ebit",
-                "ebitda",
-            ],
-            end_date,
-            period="annual",
-            limit=5,
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **STANLEY_DRUCKENMILLER_LINE_ITEMS)
 
         progress.update_status("stanley_druckenmiller_agent", ticker, "Getting market cap")
         market_cap = get_market_cap(ticker, end_date)
@@ -122,7 +124,7 @@ def stanley_druckenmiller_agent(state: AgentState):
         else:
             signal = "neutral"
 
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -133,21 +135,26 @@ def stanley_druckenmiller_agent(state: AgentState):
             "valuation_analysis": valuation_analysis,
         }
 
-        progress.update_status("stanley_druckenmiller_agent", ticker, "Generating Stanley Druckenmiller analysis")
-        druck_output = generate_druckenmiller_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    druck_analysis = generate_persona_signals(
+        agent_name="stanley_druckenmiller_agent",
+        persona="Stanley Druckenmiller",
+        analysis_data=analysis_data,
+        system_prompt=STANLEY_DRUCKENMILLER_SYSTEM_PROMPT,
+        signal_model=StanleyDruckenmillerSignal,
+        generate_single=lambda ticker, llm_call: generate_druckenmiller_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        druck_analysis[ticker] = {
-            "signal": druck_output.signal,
-            "confidence": druck_output.confidence,
-            "reasoning": druck_output.reasoning,
-        }
-
-        progress.update_status("stanley_druckenmiller_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+        thresholds=(0.75, 0.45),  # bullish at 7.5 and bearish at 4.5 out of 10
+    )
 
     # Wrap results in a single message
     message = HumanMessage(content=json.dumps(druck_analysis), name="stanley_druckenmiller_agent")
@@ -518,20 +525,7 @@ def analyze_druckenmiller_valuation(financial_line_items: list, market_cap: floa
     return {"score": final_score, "details": "; ".join(details)}
 
 
-def generate_druckenmiller_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> StanleyDruckenmillerSignal:
-    """
-    Generates a JSON signal in the style of Stanley Druckenmiller.
-    """
-    template = ChatPromptTemplate.from_messages(
-        [
-            (
-              "system",
-              """You are a Stanley Druckenmiller AI agent, making investment decisions using his principles:
+STANLEY_DRUCKENMILLER_SYSTEM_PROMPT = """You are a Stanley Druckenmiller AI agent, making investment decisions using his principles:
             
               1. Seek asymmetric risk-reward opportunities (large upside, limited downside).
               2. Emphasize growth, momentum, and market sentiment.
@@ -556,7 +550,24 @@ def generate_druckenmiller_output(
               
               For example, if bullish: "The company shows exceptional momentum with revenue accelerating from 22% to 35% YoY and the stock up 28% over the past three months. Risk-reward is highly asymmetric with 70% upside potential based on FCF multiple expansion and only 15% downside risk given the strong balance sheet with 3x cash-to-debt. Insider buying and positive market sentiment provide additional tailwinds..."
               For example, if bearish: "Despite recent stock momentum, revenue growth has decelerated from 30% to 12% YoY, and operating margins are contracting. The risk-reward proposition is unfavorable with limited 10% upside potential against 40% downside risk. The competitive landscape is intensifying, and insider selling suggests waning confidence. I'm seeing better opportunities elsewhere with more favorable setups..."
-              """,
+              """
+
+
+def generate_druckenmiller_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> StanleyDruckenmillerSignal:
+    """
+    Generates a JSON signal in the style of Stanley Druckenmiller.
+    """
+    template = ChatPromptTemplate.from_messages(
+        [
+            (
+              "system",
+              STANLEY_DRUCKENMILLER_SYSTEM_PROMPT,
             ),
             (
               "human",
@@ -585,7 +596,7 @@ def generate_druckenmiller_output(
             reasoning="Error in analysis, defaulting to neutral"
         )
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
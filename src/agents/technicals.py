@@ -10,8 +10,9 @@ import json
 import pandas as pd
 import numpy as np
 
-from src.tools.api import get_prices, prices_to_df
+from src.tools.api import get_price_frame
 from src.utils.progress import progress
+from src.utils.parallel import SKIP, map_tickers
 
 
 ##### Technical Analyst #####
@@ -29,25 +30,20 @@ def technical_analyst_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Initialize analysis for each ticker
-    technical_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("technical_analyst_agent", ticker, "Analyzing price data")
 
-        # Get the historical price data
-        prices = get_prices(
+        # Get the historical price data as a DataFrame
+        prices_df = get_price_frame(
             ticker=ticker,
             start_date=start_date,
             end_date=end_date,
         )
 
-        if not prices:
+        if prices_df.empty:
             progress.update_status("technical_analyst_agent", ticker, "Failed: No price data found")
-            continue
-
-        # Convert prices to a DataFrame
-        prices_df = prices_to_df(prices)
+            return SKIP
 
         progress.update_status("technical_analyst_agent", ticker, "Calculating trend signals")
         trend_signals = calculate_trend_signals(prices_df)
@@ -86,7 +82,7 @@ def technical_analyst_agent(state: AgentState):
         )
 
         # Generate detailed analysis report for this ticker
-        technical_analysis[ticker] = {
+        result = {
             "signal": combined_signal["signal"],
             "confidence": round(combined_signal["confidence"] * 100),
             "strategy_signals": {
@@ -118,6 +114,9 @@ def technical_analyst_agent(state: AgentState):
             },
         }
         progress.update_status("technical_analyst_agent", ticker, "Done")
+        return result
+
+    technical_analysis = map_tickers(analyze_ticker, tickers)
 
     # Create the technical analyst message
     message = HumanMessage(
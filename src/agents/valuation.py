@@ -11,6 +11,7 @@ import json
 from langchain_core.messages import HumanMessage
 from src.graph.state import AgentState, show_agent_reasoning
 from src.utils.progress import progress
+from src.utils.parallel import SKIP, map_tickers
 
 from src.tools.api import (
     get_financial_metrics,
@@ -18,6 +19,20 @@ from src.tools.api import (
     search_line_items,
 )
 
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+VALUATION_LINE_ITEMS = {
+    "line_items": [
+        "free_cash_flow",
+        "net_income",
+        "depreciation_and_amortization",
+        "capital_expenditure",
+        "working_capital",
+    ],
+    "period": "ttm",
+    "limit": 2,
+}
+
+
 def valuation_agent(state: AgentState):
     """Run valuation across tickers and write signals back to `state`."""
 
@@ -25,9 +40,8 @@ def valuation_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    valuation_analysis: dict[str, dict] = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("valuation_agent", ticker, "Fetching financial data")
 
         # --- Historical financial metrics (pull 8 latest TTM snapshots for medians) ---
@@ -39,27 +53,15 @@ def valuation_agent(state: AgentState):
         )
         if not financial_metrics:
             progress.update_status("valuation_agent", ticker, "Failed: No financial metrics found")
-            continue
+            return SKIP
         most_recent_metrics = financial_metrics[0]
 
         # --- Fine‑grained line‑items (need two periods to calc WC change) ---
         progress.update_status("valuation_agent", ticker, "Gathering line items")
-        line_items = search_line_items(
-            ticker=ticker,
-            line_items=[
-                "free_cash_flow",
-                "net_income",
-                "depreciation_and_amortization",
-                "capital_expenditure",
-                "working_capital",
-            ],
-            end_date=end_date,
-            period="ttm",
-            limit=2,
-        )
+        line_items = search_line_items(ticker, end_date=end_date, **VALUATION_LINE_ITEMS)
         if len(line_items) < 2:
             progress.update_status("valuation_agent", ticker, "Failed: Insufficient financial line items")
-            continue
+            return SKIP
         li_curr, li_prev = line_items[0], line_items[1]
 
         # ------------------------------------------------------------------
@@ -102,7 +104,7 @@ def valuation_agent(state: AgentState):
         market_cap = get_market_cap(ticker, end_date)
         if not market_cap:
             progress.update_status("valuation_agent", ticker, "Failed: Market cap unavailable")
-            continue
+            return SKIP
 
         method_values = {
             "dcf": {"value": dcf_val, "weight": 0.35},
@@ -114,7 +116,7 @@ def valuation_agent(state: AgentState):
         total_weight = sum(v["weight"] for v in method_values.values() if v["value"] > 0)
         if total_weight == 0:
             progress.update_status("valuation_agent", ticker, "Failed: All valuation methods zero")
-            continue
+            return SKIP
 
         for v in method_values.values():
             v["gap"] = (v["value"] - market_cap) / market_cap if v["value"] > 0 else None
@@ -140,12 +142,15 @@ def valuation_agent(state: AgentState):
             for m, vals in method_values.items() if vals["value"] > 0
         }
 
-        valuation_analysis[ticker] = {
+        result = {
             "signal": signal,
             "confidence": confidence,
             "reasoning": reasoning,
         }
         progress.update_status("valuation_agent", ticker, "Done")
+        return result
+
+    valuation_analysis = map_tickers(analyze_ticker, tickers)
 
     # ---- Emit message (for LLM tool chain) ----
     msg = HumanMessage(content=json.dumps(valuation_analysis), name="valuation_agent")
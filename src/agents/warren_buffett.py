@@ -7,6 +7,25 @@ from typing_extensions import Literal
 from src.tools.api import get_financial_metrics, get_market_cap, search_line_items
 from src.utils.llm import call_llm
 from src.utils.progress import progress
+from src.utils.parallel import map_tickers
+from src.utils.persona import analyses_through, generate_persona_signals
+
+
+# Line items requested for each ticker, also used to plan one shared fetch across analysts
+WARREN_BUFFETT_LINE_ITEMS = {
+    "line_items": [
+        "capital_expenditure",
+        "depreciation_and_amortization",
+        "net_income",
+        "outstanding_shares",
+        "total_assets",
+        "total_liabilities",
+        "dividends_and_other_cash_distributions",
+        "issuance_or_purchase_of_equity_shares",
+    ],
+    "period": "ttm",
+    "limit": 10,
+}
 
 
 class WarrenBuffettSignal(BaseModel):
@@ -21,30 +40,14 @@ def warren_buffett_agent(state: AgentState):
     end_date = data["end_date"]
     tickers = data["tickers"]
 
-    # Collect all analysis for LLM reasoning
-    analysis_data = {}
-    buffett_analysis = {}
-
-    for ticker in tickers:
+    # Analyze each ticker concurrently; results come back in ticker order
+    def analyze_ticker(ticker: str):
         progress.update_status("warren_buffett_agent", ticker, "Fetching financial metrics")
         # Fetch required data
         metrics = get_financial_metrics(ticker, end_date, period="ttm", limit=5)
 
         progress.update_status("warren_buffett_agent", ticker, "Gathering financial line items")
-        financial_line_items = search_line_items(
-            ticker,
-            [
-                "capital_expenditure",
-                "depreciation_and_amortization",
-                "net_income",
-                "outstanding_shares",
-                "total_assets",
-                "total_liabilities",
-                "dividends_and_other_cash_distributions",
-                "issuance_or_purchase_of_equity_shares",
-            ],
-            end_date,
-        )
+        financial_line_items = search_line_items(ticker, end_date=end_date, **WARREN_BUFFETT_LINE_ITEMS)
 
         progress.update_status("warren_buffett_agent", ticker, "Getting market cap")
         # Get current market cap
@@ -91,7 +94,7 @@ def warren_buffett_agent(state: AgentState):
             signal = "neutral"
 
         # Combine all analysis results
-        analysis_data[ticker] = {
+        return {
             "signal": signal,
             "score": total_score,
             "max_score": max_possible_score,
@@ -104,22 +107,25 @@ def warren_buffett_agent(state: AgentState):
             "margin_of_safety": margin_of_safety,
         }
 
-        progress.update_status("warren_buffett_agent", ticker, "Generating Warren Buffett analysis")
-        buffett_output = generate_buffett_output(
+    analysis_data = map_tickers(analyze_ticker, tickers)
+
+    buffett_analysis = generate_persona_signals(
+        agent_name="warren_buffett_agent",
+        persona="Warren Buffett",
+        analysis_data=analysis_data,
+        system_prompt=WARREN_BUFFETT_SYSTEM_PROMPT,
+        signal_model=WarrenBuffettSignal,
+        generate_single=lambda ticker, llm_call: generate_buffett_output(
             ticker=ticker,
-            analysis_data=analysis_data,
+            analysis_data=analyses_through(analysis_data, ticker),
             model_name=state["metadata"]["model_name"],
             model_provider=state["metadata"]["model_provider"],
-        )
-
-        # Store analysis in consistent format with other agents
-        buffett_analysis[ticker] = {
-            "signal": buffett_output.signal,
-            "confidence": buffett_output.confidence, # Normalize between 0 to 100
-            "reasoning": buffett_output.reasoning,
-        }
-
-        progress.update_status("warren_buffett_agent", ticker, "Done")
+            llm_call=llm_call,
+        ),
+        model_name=state["metadata"]["model_name"],
+        model_provider=state["metadata"]["model_provider"],
+        signal_mode=state["metadata"].get("signal_mode", "llm"),
+    )
 
     # Create the message
     message = HumanMessage(content=json.dumps(buffett_analysis), name="warren_buffett_agent")
@@ -382,18 +388,7 @@ def calculate_intrinsic_value(financial_line_items: list) -> dict[str, any]:
     }
 
 
-def generate_buffett_output(
-    ticker: str,
-    analysis_data: dict[str, any],
-    model_name: str,
-    model_provider: str,
-) -> WarrenBuffettSignal:
-    """Get investment decision from LLM with Buffett's principles"""
-    template = ChatPromptTemplate.from_messages(
-        [
-            (
-                "system",
-                """You are a Warren Buffett AI agent. Decide on investment signals based on Warren Buffett's principles:
+WARREN_BUFFETT_SYSTEM_PROMPT = """You are a Warren Buffett AI agent. Decide on investment signals based on Warren Buffett's principles:
                 - Circle of Competence: Only invest in businesses you understand
                 - Margin of Safety (> 30%): Buy at a significant discount to intrinsic value
                 - Economic Moat: Look for durable competitive advantages
@@ -413,7 +408,22 @@ def generate_buffett_output(
                 For example, if bearish: "The declining returns on capital remind me of the textile operations at Berkshire that we eventually exited because..."
 
                 Follow these guidelines strictly.
-                """,
+                """
+
+
+def generate_buffett_output(
+    ticker: str,
+    analysis_data: dict[str, any],
+    model_name: str,
+    model_provider: str,
+    llm_call=call_llm,
+) -> WarrenBuffettSignal:
+    """Get investment decision from LLM with Buffett's principles"""
+    template = ChatPromptTemplate.from_messages(
+        [
+            (
+                "system",
+                WARREN_BUFFETT_SYSTEM_PROMPT,
             ),
             (
                 "human",
@@ -439,7 +449,7 @@ def generate_buffett_output(
     def create_default_warren_buffett_signal():
         return WarrenBuffettSignal(signal="neutral", confidence=0.0, reasoning="Error in analysis, defaulting to neutral")
 
-    return call_llm(
+    return llm_call(
         prompt=prompt,
         model_name=model_name,
         model_provider=model_provider,
@@ -10,17 +10,20 @@ from colorama import Fore, Style, init
 import numpy as np
 import itertools
 
+from src.portfolio_engine import ACTIONS, HOLD, PortfolioEngine
 from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
-from src.utils.analysts import ANALYST_ORDER
+from src.utils.analysts import ANALYST_CONFIG, ANALYST_ORDER, plan_line_item_requests
+from src.utils.persona import SIGNAL_MODES
+from src.utils.incremental import IncrementalSignalCache
+from src.utils.metrics import PerformanceTracker
 from src.main import run_hedge_fund
 from src.tools.api import (
-    get_company_news,
+    extend_line_item_requests,
     get_price_data,
-    get_prices,
-    get_financial_metrics,
-    get_insider_trades,
+    prefetch_line_items,
+    prefetch_universe,
 )
-from src.utils.display import print_backtest_results, format_backtest_row, export_backtest_results_to_excel
+from src.utils.display import BACKTEST_RENDER_MODES, create_backtest_renderer, format_backtest_row, export_backtest_results_to_excel, write_json_lines
 from typing_extensions import Callable
 from src.utils.ollama import ensure_ollama_and_model
 
@@ -39,6 +42,12 @@ class Backtester:
         model_provider: str = "OpenAI",
         selected_analysts: list[str] = [],
         initial_margin_requirement: float = 0.0,
+        execution_mode: str = "parallel",
+        max_concurrency: int | None = None,
+        signal_mode: str = "llm",
+        incremental: bool = True,
+        render_mode: str = "full",
+        event_sink: Callable | None = None,
     ):
         """
         :param agent: The trading agent (Callable).
@@ -50,6 +59,12 @@ class Backtester:
         :param model_provider: Which LLM provider (OpenAI, etc).
         :param selected_analysts: List of analyst names or IDs to incorporate.
         :param initial_margin_requirement: The margin ratio (e.g. 0.5 = 50%).
+        :param execution_mode: Run the analysts "parallel" or "sequential" on each day.
+        :param max_concurrency: Maximum number of analysts running at once (defaults to the provider's limit).
+        :param signal_mode: Persona analyst signals from the "llm", their "rules" only, or "hybrid".
+        :param incremental: Reuse an analyst's previous signal for a ticker while its fundamental inputs are unchanged.
+        :param render_mode: How daily results are shown: reprint the "full" table, "append" new rows, a "live" view, or "events".
+        :param event_sink: Callable receiving each event dict in "events" mode (default: JSON lines on stderr).
         """
         self.agent = agent
         self.tickers = tickers
@@ -59,30 +74,21 @@ class Backtester:
         self.model_name = model_name
         self.model_provider = model_provider
         self.selected_analysts = selected_analysts
+        self.execution_mode = execution_mode
+        self.max_concurrency = max_concurrency
+        self.signal_mode = signal_mode
+        self.signal_cache = IncrementalSignalCache() if incremental else None
         self.table_rows = []  # Store table rows as instance variable
+        self.renderer = create_backtest_renderer(render_mode, event_sink)
 
         # Initialize portfolio with support for long/short positions
         self.portfolio_values = []
-        self.portfolio = {
-            "cash": initial_capital,
-            "margin_used": 0.0,  # total margin usage across all short positions
-            "margin_requirement": initial_margin_requirement,  # The margin ratio required for shorts
-            "positions": {
-                ticker: {
-                    "long": 0,               # Number of shares held long
-                    "short": 0,              # Number of shares held short
-                    "long_cost_basis": 0.0,  # Average cost basis per share (long)
-                    "short_cost_basis": 0.0, # Average cost basis per share (short)
-                    "short_margin_used": 0.0 # Dollars of margin used for this ticker's short
-                } for ticker in tickers
-            },
-            "realized_gains": {
-                ticker: {
-                    "long": 0.0,   # Realized gains from long positions
-                    "short": 0.0,  # Realized gains from short positions
-                } for ticker in tickers
-            }
-        }
+        self.engine = PortfolioEngine(tickers, initial_capital, initial_margin_requirement)
+
+    @property
+    def portfolio(self) -> dict:
+        """Snapshot of the portfolio as the nested dict the agents read."""
+        return self.engine.to_dict()
 
     def execute_trade(self, ticker: str, action: str, quantity: float, current_price: float):
         """
@@ -90,163 +96,8 @@ class Backtester:
         `quantity` is the number of shares the agent wants to buy/sell/short/cover.
         We will only trade integer shares to keep it simple.
         """
-        if quantity <= 0:
-            return 0
-
-        quantity = int(quantity)  # force integer shares
-        position = self.portfolio["positions"][ticker]
-
-        if action == "buy":
-            cost = quantity * current_price
-            if cost <= self.portfolio["cash"]:
-                # Weighted average cost basis for the new total
-                old_shares = position["long"]
-                old_cost_basis = position["long_cost_basis"]
-                new_shares = quantity
-                total_shares = old_shares + new_shares
-
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_shares
-                    total_new_cost = cost
-                    position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                position["long"] += quantity
-                self.portfolio["cash"] -= cost
-                return quantity
-            else:
-                # Calculate maximum affordable quantity
-                max_quantity = int(self.portfolio["cash"] / current_price)
-                if max_quantity > 0:
-                    cost = max_quantity * current_price
-                    old_shares = position["long"]
-                    old_cost_basis = position["long_cost_basis"]
-                    total_shares = old_shares + max_quantity
-
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_shares
-                        total_new_cost = cost
-                        position["long_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                    position["long"] += max_quantity
-                    self.portfolio["cash"] -= cost
-                    return max_quantity
-                return 0
-
-        elif action == "sell":
-            # You can only sell as many as you own
-            quantity = min(quantity, position["long"])
-            if quantity > 0:
-                # Realized gain/loss using average cost basis
-                avg_cost_per_share = position["long_cost_basis"] if position["long"] > 0 else 0
-                realized_gain = (current_price - avg_cost_per_share) * quantity
-                self.portfolio["realized_gains"][ticker]["long"] += realized_gain
-
-                position["long"] -= quantity
-                self.portfolio["cash"] += quantity * current_price
-
-                if position["long"] == 0:
-                    position["long_cost_basis"] = 0.0
-
-                return quantity
-
-        elif action == "short":
-            """
-            Typical short sale flow:
-              1) Receive proceeds = current_price * quantity
-              2) Post margin_required = proceeds * margin_ratio
-              3) Net effect on cash = +proceeds - margin_required
-            """
-            proceeds = current_price * quantity
-            margin_required = proceeds * self.portfolio["margin_requirement"]
-            if margin_required <= self.portfolio["cash"]:
-                # Weighted average short cost basis
-                old_short_shares = position["short"]
-                old_cost_basis = position["short_cost_basis"]
-                new_shares = quantity
-                total_shares = old_short_shares + new_shares
-
-                if total_shares > 0:
-                    total_old_cost = old_cost_basis * old_short_shares
-                    total_new_cost = current_price * new_shares
-                    position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                position["short"] += quantity
-
-                # Update margin usage
-                position["short_margin_used"] += margin_required
-                self.portfolio["margin_used"] += margin_required
-
-                # Increase cash by proceeds, then subtract the required margin
-                self.portfolio["cash"] += proceeds
-                self.portfolio["cash"] -= margin_required
-                return quantity
-            else:
-                # Calculate maximum shortable quantity
-                margin_ratio = self.portfolio["margin_requirement"]
-                if margin_ratio > 0:
-                    max_quantity = int(self.portfolio["cash"] / (current_price * margin_ratio))
-                else:
-                    max_quantity = 0
-
-                if max_quantity > 0:
-                    proceeds = current_price * max_quantity
-                    margin_required = proceeds * margin_ratio
-
-                    old_short_shares = position["short"]
-                    old_cost_basis = position["short_cost_basis"]
-                    total_shares = old_short_shares + max_quantity
-
-                    if total_shares > 0:
-                        total_old_cost = old_cost_basis * old_short_shares
-                        total_new_cost = current_price * max_quantity
-                        position["short_cost_basis"] = (total_old_cost + total_new_cost) / total_shares
-
-                    position["short"] += max_quantity
-                    position["short_margin_used"] += margin_required
-                    self.portfolio["margin_used"] += margin_required
-
-                    self.portfolio["cash"] += proceeds
-                    self.portfolio["cash"] -= margin_required
-                    return max_quantity
-                return 0
-
-        elif action == "cover":
-            """
-            When covering shares:
-              1) Pay cover cost = current_price * quantity
-              2) Release a proportional share of the margin
-              3) Net effect on cash = -cover_cost + released_margin
-            """
-            quantity = min(quantity, position["short"])
-            if quantity > 0:
-                cover_cost = quantity * current_price
-                avg_short_price = position["short_cost_basis"] if position["short"] > 0 else 0
-                realized_gain = (avg_short_price - current_price) * quantity
-
-                if position["short"] > 0:
-                    portion = quantity / position["short"]
-                else:
-                    portion = 1.0
-
-                margin_to_release = portion * position["short_margin_used"]
-
-                position["short"] -= quantity
-                position["short_margin_used"] -= margin_to_release
-                self.portfolio["margin_used"] -= margin_to_release
-
-                # Pay the cost to cover, but get back the released margin
-                self.portfolio["cash"] += margin_to_release
-                self.portfolio["cash"] -= cover_cost
-
-                self.portfolio["realized_gains"][ticker]["short"] += realized_gain
-
-                if position["short"] == 0:
-                    position["short_cost_basis"] = 0.0
-                    position["short_margin_used"] = 0.0
-
-                return quantity
-
-        return 0
+        action_code = ACTIONS.index(action) if action in ACTIONS else HOLD
+        return self.engine.execute_trade(self.engine.index[ticker], action_code, quantity, current_price)
 
     def calculate_portfolio_value(self, current_prices):
         """
@@ -255,21 +106,7 @@ class Backtester:
           - market value of long positions
           - unrealized gains/losses for short positions
         """
-        total_value = self.portfolio["cash"]
-
-        for ticker in self.tickers:
-            position = self.portfolio["positions"][ticker]
-            price = current_prices[ticker]
-
-            # Long position value
-            long_value = position["long"] * price
-            total_value += long_value
-
-            # Short position unrealized PnL = short_shares * (short_cost_basis - current_price)
-            if position["short"] > 0:
-                total_value += position["short"] * (position["short_cost_basis"] - price)
-
-        return total_value
+        return self.engine.total_value(np.array([current_prices[ticker] for ticker in self.tickers]))
 
     def prefetch_data(self):
         """Pre-fetch all data needed for the backtest period."""
@@ -280,18 +117,15 @@ class Backtester:
         start_date_dt = end_date_dt - relativedelta(years=1)
         start_date_str = start_date_dt.strftime("%Y-%m-%d")
 
-        for ticker in self.tickers:
-            # Fetch price data for the entire period, plus 1 year
-            get_prices(ticker, start_date_str, self.end_date)
-
-            # Fetch financial metrics
-            get_financial_metrics(ticker, self.end_date, limit=10)
+        # Fetch prices (plus 1 year of history), financial metrics, insider trades
+        # and company news for all tickers concurrently
+        failures = prefetch_universe(self.tickers, self.start_date, self.end_date, price_start_date=start_date_str)
+        for ticker, datasets in failures.items():
+            print(f"Warning: could not pre-fetch {', '.join(datasets)} for {ticker}")
 
-            # Fetch insider trades
-            get_insider_trades(ticker, self.end_date, start_date=self.start_date, limit=1000)
-
-            # Fetch company news
-            get_company_news(ticker, self.end_date, start_date=self.start_date, limit=1000)
+        # Fetch line items once, as of the last day, with enough report periods to answer every earlier day
+        requests = plan_line_item_requests(self.selected_analysts or list(ANALYST_CONFIG))
+        prefetch_line_items(self.tickers, self.end_date, extend_line_item_requests(requests, self.start_date, self.end_date))
 
         print("Data pre-fetch complete.")
 
@@ -324,8 +158,10 @@ class Backtester:
         print("\nStarting backtest...")
 
         # Initialize portfolio values list with initial capital
+        self.performance_tracker = PerformanceTracker()
         if len(dates) > 0:
             self.portfolio_values = [{"Date": dates[0], "Portfolio Value": self.initial_capital}]
+            self.performance_tracker.update(dates[0], self.initial_capital)
         else:
             self.portfolio_values = []
 
@@ -376,34 +212,27 @@ class Backtester:
                 model_name=self.model_name,
                 model_provider=self.model_provider,
                 selected_analysts=self.selected_analysts,
+                execution_mode=self.execution_mode,
+                max_concurrency=self.max_concurrency,
+                signal_mode=self.signal_mode,
+                signal_cache=self.signal_cache,
             )
             decisions = output["decisions"]
             analyst_signals = output["analyst_signals"]
 
-            # Execute trades for each ticker
-            executed_trades = {}
-            for ticker in self.tickers:
-                decision = decisions.get(ticker, {"action": "hold", "quantity": 0})
-                action, quantity = decision.get("action", "hold"), decision.get("quantity", 0)
-
-                executed_quantity = self.execute_trade(ticker, action, quantity, current_prices[ticker])
-                executed_trades[ticker] = executed_quantity
+            # Execute trades for all tickers at once
+            prices = np.array([current_prices[ticker] for ticker in self.tickers])
+            actions, quantities = self.engine.encode_decisions(decisions)
+            executed_trades = dict(zip(self.tickers, self.engine.execute_trades(actions, quantities, prices).tolist()))
 
             # ---------------------------------------------------------------
             # 2) Now that trades have executed trades, recalculate the final
             #    portfolio value for this day.
             # ---------------------------------------------------------------
-            total_value = self.calculate_portfolio_value(current_prices)
+            total_value = self.engine.total_value(prices)
 
             # Also compute long/short exposures for final post‐trade state
-            long_exposure = sum(
-                self.portfolio["positions"][t]["long"] * current_prices[t]
-                for t in self.tickers
-            )
-            short_exposure = sum(
-                self.portfolio["positions"][t]["short"] * current_prices[t]
-                for t in self.tickers
-            )
+            long_exposure, short_exposure = self.engine.exposures(prices)
 
             # Calculate gross and net exposures
             gross_exposure = long_exposure + short_exposure
@@ -422,6 +251,7 @@ class Backtester:
                 "Net Exposure": net_exposure,
                 "Long/Short Ratio": long_short_ratio
             })
+            self.performance_tracker.update(current_date, total_value)
 
             # ---------------------------------------------------------------
             # 3) Build the table rows to display
@@ -440,9 +270,10 @@ class Backtester:
                 neutral_count = len([s for s in ticker_signals.values() if s.get("signal", "").lower() == "neutral"])
 
                 # Calculate net position value
-                pos = self.portfolio["positions"][ticker]
-                long_val = pos["long"] * current_prices[ticker]
-                short_val = pos["short"] * current_prices[ticker]
+                i = self.engine.index[ticker]
+                long_shares, short_shares = int(self.engine.long[i]), int(self.engine.short[i])
+                long_val = long_shares * current_prices[ticker]
+                short_val = short_shares * current_prices[ticker]
                 net_position_value = long_val - short_val
 
                 # Get the action and quantity from the decisions
@@ -457,7 +288,7 @@ class Backtester:
                         action=action,
                         quantity=quantity,
                         price=current_prices[ticker],
-                        shares_owned=pos["long"] - pos["short"],  # net shares
+                        shares_owned=long_shares - short_shares,  # net shares
                         position_value=net_position_value,
                         bullish_count=bullish_count,
                         bearish_count=bearish_count,
@@ -487,8 +318,8 @@ class Backtester:
                     is_summary=True,
                     total_value=total_value,
                     return_pct=portfolio_return,
-                    cash_balance=self.portfolio["cash"],
-                    total_position_value=total_value - self.portfolio["cash"],
+                    cash_balance=self.engine.cash,
+                    total_position_value=total_value - self.engine.cash,
                     sharpe_ratio=performance_metrics["sharpe_ratio"],
                     sortino_ratio=performance_metrics["sortino_ratio"],
                     max_drawdown=performance_metrics["max_drawdown"],
@@ -496,65 +327,25 @@ class Backtester:
             )
 
             self.table_rows.extend(date_rows)
-            print_backtest_results(self.table_rows)
+            self.renderer.render_day(self.table_rows, date_rows)
 
             # Update performance metrics if we have enough data
             if len(self.portfolio_values) > 3:
                 self._update_performance_metrics(performance_metrics)
 
+        self.renderer.finish(self.table_rows)
+
+        if self.signal_cache is not None:
+            stats = self.signal_cache.stats()
+            print(f"Reused {stats['reused']} of {stats['reused'] + stats['computed']} analyst signals with unchanged inputs")
+
         # Store the final performance metrics for reference in analyze_performance
         self.performance_metrics = performance_metrics
         return performance_metrics
 
     def _update_performance_metrics(self, performance_metrics):
-        """Helper method to update performance metrics using daily returns."""
-        values_df = pd.DataFrame(self.portfolio_values).set_index("Date")
-        values_df["Daily Return"] = values_df["Portfolio Value"].pct_change()
-        clean_returns = values_df["Daily Return"].dropna()
-
-        if len(clean_returns) < 2:
-            return  # not enough data points
-
-        # Assumes 252 trading days/year
-        daily_risk_free_rate = 0.0434 / 252
-        excess_returns = clean_returns - daily_risk_free_rate
-        mean_excess_return = excess_returns.mean()
-        std_excess_return = excess_returns.std()
-
-        # Sharpe ratio
-        if std_excess_return > 1e-12:
-            performance_metrics["sharpe_ratio"] = np.sqrt(252) * (mean_excess_return / std_excess_return)
-        else:
-            performance_metrics["sharpe_ratio"] = 0.0
-
-        # Sortino ratio
-        negative_returns = excess_returns[excess_returns < 0]
-        if len(negative_returns) > 0:
-            downside_std = negative_returns.std()
-            if downside_std > 1e-12:
-                performance_metrics["sortino_ratio"] = np.sqrt(252) * (mean_excess_return / downside_std)
-            else:
-                performance_metrics["sortino_ratio"] = float('inf') if mean_excess_return > 0 else 0
-        else:
-            performance_metrics["sortino_ratio"] = float('inf') if mean_excess_return > 0 else 0
-
-        # Maximum drawdown (ensure it's stored as a negative percentage)
-        rolling_max = values_df["Portfolio Value"].cummax()
-        drawdown = (values_df["Portfolio Value"] - rolling_max) / rolling_max
-        
-        if len(drawdown) > 0:
-            min_drawdown = drawdown.min()
-            # Store as a negative percentage
-            performance_metrics["max_drawdown"] = min_drawdown * 100
-            
-            # Store the date of max drawdown for reference
-            if min_drawdown < 0:
-                performance_metrics["max_drawdown_date"] = drawdown.idxmin().strftime('%Y-%m-%d')
-            else:
-                performance_metrics["max_drawdown_date"] = None
-        else:
-            performance_metrics["max_drawdown"] = 0.0
-            performance_metrics["max_drawdown_date"] = None
+        """Helper method to update performance metrics from the streaming tracker of daily returns."""
+        self.performance_tracker.update_metrics(performance_metrics)
 
     def analyze_performance(self):
         """Creates a performance DataFrame, prints summary stats, and plots equity curve."""
@@ -574,9 +365,10 @@ class Backtester:
         print(f"Total Return: {Fore.GREEN if total_return >= 0 else Fore.RED}{total_return:.2f}%{Style.RESET_ALL}")
         
         # Print realized P&L for informational purposes only
+        realized_gains = self.portfolio["realized_gains"]
         total_realized_gains = sum(
-            self.portfolio["realized_gains"][ticker]["long"] + 
-            self.portfolio["realized_gains"][ticker]["short"] 
+            realized_gains[ticker]["long"] + 
+            realized_gains[ticker]["short"] 
             for ticker in self.tickers
         )
         print(f"Total Realized Gains/Losses: {Fore.GREEN if total_realized_gains >= 0 else Fore.RED}${total_realized_gains:,.2f}{Style.RESET_ALL}")
@@ -694,6 +486,43 @@ if __name__ == "__main__":
         type=str,
         help="Export results to Excel file (e.g., 'backtest_results.xlsx')"
     )
+    parser.add_argument(
+        "--execution-mode",
+        type=str,
+        choices=["parallel", "sequential"],
+        default="parallel",
+        help="Run the selected analysts concurrently or one at a time (default: parallel)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Maximum number of analysts running at once (default: per-provider limit)",
+    )
+    parser.add_argument(
+        "--signal-mode",
+        type=str,
+        choices=SIGNAL_MODES,
+        default="llm",
+        help="Persona analyst signals from the LLM, from their rules only (no LLM calls), or hybrid (LLM only for borderline scores)",
+    )
+    parser.add_argument(
+        "--no-incremental",
+        action="store_true",
+        help="Rerun every analyst for every ticker each day instead of reusing signals whose fundamental inputs are unchanged",
+    )
+
+    parser.add_argument(
+        "--render-mode",
+        type=str,
+        choices=BACKTEST_RENDER_MODES,
+        default="full",
+        help="Show daily results by reprinting the full table, appending new rows, a fixed-height live view, or JSON events (default: full)",
+    )
+    parser.add_argument(
+        "--events-file",
+        type=str,
+        help="Write --render-mode events as JSON lines to this file instead of stderr",
+    )
 
     args = parser.parse_args()
 
@@ -782,6 +611,8 @@ if __name__ == "__main__":
                 model_provider = "Unknown"
                 print(f"\nSelected model: {Fore.GREEN + Style.BRIGHT}{model_choice}{Style.RESET_ALL}\n")
 
+    events_file = open(args.events_file, "w") if args.events_file else None
+
     # Create and run the backtester
     backtester = Backtester(
         agent=run_hedge_fund,
@@ -793,10 +624,18 @@ if __name__ == "__main__":
         model_provider=model_provider,
         selected_analysts=selected_analysts,
         initial_margin_requirement=args.margin_requirement,
+        execution_mode=args.execution_mode,
+        max_concurrency=args.max_concurrency,
+        signal_mode=args.signal_mode,
+        incremental=not args.no_incremental,
+        render_mode=args.render_mode,
+        event_sink=write_json_lines(events_file) if events_file else None,
     )
 
     performance_metrics = backtester.run_backtest()
     performance_df = backtester.analyze_performance()
+    if events_file:
+        events_file.close()
     
     # Export to Excel if requested
     if args.excel_output:
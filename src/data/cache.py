@@ -1,69 +1,510 @@
+import abc
+import datetime
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.tools.http_client import ARCHIVE_MODES, get_mode_from_env
+
+# How long (in seconds) each dataset stays fresh in the persistent backend
+DEFAULT_TTLS = {
+    "prices": 24 * 60 * 60,
+    "financial_metrics": 7 * 24 * 60 * 60,
+    "line_items": 7 * 24 * 60 * 60,
+    "insider_trades": 24 * 60 * 60,
+    "company_news": 24 * 60 * 60,
+    "hk_symbols": 30 * 24 * 60 * 60,
+}
+
+# Datasets whose cached rows are tracked by the date ranges they fully cover
+RANGE_DATASETS = ("prices", "insider_trades", "company_news")
+
+# Lower bound used for range queries without a start date
+MIN_DATE = "1900-01-01"
+
+DEFAULT_CACHE_PATH = os.path.join("~", ".cache", "ai-hedge-fund", "financial_data.db")
+DEFAULT_MAX_SIZE_MB = 512
+
+
+class CacheBackend(abc.ABC):
+    """Interface for persistent cache backends used by Cache."""
+
+    @abc.abstractmethod
+    def get(self, dataset: str, key: str) -> any:
+        """Return the stored value, or None if missing or expired."""
+
+    @abc.abstractmethod
+    def set(self, dataset: str, key: str, value: any):
+        """Store a JSON-serializable value."""
+
+    @abc.abstractmethod
+    def clear(self, dataset: str | None = None):
+        """Remove all entries, or only the entries of one dataset."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """SQLite-backed cache with per-dataset TTLs and least-recently-used eviction.
+
+    With read_only=True the database must already exist; reads leave it untouched and writes are
+    ignored, so many processes can share one store (e.g. the workers of a parameter sweep).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttls: dict[str, float] | None = None,
+        max_size_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024,
+        read_only: bool = False,
+    ):
+        self.path = os.path.expanduser(path)
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_size_bytes = max_size_bytes
+        self.read_only = read_only
+        self._lock = threading.Lock()
+
+        if read_only:
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, timeout=30, check_same_thread=False)
+            return
+
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                dataset TEXT NOT NULL,
+                key TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                updated_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (dataset, key)
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed_at ON cache_entries (accessed_at)")
+        self._conn.commit()
+
+    def get(self, dataset: str, key: str) -> any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT payload, updated_at FROM cache_entries WHERE dataset = ? AND key = ?", (dataset, key)).fetchone()
+            if row is None:
+                return None
+
+            payload, updated_at = row
+            ttl = self.ttls.get(dataset)
+            if ttl is not None and now - updated_at > ttl:
+                if self.read_only:
+                    return None
+                self._conn.execute("DELETE FROM cache_entries WHERE dataset = ? AND key = ?", (dataset, key))
+                self._conn.commit()
+                return None
+
+            if not self.read_only:
+                self._conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE dataset = ? AND key = ?", (now, dataset, key))
+                self._conn.commit()
+        return json.loads(payload)
+
+    def set(self, dataset: str, key: str, value: any):
+        if self.read_only:
+            return
+        payload = json.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (dataset, key, payload, size, updated_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (dataset, key, payload, len(payload), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def clear(self, dataset: str | None = None):
+        if self.read_only:
+            return
+        with self._lock:
+            if dataset is None:
+                self._conn.execute("DELETE FROM cache_entries")
+            else:
+                self._conn.execute("DELETE FROM cache_entries WHERE dataset = ?", (dataset,))
+            self._conn.commit()
+
+    def merge_from(self, path: str):
+        """Copy every entry of another SQLite cache file into this one, replacing entries with the same key."""
+        if self.read_only:
+            return
+        columns = "dataset, key, payload, size, updated_at, accessed_at"
+        with self._lock:
+            self._conn.execute("ATTACH DATABASE ? AS other", (os.path.expanduser(path),))
+            try:
+                self._conn.execute(f"INSERT OR REPLACE INTO cache_entries ({columns}) SELECT {columns} FROM other.cache_entries")
+                self._evict()
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+            finally:
+                self._conn.execute("DETACH DATABASE other")
+
+    def _evict(self):
+        """Drop least recently accessed entries until the store fits in max_size_bytes."""
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        rows = self._conn.execute("SELECT dataset, key, size FROM cache_entries ORDER BY accessed_at ASC").fetchall()
+        for dataset, key, size in rows:
+            if total_size <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM cache_entries WHERE dataset = ? AND key = ?", (dataset, key))
+            total_size -= size
+
+
+def create_backend_from_env() -> CacheBackend | None:
+    """Build the persistent backend configured by FINANCIAL_DATA_CACHE_PATH (empty string disables it).
+
+    Recording and replaying an archive always run without it, so the requests made depend only on the run itself.
+    """
+    path = os.environ.get("FINANCIAL_DATA_CACHE_PATH", DEFAULT_CACHE_PATH)
+    if not path or get_mode_from_env() in ARCHIVE_MODES:
+        return None
+
+    max_size_mb = float(os.environ.get("FINANCIAL_DATA_CACHE_MAX_MB", DEFAULT_MAX_SIZE_MB))
+    try:
+        return SQLiteCacheBackend(path, max_size_bytes=int(max_size_mb * 1024 * 1024))
+    except (sqlite3.Error, OSError) as e:
+        logging.warning(f"Persistent cache disabled, could not open {path}: {e}")
+        return None
+
+
+def shift_date(date: str, days: int) -> str:
+    return (datetime.date.fromisoformat(date) + datetime.timedelta(days=days)).isoformat()
+
+
+def merge_ranges(ranges: list[list[str]]) -> list[list[str]]:
+    """Merge overlapping or adjacent inclusive [start, end] date ranges."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= shift_date(merged[-1][1], 1):
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return merged
+
+
+def missing_ranges(ranges: list[list[str]], start_date: str, end_date: str) -> list[tuple[str, str]]:
+    """Return the inclusive sub-ranges of [start_date, end_date] not covered by the merged ranges."""
+    gaps = []
+    cursor = start_date
+    for start, end in ranges:
+        if end < cursor:
+            continue
+        if start > end_date:
+            break
+        if start > cursor:
+            gaps.append((cursor, shift_date(start, -1)))
+        cursor = shift_date(end, 1)
+        if cursor > end_date:
+            return gaps
+    gaps.append((cursor, end_date))
+    return gaps
+
+
+class PriceFrame:
+    """Price history for one ticker stored as columns sorted by time.
+
+    Range lookups use binary search on the date part of the sorted time column
+    and return a slice of the underlying DataFrame instead of building per-row objects.
+    """
+
+    COLUMNS = ["open", "close", "high", "low", "volume", "time"]
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.times = frame["time"].to_numpy(dtype=str)
+        self.dates = self.times.astype("<U10")
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, list] | pd.DataFrame) -> "PriceFrame":
+        """Build a sorted, de-duplicated frame (first occurrence of a time wins)."""
+        frame = pd.DataFrame(columns, columns=cls.COLUMNS)
+        frame = frame.drop_duplicates(subset="time", keep="first").sort_values("time", kind="stable").reset_index(drop=True)
+        frame["Date"] = pd.to_datetime(frame["time"])
+        return cls(frame)
+
+    @classmethod
+    def from_records(cls, records: list[dict[str, any]]) -> "PriceFrame":
+        return cls.from_columns(pd.DataFrame.from_records(records, columns=cls.COLUMNS))
+
+    def merge(self, other: "PriceFrame") -> "PriceFrame":
+        """Merge another frame into this one, keeping existing rows for duplicate times."""
+        if self.frame.empty:
+            return other
+        return PriceFrame.from_columns(pd.concat([self.frame[self.COLUMNS], other.frame[self.COLUMNS]], ignore_index=True))
+
+    def slice(self, start_date: str | None = None, end_date: str | None = None) -> pd.DataFrame:
+        """Rows whose date falls within [start_date, end_date], both inclusive like the API filters."""
+        lo = 0 if start_date is None else int(np.searchsorted(self.dates, start_date, side="left"))
+        hi = len(self.dates) if end_date is None else int(np.searchsorted(self.dates, end_date, side="right"))
+        return self.frame.iloc[lo:hi]
+
+    def to_columns(self) -> dict[str, list]:
+        """JSON-serializable columnar representation for persistent backends."""
+        return self.frame[self.COLUMNS].to_dict(orient="list")
+
+
 class Cache:
-    """In-memory cache for API responses."""
+    """In-memory cache for API responses, optionally backed by a persistent store."""
 
-    def __init__(self):
-        self._prices_cache: dict[str, list[dict[str, any]]] = {}
+    def __init__(self, backend: CacheBackend | None = None, use_env_backend: bool = False):
+        """
+        :param backend: Persistent backend to read through and write through to.
+        :param use_env_backend: Lazily create the backend from environment variables on first use.
+        """
+        self._prices_cache: dict[str, PriceFrame] = {}
         self._financial_metrics_cache: dict[str, list[dict[str, any]]] = {}
-        self._line_items_cache: dict[str, list[dict[str, any]]] = {}
+        # Line items are stored per ticker as {"rows": {"<period>:<report_period>": row}, "queries": [...]}
+        # where each query records the fields, end_date, limit and report periods of one fetch
+        self._line_items_cache: dict[str, dict[str, any]] = {}
         self._insider_trades_cache: dict[str, list[dict[str, any]]] = {}
         self._company_news_cache: dict[str, list[dict[str, any]]] = {}
+        # HK symbol resolution per zero-padded base code: {"resolved": "<format>" | None, "failed": [...]}
+        self._hk_symbols_cache: dict[str, dict[str, any]] = {}
+        # Inclusive [start, end] date ranges per dataset and ticker whose rows are fully cached
+        self._coverage: dict[str, dict[str, list[list[str]]]] = {dataset: {} for dataset in RANGE_DATASETS}
+        self._backend = backend
+        self._use_env_backend = use_env_backend and backend is None
+        self._backend_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+    @property
+    def backend(self) -> CacheBackend | None:
+        """The persistent backend, resolved from the environment on first access if requested."""
+        if self._use_env_backend:
+            with self._backend_lock:
+                if self._use_env_backend:
+                    self._backend = create_backend_from_env()
+                    self._use_env_backend = False
+        return self._backend
+
+    def set_backend(self, backend: CacheBackend | None):
+        """Replace the persistent backend (None keeps the cache purely in memory)."""
+        self._backend = backend
+        self._use_env_backend = False
+
+    def _load(self, dataset: str, store: dict[str, any], ticker: str) -> any:
+        """Read from memory, falling back to the persistent backend on a miss."""
+        if ticker not in store and self.backend is not None:
+            payload = self.backend.get(dataset, ticker)
+            if payload is not None:
+                # Entries written before range tracking have no coverage and are refetched on demand
+                if dataset in RANGE_DATASETS and isinstance(payload, dict) and "coverage" in payload:
+                    self._coverage[dataset][ticker] = payload["coverage"]
+                    payload = payload["data"]
+                store[ticker] = PriceFrame.from_columns(payload) if dataset == "prices" else payload
+        return store.get(ticker)
 
-    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_field: str) -> list[dict]:
-        """Merge existing and new data, avoiding duplicates based on a key field."""
-        if not existing:
-            return new_data
+    def _persist(self, dataset: str, store: dict[str, any], ticker: str):
+        """Write the ticker's in-memory entry (and covered ranges) through to the persistent backend."""
+        if self.backend is None:
+            return
+        data = store[ticker].to_columns() if dataset == "prices" else store[ticker]
+        if dataset in RANGE_DATASETS:
+            data = {"data": data, "coverage": self._coverage[dataset].get(ticker, [])}
+        self.backend.set(dataset, ticker, data)
 
+    def _add_coverage(self, dataset: str, ticker: str, covered: tuple[str, str] | None):
+        """Record that [start, end] is fully cached. Days after today are never marked as covered,
+        except while recording or replaying an archive, where a replay must not depend on the date it runs."""
+        if covered is None:
+            return
+        start, end = covered
+        if get_mode_from_env() not in ARCHIVE_MODES:
+            end = min(end, datetime.date.today().isoformat())
+        if start > end:
+            return
+        ranges = self._coverage[dataset].get(ticker, [])
+        self._coverage[dataset][ticker] = merge_ranges([*ranges, [start, end]])
+
+    def _save(
+        self,
+        dataset: str,
+        store: dict[str, list[dict[str, any]]],
+        ticker: str,
+        data: list[dict[str, any]],
+        key_fields: tuple[str, ...],
+        covered: tuple[str, str] | None = None,
+    ):
+        """Merge new data into memory and write it through to the persistent backend."""
+        with self._lock:
+            store[ticker] = self._merge_data(self._load(dataset, store, ticker), data, key_fields=key_fields)
+            if dataset in RANGE_DATASETS:
+                self._add_coverage(dataset, ticker, covered)
+            self._persist(dataset, store, ticker)
+
+    def _merge_data(self, existing: list[dict] | None, new_data: list[dict], key_fields: tuple[str, ...]) -> list[dict]:
+        """Merge existing and new data, avoiding duplicates based on key fields."""
         # Create a set of existing keys for O(1) lookup
-        existing_keys = {item[key_field] for item in existing}
+        merged = list(existing or [])
+        seen_keys = {tuple(item.get(field) for field in key_fields) for item in merged}
 
-        # Only add items that don't exist yet
-        merged = existing.copy()
-        merged.extend([item for item in new_data if item[key_field] not in existing_keys])
+        # Only add items that don't exist yet (overlapping pages can repeat items within new_data too)
+        for item in new_data:
+            key = tuple(item.get(field) for field in key_fields)
+            if key not in seen_keys:
+                seen_keys.add(key)
+                merged.append(item)
         return merged
 
-    def get_prices(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached price data if available."""
-        return self._prices_cache.get(ticker)
+    def get_missing_ranges(self, dataset: str, ticker: str, start_date: str | None, end_date: str) -> list[tuple[str, str]]:
+        """Return the sub-ranges of [start_date, end_date] that are not cached yet for a range dataset."""
+        store = {"prices": self._prices_cache, "insider_trades": self._insider_trades_cache, "company_news": self._company_news_cache}[dataset]
+        with self._lock:
+            self._load(dataset, store, ticker)
+            return missing_ranges(self._coverage[dataset].get(ticker, []), start_date or MIN_DATE, end_date)
 
-    def set_prices(self, ticker: str, data: list[dict[str, any]]):
-        """Append new price data to cache."""
-        self._prices_cache[ticker] = self._merge_data(self._prices_cache.get(ticker), data, key_field="time")
+    def get_prices(self, ticker: str, start_date: str | None = None, end_date: str | None = None) -> pd.DataFrame | None:
+        """Get cached price rows within [start_date, end_date] as a DataFrame slice if available."""
+        prices = self._prices_cache.get(ticker)
+        if prices is None:
+            with self._lock:
+                prices = self._load("prices", self._prices_cache, ticker)
+        if prices is None:
+            return None
+        return prices.slice(start_date, end_date)
+
+    def set_prices(self, ticker: str, data: list[dict[str, any]] | pd.DataFrame, covered: tuple[str, str] | None = None):
+        """Merge new price data into the ticker's columnar store, optionally marking a date range as fully cached."""
+        new_prices = PriceFrame.from_columns(data) if isinstance(data, pd.DataFrame) else PriceFrame.from_records(data)
+        with self._lock:
+            existing = self._load("prices", self._prices_cache, ticker)
+            self._prices_cache[ticker] = existing.merge(new_prices) if existing is not None else new_prices
+            self._add_coverage("prices", ticker, covered)
+            self._persist("prices", self._prices_cache, ticker)
 
     def get_financial_metrics(self, ticker: str) -> list[dict[str, any]]:
         """Get cached financial metrics if available."""
-        return self._financial_metrics_cache.get(ticker)
+        return self._load("financial_metrics", self._financial_metrics_cache, ticker)
 
     def set_financial_metrics(self, ticker: str, data: list[dict[str, any]]):
         """Append new financial metrics to cache."""
-        self._financial_metrics_cache[ticker] = self._merge_data(self._financial_metrics_cache.get(ticker), data, key_field="report_period")
+        self._save("financial_metrics", self._financial_metrics_cache, ticker, data, key_fields=("report_period",))
+
+    def _covering_line_item_queries(self, entry: dict[str, any], end_date: str, period: str, limit: int) -> list[dict[str, any]]:
+        """Return the cached queries whose results contain the answer for (end_date, period, limit).
 
-    def get_line_items(self, ticker: str) -> list[dict[str, any]] | None:
-        """Get cached line items if available."""
-        return self._line_items_cache.get(ticker)
+        A query fetched up to a later end_date still answers an earlier one if it returned at least
+        `limit` report periods on or before end_date, or if it returned fewer rows than it asked for.
+        """
+        covering = []
+        for query in entry["queries"]:
+            if query["period"] != period or query["end_date"] < end_date:
+                continue
+            periods = [rp for rp in query["report_periods"] if rp <= end_date]
+            if len(periods) >= limit or len(query["report_periods"]) < query["limit"]:
+                covering.append(query)
+        return covering
 
-    def set_line_items(self, ticker: str, data: list[dict[str, any]]):
-        """Append new line items to cache."""
-        self._line_items_cache[ticker] = self._merge_data(self._line_items_cache.get(ticker), data, key_field="report_period")
+    def get_missing_line_items(self, ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> list[str]:
+        """Return the requested line items that the cache cannot answer yet."""
+        with self._lock:
+            entry = self._load("line_items", self._line_items_cache, ticker)
+            if not entry:
+                return list(dict.fromkeys(line_items))
+            covered = set()
+            for query in self._covering_line_item_queries(entry, end_date, period, limit):
+                covered.update(query["line_items"])
+            return [item for item in dict.fromkeys(line_items) if item not in covered]
+
+    def get_line_items(self, ticker: str, line_items: list[str], end_date: str, period: str, limit: int) -> list[dict[str, any]] | None:
+        """Get cached line items if every requested field is covered, newest report period first."""
+        with self._lock:
+            entry = self._load("line_items", self._line_items_cache, ticker)
+            if not entry or self.get_missing_line_items(ticker, line_items, end_date, period, limit):
+                return None
+
+            query = self._covering_line_item_queries(entry, end_date, period, limit)[0]
+            report_periods = sorted((rp for rp in query["report_periods"] if rp <= end_date), reverse=True)[:limit]
+            fields = {"ticker", "report_period", "period", "currency", *line_items}
+            results = []
+            for report_period in report_periods:
+                row = entry["rows"].get(f"{period}:{report_period}")
+                if row is not None:
+                    results.append({key: value for key, value in row.items() if key in fields})
+            return results
+
+    def set_line_items(self, ticker: str, line_items: list[str], end_date: str, period: str, limit: int, data: list[dict[str, any]]):
+        """Merge fetched line items into the per-report-period rows and record what the fetch covered."""
+        with self._lock:
+            entry = self._load("line_items", self._line_items_cache, ticker) or {"rows": {}, "queries": []}
+            for item in data:
+                key = f"{period}:{item['report_period']}"
+                entry["rows"][key] = {**entry["rows"].get(key, {}), **item}
+
+            report_periods = sorted({item["report_period"] for item in data}, reverse=True)
+            for query in entry["queries"]:
+                if (query["period"], query["end_date"], query["limit"], query["report_periods"]) == (period, end_date, limit, report_periods):
+                    query["line_items"] = sorted(set(query["line_items"]) | set(line_items))
+                    break
+            else:
+                entry["queries"].append(
+                    {
+                        "period": period,
+                        "end_date": end_date,
+                        "limit": limit,
+                        "line_items": sorted(set(line_items)),
+                        "report_periods": report_periods,
+                    }
+                )
+
+            self._line_items_cache[ticker] = entry
+            self._persist("line_items", self._line_items_cache, ticker)
 
     def get_insider_trades(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached insider trades if available."""
-        return self._insider_trades_cache.get(ticker)
+        return self._load("insider_trades", self._insider_trades_cache, ticker)
 
-    def set_insider_trades(self, ticker: str, data: list[dict[str, any]]):
-        """Append new insider trades to cache."""
-        self._insider_trades_cache[ticker] = self._merge_data(self._insider_trades_cache.get(ticker), data, key_field="filing_date")  # Could also use transaction_date if preferred
+    def set_insider_trades(self, ticker: str, data: list[dict[str, any]], covered: tuple[str, str] | None = None):
+        """Append new insider trades to cache, optionally marking a filing date range as fully cached."""
+        # Several trades share a filing date, so identify a trade by who traded what and when
+        key_fields = ("filing_date", "name", "transaction_date", "transaction_shares", "security_title")
+        self._save("insider_trades", self._insider_trades_cache, ticker, data, key_fields=key_fields, covered=covered)
 
     def get_company_news(self, ticker: str) -> list[dict[str, any]] | None:
         """Get cached company news if available."""
-        return self._company_news_cache.get(ticker)
+        return self._load("company_news", self._company_news_cache, ticker)
+
+    def set_company_news(self, ticker: str, data: list[dict[str, any]], covered: tuple[str, str] | None = None):
+        """Append new company news to cache, optionally marking a date range as fully cached."""
+        self._save("company_news", self._company_news_cache, ticker, data, key_fields=("url",), covered=covered)
+
+    def get_hk_symbol(self, code: str) -> dict[str, any] | None:
+        """Get the known working and failing symbol formats for an HK base code."""
+        with self._lock:
+            return self._load("hk_symbols", self._hk_symbols_cache, code)
 
-    def set_company_news(self, ticker: str, data: list[dict[str, any]]):
-        """Append new company news to cache."""
-        self._company_news_cache[ticker] = self._merge_data(self._company_news_cache.get(ticker), data, key_field="date")
+    def record_hk_symbol(self, code: str, fmt: str, succeeded: bool):
+        """Remember that a symbol format worked (or failed) for an HK base code."""
+        with self._lock:
+            entry = self._load("hk_symbols", self._hk_symbols_cache, code) or {"resolved": None, "failed": []}
+            if succeeded:
+                entry = {"resolved": fmt, "failed": [f for f in entry["failed"] if f != fmt]}
+            elif fmt not in entry["failed"]:
+                entry = {**entry, "failed": [*entry["failed"], fmt]}
+            else:
+                return
+            self._hk_symbols_cache[code] = entry
+            self._persist("hk_symbols", self._hk_symbols_cache, code)
 
 
 # Global cache instance
-_cache = Cache()
+_cache = Cache(use_env_backend=True)
 
 
 def get_cache() -> Cache:
@@ -1,5 +1,6 @@
 from typing_extensions import Annotated, Sequence, TypedDict
 
+import functools
 import operator
 from langchain_core.messages import BaseMessage
 
@@ -11,13 +12,41 @@ def merge_dicts(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
     return {**a, **b}
 
 
+def merge_data(a: dict[str, any], b: dict[str, any]) -> dict[str, any]:
+    """Merge data updates, combining analyst_signals per agent so parallel analysts don't overwrite each other."""
+    merged = {**a, **b}
+    if "analyst_signals" in a or "analyst_signals" in b:
+        merged["analyst_signals"] = {**a.get("analyst_signals", {}), **b.get("analyst_signals", {})}
+    return merged
+
+
 # Define agent state
 class AgentState(TypedDict):
     messages: Annotated[Sequence[BaseMessage], operator.add]
-    data: Annotated[dict[str, any], merge_dicts]
+    data: Annotated[dict[str, any], merge_data]
     metadata: Annotated[dict[str, any], merge_dicts]
 
 
+def isolate_analyst_signals(node_func):
+    """Wrap an analyst node so it writes to its own copy of analyst_signals and returns only its signals.
+
+    Analysts record their output by mutating state["data"]["analyst_signals"]. When they run in
+    parallel that dict is shared, so each node gets a private copy and the merge_data reducer
+    combines the returned signals.
+    """
+
+    @functools.wraps(node_func)
+    def wrapper(state: AgentState):
+        signals = state["data"]["analyst_signals"]
+        data = {**state["data"], "analyst_signals": dict(signals)}
+        result = node_func({**state, "data": data})
+        updated = result.get("data", data)["analyst_signals"]
+        own_signals = {agent: value for agent, value in updated.items() if agent not in signals or value is not signals[agent]}
+        return {**result, "data": {"analyst_signals": own_signals}}
+
+    return wrapper
+
+
 def show_agent_reasoning(output, agent_name):
     print(f"\n{'=' * 10} {agent_name.center(28)} {'=' * 10}")
 
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+
+from pydantic import BaseModel
+
+from src.data.cache import SQLiteCacheBackend
+
+DEFAULT_LLM_CACHE_PATH = os.path.join("~", ".cache", "ai-hedge-fund", "llm_responses.db")
+DEFAULT_LLM_CACHE_MAX_MB = 256
+DEFAULT_LLM_CACHE_TTL_DAYS = 30
+
+# "on" reads and writes the cache, "off" bypasses it, "only" never calls the provider and fails on a miss
+LLM_CACHE_MODES = ("on", "off", "only")
+
+
+class LLMCacheMissError(Exception):
+    """Raised in cache-only mode when a prompt has no cached response."""
+
+
+def render_prompt(prompt: any) -> str:
+    """Render a prompt (prompt value, message list or string) to a stable string for hashing."""
+    if hasattr(prompt, "to_messages"):
+        prompt = prompt.to_messages()
+    if isinstance(prompt, list):
+        return json.dumps([{"type": getattr(m, "type", None), "content": getattr(m, "content", m)} for m in prompt], sort_keys=True, default=str)
+    return str(prompt)
+
+
+class LLMResponseCache:
+    """Persistent cache of structured LLM responses keyed by provider, model, schema, prompt and temperature.
+
+    With a write_backend, new responses are stored there and backend is only read (e.g. a sweep
+    worker reading the shared cache read-only and keeping its own responses in a file of its own).
+    """
+
+    def __init__(self, backend: SQLiteCacheBackend | None, mode: str = "on", write_backend: SQLiteCacheBackend | None = None):
+        if mode not in LLM_CACHE_MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.backend = backend
+        self.write_backend = write_backend
+        self.mode = mode if backend is not None or write_backend is not None or mode == "only" else "off"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(model_provider: str, model_name: str, pydantic_model: type[BaseModel], prompt: any, temperature: float | None) -> str:
+        schema = json.dumps(pydantic_model.model_json_schema(), sort_keys=True)
+        prompt_hash = hashlib.sha256(render_prompt(prompt).encode("utf-8")).hexdigest()
+        material = json.dumps([model_provider, model_name, schema, prompt_hash, temperature])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, pydantic_model: type[BaseModel]) -> BaseModel | None:
+        """Return the cached response, or None on a miss (raises LLMCacheMissError in cache-only mode)."""
+        if self.mode == "off":
+            return None
+        payload = None
+        for backend in (self.backend, self.write_backend):
+            if backend is not None and (payload := backend.get("llm_responses", key)) is not None:
+                break
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if payload is None:
+            if self.mode == "only":
+                raise LLMCacheMissError(f"No cached {pydantic_model.__name__} response for prompt {key[:12]} (LLM_CACHE_MODE=only)")
+            return None
+        return pydantic_model(**payload)
+
+    def set(self, key: str, response: BaseModel):
+        if self.mode == "on":
+            (self.write_backend or self.backend).set("llm_responses", key, response.model_dump(mode="json"))
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+def create_llm_backend_from_env(path: str | None = None, read_only: bool = False) -> SQLiteCacheBackend | None:
+    """Open the SQLite store at path (default: LLM_CACHE_PATH) with the LLM_CACHE_* limits, or None if the cache is disabled or cannot be opened."""
+    path = path or os.environ.get("LLM_CACHE_PATH", DEFAULT_LLM_CACHE_PATH)
+    if not path or os.environ.get("LLM_CACHE_MODE", "on").lower() == "off":
+        return None
+
+    max_size_mb = float(os.environ.get("LLM_CACHE_MAX_MB", DEFAULT_LLM_CACHE_MAX_MB))
+    ttl_days = float(os.environ.get("LLM_CACHE_TTL_DAYS", DEFAULT_LLM_CACHE_TTL_DAYS))
+    try:
+        return SQLiteCacheBackend(
+            path,
+            ttls={"llm_responses": ttl_days * 24 * 60 * 60},
+            max_size_bytes=int(max_size_mb * 1024 * 1024),
+            read_only=read_only,
+        )
+    except (sqlite3.Error, OSError) as e:
+        print(f"Warning: LLM response cache disabled, could not open {path}: {e}")
+        return None
+
+
+def create_llm_cache_from_env() -> LLMResponseCache:
+    """Build the response cache configured by the LLM_CACHE_* environment variables (empty path disables it).
+
+    If LLM_CACHE_WRITE_PATH is set, LLM_CACHE_PATH is opened read-only and new responses go to that file instead.
+    """
+    mode = os.environ.get("LLM_CACHE_MODE", "on").lower()
+    write_path = os.environ.get("LLM_CACHE_WRITE_PATH")
+    backend = create_llm_backend_from_env(read_only=bool(write_path))
+    write_backend = create_llm_backend_from_env(write_path) if write_path else None
+    if backend is None and write_backend is None:
+        return LLMResponseCache(None, mode="only" if mode == "only" else "off")
+    return LLMResponseCache(backend, mode=mode, write_backend=write_backend)
+
+
+_llm_cache: LLMResponseCache | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Get the global LLM response cache, creating it from the environment on first use."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = create_llm_cache_from_env()
+    return _llm_cache
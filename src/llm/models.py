@@ -1,4 +1,5 @@
 import os
+import threading
 from langchain_anthropic import ChatAnthropic
 from langchain_deepseek import ChatDeepSeek
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -21,11 +22,16 @@ class ModelProvider(str, Enum):
 
 
 
+# Context window assumed for models that don't set one (in tokens)
+DEFAULT_CONTEXT_WINDOW = 32000
+
+
 class LLMModel(BaseModel):
     """Represents an LLM model configuration"""
     display_name: str
     model_name: str
     provider: ModelProvider
+    context_window: int = DEFAULT_CONTEXT_WINDOW  # Tokens; bounds how many tickers share one batched prompt
 
     def to_choice_tuple(self) -> Tuple[str, str, str]:
         """Convert to format needed for questionary choices"""
@@ -58,67 +64,80 @@ AVAILABLE_MODELS = [
     LLMModel(
         display_name="[anthropic] claude-3.5-haiku",
         model_name="claude-3-5-haiku-latest",
-        provider=ModelProvider.ANTHROPIC
+        provider=ModelProvider.ANTHROPIC,
+        context_window=200000
     ),
     LLMModel(
         display_name="[anthropic] claude-3.5-sonnet",
         model_name="claude-3-5-sonnet-latest",
-        provider=ModelProvider.ANTHROPIC
+        provider=ModelProvider.ANTHROPIC,
+        context_window=200000
     ),
     LLMModel(
         display_name="[anthropic] claude-3.7-sonnet",
         model_name="claude-3-7-sonnet-latest",
-        provider=ModelProvider.ANTHROPIC
+        provider=ModelProvider.ANTHROPIC,
+        context_window=200000
     ),
     LLMModel(
         display_name="[deepseek] deepseek-r1",
         model_name="deepseek-reasoner",
-        provider=ModelProvider.DEEPSEEK
+        provider=ModelProvider.DEEPSEEK,
+        context_window=64000
     ),
     LLMModel(
         display_name="[deepseek] deepseek-v3",
         model_name="deepseek-chat",
-        provider=ModelProvider.DEEPSEEK
+        provider=ModelProvider.DEEPSEEK,
+        context_window=64000
     ),
     LLMModel(
         display_name="[gemini] gemini-2.0-flash",
         model_name="gemini-2.0-flash",
-        provider=ModelProvider.GEMINI
+        provider=ModelProvider.GEMINI,
+        context_window=1000000
     ),
     LLMModel(
         display_name="[gemini] gemini-2.5-pro",
         model_name="gemini-2.5-pro-exp-03-25",
-        provider=ModelProvider.GEMINI
+        provider=ModelProvider.GEMINI,
+        context_window=1000000
     ),
     LLMModel(
         display_name="[groq] llama-4-scout-17b",
         model_name="meta-llama/llama-4-scout-17b-16e-instruct",
-        provider=ModelProvider.GROQ
+        provider=ModelProvider.GROQ,
+        context_window=128000
     ),
     LLMModel(
         display_name="[groq] llama-4-maverick-17b",
         model_name="meta-llama/llama-4-maverick-17b-128e-instruct",
-        provider=ModelProvider.GROQ
+        provider=ModelProvider.GROQ,
+        context_window=128000
     ),
     LLMModel(
         display_name="[openai] gpt-4.5",
         model_name="gpt-4.5-preview",
-        provider=ModelProvider.OPENAI
+        provider=ModelProvider.OPENAI,
+        context_window=128000
     ),
     LLMModel(
         display_name="[openai] gpt-4o",
         model_name="gpt-4o",
-        provider=ModelProvider.OPENAI
+        provider=ModelProvider.OPENAI,
+        context_window=128000
     ),
     LLMModel(
         display_name="[openai] o3",
         model_name="o3",
-        provider=ModelProvider.OPENAI
+        provider=ModelProvider.OPENAI,
+        context_window=200000
     ),
     LLMModel(
         display_name="[openai] o4-mini",
         model_name="o4-mini",
-        provider=ModelProvider.OPENAI
+        provider=ModelProvider.OPENAI,
+        context_window=200000
     ),
 ]
 
@@ -127,42 +146,50 @@ OLLAMA_MODELS = [
     LLMModel(
         display_name="[ollama] gemma3 (4B)",
         model_name="gemma3:4b",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] qwen2.5 (7B)",
         model_name="qwen2.5",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] llama3.1 (8B)",
         model_name="llama3.1:latest",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] gemma3 (12B)",
         model_name="gemma3:12b",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] mistral-small3.1 (24B)",
         model_name="mistral-small3.1",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] gemma3 (27B)",
         model_name="gemma3:27b",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] qwen2.5 (32B)",
         model_name="qwen2.5:32b",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
     LLMModel(
         display_name="[ollama] llama-3.3 (70B)",
         model_name="llama3.3:70b-instruct-q4_0",
-        provider=ModelProvider.OLLAMA
+        provider=ModelProvider.OLLAMA,
+        context_window=4096  # Ollama's default num_ctx
     ),
 ]
 
@@ -172,12 +199,29 @@ LLM_ORDER = [model.to_choice_tuple() for model in AVAILABLE_MODELS]
 # Create Ollama LLM_ORDER separately
 OLLAMA_LLM_ORDER = [model.to_choice_tuple() for model in OLLAMA_MODELS]
 
+# How many analyst nodes may call a provider at the same time when running in parallel
+PROVIDER_MAX_CONCURRENCY = {
+    ModelProvider.ANTHROPIC: 8,
+    ModelProvider.DEEPSEEK: 4,
+    ModelProvider.GEMINI: 8,
+    ModelProvider.GROQ: 4,
+    ModelProvider.OPENAI: 8,
+    ModelProvider.OLLAMA: 1,  # A local server usually runs one generation at a time
+}
+
+def get_provider_max_concurrency(model_provider: str) -> int:
+    """Get the default parallelism for a provider (4 for unknown providers)"""
+    try:
+        return PROVIDER_MAX_CONCURRENCY[ModelProvider(model_provider)]
+    except ValueError:
+        return 4
+
 def get_model_info(model_name: str) -> LLMModel | None:
     """Get model information by model_name"""
     all_models = AVAILABLE_MODELS + OLLAMA_MODELS
     return next((model for model in all_models if model.model_name == model_name), None)
 
-def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | ChatGroq | ChatOllama | None:
+def _create_model(model_name: str, model_provider: ModelProvider, base_url: str | None) -> ChatOpenAI | ChatGroq | ChatOllama | None:
     if model_provider == ModelProvider.GROQ:
         api_key = os.getenv("GROQ_API_KEY")
         if not api_key:
@@ -213,8 +257,54 @@ def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | Ch
         return ChatGoogleGenerativeAI(model=model_name, api_key=api_key)
     elif model_provider == ModelProvider.OLLAMA:
         # For Ollama, we use a base URL instead of an API key
-        base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         return ChatOllama(
             model=model_name, 
             base_url=base_url,
-        )
\ No newline at end of file
+        )
+
+
+# Chat model clients (and their connection pools) shared across calls and threads,
+# keyed by (provider, model, base_url); structured wrappers are keyed by schema too
+_model_clients: Dict[Tuple[str, str, Optional[str]], Any] = {}
+_structured_clients: Dict[Tuple[str, str, Optional[str], type], Any] = {}
+_model_clients_lock = threading.Lock()
+
+
+def _get_base_url(model_provider: ModelProvider) -> Optional[str]:
+    if model_provider == ModelProvider.OLLAMA:
+        return os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    return None
+
+
+def get_model(model_name: str, model_provider: ModelProvider) -> ChatOpenAI | ChatGroq | ChatOllama | None:
+    """Get the chat model client, creating it on first use"""
+    key = (model_provider, model_name, _get_base_url(model_provider))
+    client = _model_clients.get(key)
+    if client is None:
+        with _model_clients_lock:
+            client = _model_clients.get(key)
+            if client is None:
+                client = _create_model(model_name, model_provider, key[2])
+                if client is not None:
+                    _model_clients[key] = client
+    return client
+
+
+def get_structured_model(model_name: str, model_provider: ModelProvider, pydantic_model: type[BaseModel]):
+    """Get the chat model client wrapped to return pydantic_model (JSON mode), creating it on first use"""
+    key = (model_provider, model_name, _get_base_url(model_provider), pydantic_model)
+    client = _structured_clients.get(key)
+    if client is None:
+        llm = get_model(model_name, model_provider)
+        with _model_clients_lock:
+            client = _structured_clients.get(key)
+            if client is None:
+                client = _structured_clients[key] = llm.with_structured_output(pydantic_model, method="json_mode")
+    return client
+
+
+def clear_model_clients():
+    """Drop all cached clients, e.g. after changing API keys or base URLs"""
+    with _model_clients_lock:
+        _model_clients.clear()
+        _structured_clients.clear()
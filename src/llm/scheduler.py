@@ -0,0 +1,239 @@
+import asyncio
+import contextlib
+import itertools
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+
+from src.llm.models import get_provider_max_concurrency
+from src.tools.http_client import parse_retry_after
+
+# Priorities for queued LLM calls (higher runs first)
+PRIORITY_ANALYST = 0
+PRIORITY_PORTFOLIO_MANAGER = 10
+
+# Response tokens assumed when budgeting a call against a tokens-per-minute limit
+DEFAULT_OUTPUT_TOKENS = 500
+
+# Pause applied to a provider after a 429 without Retry-After, doubled on consecutive 429s
+INITIAL_RATE_LIMIT_BACKOFF = 1.0
+MAX_RATE_LIMIT_BACKOFF = 60.0
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether a provider SDK exception is a 429 / quota error."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ in ("RateLimitError", "ResourceExhausted", "TooManyRequests")
+
+
+def get_retry_after(error: Exception) -> float | None:
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    return parse_retry_after(headers.get("retry-after")) if headers is not None else None
+
+
+class MinuteBudget:
+    """Per-minute allowance (requests or tokens) that refills continuously. 0 disables limiting."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self._available = per_minute
+        self._updated_at = time.monotonic()
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until amount is available (0 if it is now). Amounts above the capacity wait for a full budget."""
+        if self.capacity <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated_at) * self.capacity / 60)
+        self._updated_at = now
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self._available) * 60 / self.capacity)
+
+    def consume(self, amount: float):
+        if self.capacity > 0:
+            self._available -= min(amount, self.capacity)
+
+
+class ProviderLimits:
+    """Concurrency caps, rate budgets and rate-limit state for one provider."""
+
+    def __init__(self, max_concurrency: int, model_max_concurrency: int, requests_per_minute: float, tokens_per_minute: float):
+        self.max_concurrency = max_concurrency
+        self.model_max_concurrency = model_max_concurrency
+        # Lowered on 429s and raised back one step per successful call
+        self.concurrency = max_concurrency
+        self.requests = MinuteBudget(requests_per_minute)
+        self.tokens = MinuteBudget(tokens_per_minute)
+        self.active = 0
+        self.active_by_model = defaultdict(int)
+        self.waiting = []
+        self.paused_until = 0.0
+        self.backoff = 0.0
+
+
+class LLMScheduler:
+    """Admits LLM calls per provider in priority order, within concurrency caps and RPM/TPM budgets.
+
+    Limits for a provider come from LLM_<PROVIDER>_MAX_CONCURRENCY (default: the provider's
+    parallelism in llm/models.py), LLM_<PROVIDER>_MODEL_MAX_CONCURRENCY (per model, default: the
+    provider cap), LLM_<PROVIDER>_RPM and LLM_<PROVIDER>_TPM (0 = unlimited), e.g. LLM_OPENAI_RPM=500.
+    A 429 pauses the provider (Retry-After, or an exponential backoff) and halves its concurrency.
+    """
+
+    def __init__(self, environ: dict[str, str] | None = None):
+        self.environ = os.environ if environ is None else environ
+        self._providers: dict[str, ProviderLimits] = {}
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        # (loop, event) pairs of coroutines waiting in acquire_async, woken alongside the condition
+        self._async_waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    def _limits(self, model_provider: str) -> ProviderLimits:
+        limits = self._providers.get(model_provider)
+        if limits is None:
+            name = getattr(model_provider, "value", model_provider).upper()
+            max_concurrency = int(self.environ.get(f"LLM_{name}_MAX_CONCURRENCY", get_provider_max_concurrency(model_provider)))
+            limits = self._providers[model_provider] = ProviderLimits(
+                max_concurrency=max(1, max_concurrency),
+                model_max_concurrency=max(1, int(self.environ.get(f"LLM_{name}_MODEL_MAX_CONCURRENCY", max_concurrency))),
+                requests_per_minute=float(self.environ.get(f"LLM_{name}_RPM", 0)),
+                tokens_per_minute=float(self.environ.get(f"LLM_{name}_TPM", 0)),
+            )
+        return limits
+
+    def _admit_wait(self, limits: ProviderLimits, ticket: tuple, tokens: int) -> float | None:
+        """Admit ticket if it is next in line and within limits. Returns 0 if admitted, else how long to wait (None = until notified)."""
+        if (wait := limits.paused_until - time.monotonic()) > 0:
+            return wait
+        if limits.active >= limits.concurrency:
+            return None
+        # The highest priority (then oldest) waiter whose model is under its cap goes first
+        next_ticket = min((t for t in limits.waiting if limits.active_by_model[t[2]] < limits.model_max_concurrency), default=None)
+        if next_ticket != ticket:
+            return None
+        if (wait := max(limits.requests.wait_time(1), limits.tokens.wait_time(tokens))) > 0:
+            return wait
+
+        limits.requests.consume(1)
+        limits.tokens.consume(tokens)
+        limits.waiting.remove(ticket)
+        limits.active += 1
+        limits.active_by_model[ticket[2]] += 1
+        # Waiters that checked while this ticket was at the head wait without a timeout, so wake them for the free slots
+        if limits.waiting and limits.active < limits.concurrency:
+            self._notify()
+        return 0.0
+
+    def _notify(self):
+        self._condition.notify_all()
+        for loop, event in self._async_waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def acquire(self, model_provider: str, model_name: str, tokens: int = 0, priority: int = PRIORITY_ANALYST):
+        """Block until a call to model_name may start."""
+        with self._condition:
+            limits = self._limits(model_provider)
+            ticket = (-priority, next(self._sequence), model_name)
+            limits.waiting.append(ticket)
+            try:
+                while (wait := self._admit_wait(limits, ticket, tokens)) != 0:
+                    self._condition.wait(timeout=wait)
+            except BaseException:
+                if ticket in limits.waiting:
+                    limits.waiting.remove(ticket)
+                    self._notify()
+                raise
+
+    async def acquire_async(self, model_provider: str, model_name: str, tokens: int = 0, priority: int = PRIORITY_ANALYST):
+        """Like acquire, but waits without blocking the event loop."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._condition:
+            limits = self._limits(model_provider)
+            ticket = (-priority, next(self._sequence), model_name)
+            limits.waiting.append(ticket)
+            self._async_waiters.add(waiter)
+        try:
+            while True:
+                with self._condition:
+                    waiter[1].clear()
+                    if (wait := self._admit_wait(limits, ticket, tokens)) == 0:
+                        return
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._condition:
+                if ticket in limits.waiting:
+                    limits.waiting.remove(ticket)
+                    self._notify()
+            raise
+        finally:
+            with self._condition:
+                self._async_waiters.discard(waiter)
+
+    def release(self, model_provider: str, model_name: str, error: Exception | None = None):
+        """Finish a call, backing off the provider if it failed with a rate limit."""
+        with self._condition:
+            limits = self._limits(model_provider)
+            limits.active -= 1
+            limits.active_by_model[model_name] -= 1
+            if error is not None and is_rate_limit_error(error):
+                limits.backoff = min(MAX_RATE_LIMIT_BACKOFF, max(INITIAL_RATE_LIMIT_BACKOFF, limits.backoff * 2))
+                delay = get_retry_after(error) or limits.backoff * random.uniform(0.5, 1.5)
+                limits.paused_until = max(limits.paused_until, time.monotonic() + delay)
+                limits.concurrency = max(1, limits.concurrency // 2)
+            elif error is None:
+                limits.backoff = 0.0
+                limits.concurrency = min(limits.max_concurrency, limits.concurrency + 1)
+            self._notify()
+
+    @contextlib.contextmanager
+    def slot(self, model_provider: str, model_name: str, tokens: int = 0, priority: int = PRIORITY_ANALYST):
+        """Hold a slot for one LLM call: with scheduler.slot(...): llm.invoke(prompt)"""
+        self.acquire(model_provider, model_name, tokens, priority)
+        try:
+            yield
+        except Exception as e:
+            self.release(model_provider, model_name, error=e)
+            raise
+        else:
+            self.release(model_provider, model_name)
+
+    @contextlib.asynccontextmanager
+    async def aslot(self, model_provider: str, model_name: str, tokens: int = 0, priority: int = PRIORITY_ANALYST):
+        """Async slot: async with scheduler.aslot(...): await llm.ainvoke(prompt)"""
+        await self.acquire_async(model_provider, model_name, tokens, priority)
+        try:
+            yield
+        except Exception as e:
+            self.release(model_provider, model_name, error=e)
+            raise
+        else:
+            self.release(model_provider, model_name)
+
+
+def retry_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """Exponential backoff with full jitter before retry number attempt + 1."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+_scheduler: LLMScheduler | None = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the global LLM scheduler, configured from the environment on first use."""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = LLMScheduler()
+    return _scheduler
@@ -7,11 +7,14 @@ from colorama import Fore, Style, init
 import questionary
 from src.agents.portfolio_manager import portfolio_management_agent
 from src.agents.risk_manager import risk_management_agent
-from src.graph.state import AgentState
+from src.graph.state import AgentState, isolate_analyst_signals
 from src.utils.display import print_trading_output
-from src.utils.analysts import ANALYST_ORDER, get_analyst_nodes
+from src.utils.analysts import ANALYST_CONFIG, ANALYST_ORDER, get_analyst_nodes, plan_line_item_requests
+from src.tools.api import prefetch_line_items
 from src.utils.progress import progress
-from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, ModelProvider
+from src.utils.persona import SIGNAL_MODES
+from src.utils.incremental import IncrementalSignalCache
+from src.llm.models import LLM_ORDER, OLLAMA_LLM_ORDER, get_model_info, get_provider_max_concurrency, ModelProvider
 from src.utils.ollama import ensure_ollama_and_model
 
 import argparse
@@ -64,18 +67,43 @@ def run_hedge_fund(
     selected_analysts: list[str] = [],
     model_name: str = "gpt-4o",
     model_provider: str = "OpenAI",
+    execution_mode: str = "parallel",
+    max_concurrency: int | None = None,
+    signal_mode: str = "llm",
+    signal_cache: IncrementalSignalCache | None = None,
 ):
+    """
+    :param execution_mode: "parallel" runs the analysts concurrently, "sequential" runs them one at a time.
+    :param max_concurrency: Maximum number of analysts running at once in parallel mode
+        (defaults to the provider's limit in PROVIDER_MAX_CONCURRENCY).
+    :param signal_mode: How persona analysts turn their rule-based analysis into signals: "llm" asks the LLM,
+        "rules" uses the rule-based signal without an LLM call, "hybrid" asks the LLM only for borderline scores.
+    :param signal_cache: Reuse analyst signals for tickers whose inputs are unchanged since an earlier call
+        with the same cache (e.g. the previous backtest day).
+    """
+    if execution_mode not in ("parallel", "sequential"):
+        raise ValueError(f"Unknown execution mode: {execution_mode}")
+    if signal_mode not in SIGNAL_MODES:
+        raise ValueError(f"Unknown signal mode: {signal_mode}")
+    if execution_mode == "sequential":
+        max_concurrency = 1
+    elif max_concurrency is None:
+        max_concurrency = get_provider_max_concurrency(model_provider)
+
     # Start progress tracking
     progress.start()
 
     try:
         # Create a new workflow if analysts are customized
-        if selected_analysts:
-            workflow = create_workflow(selected_analysts)
+        if selected_analysts or signal_cache is not None:
+            workflow = create_workflow(selected_analysts or None, signal_cache=signal_cache)
             agent = workflow.compile()
         else:
             agent = app
 
+        # Fetch the line items of all selected analysts up front, one request per period
+        prefetch_line_items(tickers, end_date, plan_line_item_requests(selected_analysts or list(ANALYST_CONFIG)))
+
         final_state = agent.invoke(
             {
                 "messages": [
@@ -94,8 +122,11 @@ def run_hedge_fund(
                     "show_reasoning": show_reasoning,
                     "model_name": model_name,
                     "model_provider": model_provider,
+                    "signal_mode": signal_mode,
                 },
             },
+            # Analysts are branches of the same graph step, so this bounds how many run at once
+            config={"max_concurrency": max_concurrency},
         )
 
         return {
@@ -112,8 +143,8 @@ def start(state: AgentState):
     return state
 
 
-def create_workflow(selected_analysts=None):
-    """Create the workflow with selected analysts."""
+def create_workflow(selected_analysts=None, signal_cache: IncrementalSignalCache | None = None):
+    """Create the workflow with selected analysts, optionally reusing their unchanged signals from signal_cache."""
     workflow = StateGraph(AgentState)
     workflow.add_node("start_node", start)
 
@@ -123,10 +154,12 @@ def create_workflow(selected_analysts=None):
     # Default to all analysts if none selected
     if selected_analysts is None:
         selected_analysts = list(analyst_nodes.keys())
-    # Add selected analyst nodes
+    # Add selected analyst nodes, each writing only its own signals so they can run in parallel
     for analyst_key in selected_analysts:
         node_name, node_func = analyst_nodes[analyst_key]
-        workflow.add_node(node_name, node_func)
+        if signal_cache is not None:
+            node_func = signal_cache.wrap(node_name, node_func)
+        workflow.add_node(node_name, isolate_analyst_signals(node_func))
         workflow.add_edge("start_node", node_name)
 
     # Always add risk and portfolio management
@@ -181,6 +214,25 @@ if __name__ == "__main__":
     parser.add_argument("--selected-analysts", type=str, help="Comma-separated list of analysts (e.g., ben_graham,charlie_munger)")
     parser.add_argument("--model-choice", type=str, help="LLM model name (e.g., gpt-4o)")
     parser.add_argument("--model-provider", type=str, help="LLM provider (e.g., OpenAI, Groq, Ollama)")
+    parser.add_argument(
+        "--execution-mode",
+        type=str,
+        choices=["parallel", "sequential"],
+        default="parallel",
+        help="Run the selected analysts concurrently or one at a time. Defaults to parallel",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        help="Maximum number of analysts running at once. Defaults to a per-provider limit",
+    )
+    parser.add_argument(
+        "--signal-mode",
+        type=str,
+        choices=SIGNAL_MODES,
+        default="llm",
+        help="Persona analyst signals from the LLM, from their rules only (no LLM calls), or hybrid (LLM only for borderline scores)",
+    )
 
     args = parser.parse_args()
 
@@ -305,6 +357,9 @@ if __name__ == "__main__":
         selected_analysts=selected_analysts,
         model_name=model_choice,
         model_provider=model_provider,
+        execution_mode=args.execution_mode,
+        max_concurrency=args.max_concurrency,
+        signal_mode=args.signal_mode,
     )
     print("[INFO] Simulation completed.")
     print_trading_output(result)
@@ -0,0 +1,251 @@
+"""Array-backed portfolio accounting for the backtester.
+
+Positions, cost bases, margin and realized gains are NumPy vectors indexed by ticker. A day's
+trades are applied with vector operations when every buy and short can be filled in full; otherwise
+they fall back to filling one ticker at a time. Both paths follow the same rules (and the same
+floating point operation order) as the original per-ticker dict accounting.
+"""
+
+import numpy as np
+
+ACTIONS = ("hold", "buy", "sell", "short", "cover")
+HOLD, BUY, SELL, SHORT, COVER = range(len(ACTIONS))
+
+
+def _accumulate(start: float, terms: np.ndarray) -> np.ndarray:
+    """Running totals of start + terms[0] + terms[1] + ..., added left to right like a Python loop."""
+    return np.add.accumulate(np.concatenate(([start], terms)))
+
+
+class PortfolioEngine:
+    def __init__(self, tickers: list[str], initial_cash: float, margin_requirement: float = 0.0):
+        self.tickers = list(tickers)
+        self.index = {ticker: i for i, ticker in enumerate(self.tickers)}
+        n = len(self.tickers)
+        self.cash = float(initial_cash)
+        self.margin_used = 0.0  # total margin usage across all short positions
+        self.margin_requirement = margin_requirement  # The margin ratio required for shorts
+        self.long = np.zeros(n, dtype=np.int64)  # Number of shares held long
+        self.short = np.zeros(n, dtype=np.int64)  # Number of shares held short
+        self.long_cost_basis = np.zeros(n)  # Average cost basis per share (long)
+        self.short_cost_basis = np.zeros(n)  # Average cost basis per share (short)
+        self.short_margin_used = np.zeros(n)  # Dollars of margin used for each ticker's short
+        self.realized_long = np.zeros(n)  # Realized gains from long positions
+        self.realized_short = np.zeros(n)  # Realized gains from short positions
+
+    def encode_decisions(self, decisions: dict[str, dict[str, any]]) -> tuple[np.ndarray, np.ndarray]:
+        """Action codes and requested quantities in ticker order (missing or unknown actions hold)."""
+        actions = np.zeros(len(self.tickers), dtype=np.int64)
+        quantities = np.zeros(len(self.tickers))
+        for ticker, decision in decisions.items():
+            if ticker in self.index:
+                action = decision.get("action", "hold")
+                actions[self.index[ticker]] = ACTIONS.index(action) if action in ACTIONS else HOLD
+                quantities[self.index[ticker]] = decision.get("quantity", 0)
+        return actions, quantities
+
+    def execute_trades(self, actions: np.ndarray, quantities: np.ndarray, prices: np.ndarray) -> np.ndarray:
+        """Execute one trade per ticker, in ticker order, and return the executed share counts."""
+        if not self._execute_vectorized(actions, quantities, prices):
+            return np.array([self.execute_trade(i, actions[i], quantities[i], prices[i]) for i in range(len(self.tickers))], dtype=np.int64)
+        return self._executed
+
+    def _execute_vectorized(self, actions: np.ndarray, quantities: np.ndarray, prices: np.ndarray) -> bool:
+        """Apply all trades at once if every buy and short fits the cash available at its turn. Returns False otherwise."""
+        active = quantities > 0
+        requested = np.where(active, quantities, 0).astype(np.int64)  # force integer shares
+        is_buy, is_sell = active & (actions == BUY), active & (actions == SELL)
+        is_short, is_cover = active & (actions == SHORT), active & (actions == COVER)
+
+        quantity = np.where(is_sell, np.minimum(requested, self.long), np.where(is_cover, np.minimum(requested, self.short), requested))
+        is_sell &= quantity > 0
+        is_cover &= quantity > 0
+
+        cost = quantity * prices
+        proceeds = prices * quantity
+        margin_required = proceeds * self.margin_requirement
+        cover_cost = quantity * prices
+        with np.errstate(divide="ignore", invalid="ignore"):
+            portion = np.where(self.short > 0, quantity / self.short, 1.0)
+        margin_to_release = portion * self.short_margin_used
+
+        # Cash changes in the order the per-ticker accounting applies them, two steps per ticker
+        first = np.select([is_buy, is_sell, is_short, is_cover], [-cost, quantity * prices, proceeds, margin_to_release], 0.0)
+        second = np.select([is_short, is_cover], [-margin_required, -cover_cost], 0.0)
+        cash_path = _accumulate(self.cash, np.column_stack((first, second)).ravel())
+        cash_before = cash_path[:-1:2]
+        if np.any(is_buy & (cost > cash_before)) or np.any(is_short & (margin_required > cash_before)):
+            return False
+
+        # Long side
+        total_long = self.long + quantity
+        self.long_cost_basis = np.where(is_buy & (total_long > 0), (self.long_cost_basis * self.long + cost) / np.where(total_long > 0, total_long, 1), self.long_cost_basis)
+        avg_cost_per_share = np.where(self.long > 0, self.long_cost_basis, 0)
+        self.realized_long = np.where(is_sell, self.realized_long + (prices - avg_cost_per_share) * quantity, self.realized_long)
+        self.long = self.long + np.where(is_buy, quantity, 0) - np.where(is_sell, quantity, 0)
+        self.long_cost_basis = np.where(is_sell & (self.long == 0), 0.0, self.long_cost_basis)
+
+        # Short side
+        total_short = self.short + quantity
+        avg_short_price = np.where(self.short > 0, self.short_cost_basis, 0)
+        self.realized_short = np.where(is_cover, self.realized_short + (avg_short_price - prices) * quantity, self.realized_short)
+        self.short_cost_basis = np.where(
+            is_short & (total_short > 0),
+            (self.short_cost_basis * self.short + prices * quantity) / np.where(total_short > 0, total_short, 1),
+            self.short_cost_basis,
+        )
+        self.short = self.short + np.where(is_short, quantity, 0) - np.where(is_cover, quantity, 0)
+        self.short_margin_used = np.select(
+            [is_short, is_cover & (self.short == 0), is_cover],
+            [self.short_margin_used + margin_required, 0.0, self.short_margin_used - margin_to_release],
+            self.short_margin_used,
+        )
+        self.short_cost_basis = np.where(is_cover & (self.short == 0), 0.0, self.short_cost_basis)
+
+        margin_changes = np.select([is_short, is_cover], [margin_required, -margin_to_release], 0.0)
+        self.margin_used = float(_accumulate(self.margin_used, margin_changes[is_short | is_cover])[-1])
+        self.cash = float(cash_path[-1])
+        self._executed = np.where(is_buy | is_sell | is_short | is_cover, quantity, 0)
+        return True
+
+    def execute_trade(self, i: int, action: int, quantity: float, current_price: float) -> int:
+        """
+        Execute one trade for the ticker at index i with support for both long and short positions.
+        `quantity` is the number of shares the agent wants to buy/sell/short/cover.
+        We will only trade integer shares to keep it simple.
+        """
+        if quantity <= 0:
+            return 0
+
+        quantity = int(quantity)  # force integer shares
+        current_price = float(current_price)
+
+        if action == BUY:
+            cost = quantity * current_price
+            if cost > self.cash:
+                # Calculate maximum affordable quantity
+                quantity = int(self.cash / current_price)
+                if quantity <= 0:
+                    return 0
+                cost = quantity * current_price
+
+            # Weighted average cost basis for the new total
+            total_shares = int(self.long[i]) + quantity
+            if total_shares > 0:
+                self.long_cost_basis[i] = (self.long_cost_basis[i] * self.long[i] + cost) / total_shares
+            self.long[i] += quantity
+            self.cash -= cost
+            return quantity
+
+        elif action == SELL:
+            # You can only sell as many as you own
+            quantity = min(quantity, int(self.long[i]))
+            if quantity > 0:
+                # Realized gain/loss using average cost basis
+                avg_cost_per_share = self.long_cost_basis[i] if self.long[i] > 0 else 0
+                self.realized_long[i] += (current_price - avg_cost_per_share) * quantity
+
+                self.long[i] -= quantity
+                self.cash += quantity * current_price
+
+                if self.long[i] == 0:
+                    self.long_cost_basis[i] = 0.0
+
+                return quantity
+
+        elif action == SHORT:
+            # Receive the proceeds, post margin_required = proceeds * margin_ratio against them
+            proceeds = current_price * quantity
+            margin_required = proceeds * self.margin_requirement
+            if margin_required > self.cash:
+                # Calculate maximum shortable quantity
+                margin_ratio = self.margin_requirement
+                quantity = int(self.cash / (current_price * margin_ratio)) if margin_ratio > 0 else 0
+                if quantity <= 0:
+                    return 0
+                proceeds = current_price * quantity
+                margin_required = proceeds * margin_ratio
+
+            # Weighted average short cost basis
+            total_shares = int(self.short[i]) + quantity
+            if total_shares > 0:
+                self.short_cost_basis[i] = (self.short_cost_basis[i] * self.short[i] + current_price * quantity) / total_shares
+            self.short[i] += quantity
+
+            # Update margin usage
+            self.short_margin_used[i] += margin_required
+            self.margin_used += margin_required
+
+            # Increase cash by proceeds, then subtract the required margin
+            self.cash += proceeds
+            self.cash -= margin_required
+            return quantity
+
+        elif action == COVER:
+            # Pay the cover cost and release a proportional share of the margin
+            quantity = min(quantity, int(self.short[i]))
+            if quantity > 0:
+                cover_cost = quantity * current_price
+                avg_short_price = self.short_cost_basis[i] if self.short[i] > 0 else 0
+                realized_gain = (avg_short_price - current_price) * quantity
+
+                portion = quantity / self.short[i] if self.short[i] > 0 else 1.0
+                margin_to_release = portion * self.short_margin_used[i]
+
+                self.short[i] -= quantity
+                self.short_margin_used[i] -= margin_to_release
+                self.margin_used -= margin_to_release
+
+                # Pay the cost to cover, but get back the released margin
+                self.cash += margin_to_release
+                self.cash -= cover_cost
+
+                self.realized_short[i] += realized_gain
+
+                if self.short[i] == 0:
+                    self.short_cost_basis[i] = 0.0
+                    self.short_margin_used[i] = 0.0
+
+                return quantity
+
+        return 0
+
+    def total_value(self, prices: np.ndarray) -> float:
+        """Cash plus long market value plus unrealized P&L of short positions."""
+        long_value = self.long * prices
+        short_pnl = np.where(self.short > 0, self.short * (self.short_cost_basis - prices), 0.0)
+        return float(_accumulate(self.cash, np.column_stack((long_value, short_pnl)).ravel())[-1])
+
+    def exposures(self, prices: np.ndarray) -> tuple[float, float]:
+        """Long and short market exposure."""
+        return float(_accumulate(0, self.long * prices)[-1]), float(_accumulate(0, self.short * prices)[-1])
+
+    def to_dict(self) -> dict[str, any]:
+        """The portfolio in the nested dict form the agents read (a snapshot, not a live view)."""
+        columns = zip(
+            self.tickers,
+            self.long.tolist(),
+            self.short.tolist(),
+            self.long_cost_basis.tolist(),
+            self.short_cost_basis.tolist(),
+            self.short_margin_used.tolist(),
+            self.realized_long.tolist(),
+            self.realized_short.tolist(),
+        )
+        positions, realized_gains = {}, {}
+        for ticker, long, short, long_cost_basis, short_cost_basis, short_margin_used, realized_long, realized_short in columns:
+            positions[ticker] = {
+                "long": long,
+                "short": short,
+                "long_cost_basis": long_cost_basis,
+                "short_cost_basis": short_cost_basis,
+                "short_margin_used": short_margin_used,
+            }
+            realized_gains[ticker] = {"long": realized_long, "short": realized_short}
+        return {
+            "cash": self.cash,
+            "margin_used": self.margin_used,
+            "margin_requirement": self.margin_requirement,
+            "positions": positions,
+            "realized_gains": realized_gains,
+        }
@@ -0,0 +1,250 @@
+"""Run the same backtest over a grid of parameters in a process pool and collect the metrics in one table."""
+
+import itertools
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+from colorama import Fore, Style, init
+from dateutil.relativedelta import relativedelta
+from tabulate import tabulate
+
+from src.backtester import Backtester
+from src.data.cache import SQLiteCacheBackend, get_cache
+from src.llm.cache import create_llm_backend_from_env
+from src.llm.models import get_model_info
+from src.main import run_hedge_fund
+from src.tools.api import extend_line_item_requests, prefetch_line_items, prefetch_universe
+from src.utils.analysts import ANALYST_CONFIG, ANALYST_ORDER, plan_line_item_requests
+from src.utils.persona import SIGNAL_MODES
+
+init(autoreset=True)
+
+# Grid keys a sweep can vary. "window" is a (start_date, end_date) pair; the others are Backtester arguments.
+SWEEP_PARAMETERS = ("selected_analysts", "model_name", "initial_margin_requirement", "initial_capital", "window", "signal_mode")
+
+METRIC_COLUMNS = ["final_value", "total_return", "sharpe_ratio", "sortino_ratio", "max_drawdown", "max_drawdown_date", "error"]
+
+
+def expand_grid(grid: dict[str, list]) -> list[dict[str, any]]:
+    """Every combination of the grid's values, e.g. {"a": [1, 2], "b": [3]} -> [{"a": 1, "b": 3}, {"a": 2, "b": 3}]."""
+    unknown = [key for key in grid if key not in SWEEP_PARAMETERS]
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(unknown)}. Expected any of {', '.join(SWEEP_PARAMETERS)}")
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def prefetch_windows(tickers: list[str], windows: list[tuple[str, str]], analyst_subsets: list[list[str] | None] | None = None):
+    """Warm the global data cache for every date window, fetching what Backtester.prefetch_data would for any of the analyst subsets (default: all analysts)."""
+    # One line item request per period for the union of the subsets also answers each subset's smaller request
+    analysts = list(dict.fromkeys(analyst for subset in analyst_subsets or [None] for analyst in subset or ANALYST_CONFIG))
+    line_item_requests = plan_line_item_requests(analysts)
+
+    for start_date, end_date in sorted(set(windows)):
+        price_start_date = (datetime.strptime(end_date, "%Y-%m-%d") - relativedelta(years=1)).strftime("%Y-%m-%d")
+        failures = prefetch_universe(tickers, start_date, end_date, price_start_date=price_start_date)
+        for ticker, datasets in failures.items():
+            print(f"Warning: could not pre-fetch {', '.join(datasets)} for {ticker} ({start_date} to {end_date})")
+        prefetch_line_items(tickers, end_date, extend_line_item_requests(line_item_requests, start_date, end_date))
+
+
+def _init_worker(cache_path: str, llm_cache_dir: str | None, quiet: bool):
+    # Workers read the market data the parent prefetched and keep anything else they fetch in memory
+    get_cache().set_backend(SQLiteCacheBackend(cache_path, read_only=True))
+    # Read the shared LLM response cache read-only and write new responses to a file of this worker's own,
+    # which the parent merges afterwards, so workers never contend for the shared database's write lock
+    if llm_cache_dir is not None:
+        os.environ["LLM_CACHE_WRITE_PATH"] = os.path.join(llm_cache_dir, f"llm_responses_{os.getpid()}.db")
+    if quiet:
+        sys.stdout = open(os.devnull, "w")
+
+
+def run_single_backtest(tickers: list[str], params: dict[str, any]) -> dict[str, any]:
+    """Run one backtest of a sweep and return its parameters and metrics (or the error that stopped it)."""
+    params = dict(params)
+    start_date, end_date = params.pop("window")
+    model_name = params.pop("model_name", "gpt-4o")
+    model_info = get_model_info(model_name)
+    initial_capital = params.get("initial_capital", 100000)
+
+    row = {"start_date": start_date, "end_date": end_date, "model_name": model_name, **params}
+    row["selected_analysts"] = ",".join(params.get("selected_analysts") or [])
+    try:
+        if model_info is None:
+            raise ValueError(f"Unknown model: {model_name}")
+        backtester = Backtester(
+            agent=run_hedge_fund,
+            tickers=tickers,
+            start_date=start_date,
+            end_date=end_date,
+            model_name=model_name,
+            model_provider=model_info.provider.value,
+            render_mode="events",
+            event_sink=lambda event: None,
+            **{**params, "initial_capital": initial_capital},
+        )
+        metrics = backtester.run_backtest()
+        final_value = backtester.portfolio_values[-1]["Portfolio Value"] if backtester.portfolio_values else initial_capital
+        row.update(
+            final_value=final_value,
+            total_return=(final_value / initial_capital - 1) * 100,
+            sharpe_ratio=metrics["sharpe_ratio"],
+            sortino_ratio=metrics["sortino_ratio"],
+            max_drawdown=metrics["max_drawdown"],
+            max_drawdown_date=metrics.get("max_drawdown_date"),
+            error=None,
+        )
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def run_sweep(
+    tickers: list[str],
+    grid: dict[str, list],
+    max_workers: int | None = None,
+    cache_path: str | None = None,
+    quiet: bool = True,
+) -> pd.DataFrame:
+    """
+    Run a Backtester for every combination in grid, several at a time in separate processes.
+
+    :param tickers: Tickers traded by every backtest.
+    :param grid: Values to try per parameter of SWEEP_PARAMETERS; "window" is required.
+    :param max_workers: Number of worker processes (default: one per CPU).
+    :param cache_path: SQLite data cache shared by the workers (default: the persistent cache, or a temporary file if it is disabled).
+    :param quiet: Discard the console output of the backtests.
+    :return: One row per backtest with its parameters and metrics, in grid order.
+    """
+    if not grid.get("window"):
+        raise ValueError("The sweep grid needs at least one (start_date, end_date) window")
+    runs = expand_grid(grid)
+
+    # Prefetch once into a SQLite store the workers open read-only, instead of every backtest fetching the same data
+    temp_dir = None
+    cache = get_cache()
+    previous_backend = cache.backend
+    cache_path = cache_path or getattr(previous_backend, "path", None)
+    if cache_path is None:
+        temp_dir = tempfile.mkdtemp(prefix="ai-hedge-fund-sweep-")
+        cache_path = os.path.join(temp_dir, "financial_data.db")
+    if getattr(previous_backend, "path", None) != os.path.expanduser(cache_path):
+        cache.set_backend(SQLiteCacheBackend(cache_path))
+
+    # Opening the shared LLM response cache here creates it, so the workers can open it read-only
+    llm_backend = create_llm_backend_from_env()
+    llm_cache_dir = tempfile.mkdtemp(prefix="ai-hedge-fund-sweep-llm-") if llm_backend is not None else None
+
+    try:
+        print(f"\nPre-fetching data for {len(set(grid['window']))} date window(s)...")
+        prefetch_windows(tickers, grid["window"], grid.get("selected_analysts"))
+
+        print(f"Running {len(runs)} backtests with {max_workers or os.cpu_count()} workers...")
+        rows = [None] * len(runs)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(cache_path, llm_cache_dir, quiet),
+        ) as executor:
+            futures = {executor.submit(run_single_backtest, tickers, params): i for i, params in enumerate(runs)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                row = rows[futures[future]] = future.result()
+                status = f"{Fore.RED}failed: {row['error']}" if row["error"] else f"{Fore.GREEN}{row['total_return']:+.2f}%"
+                print(f"[{done}/{len(runs)}] {row['selected_analysts']} {row['model_name']} {row['start_date']} to {row['end_date']}: {status}{Style.RESET_ALL}")
+    finally:
+        cache.set_backend(previous_backend)
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        if llm_cache_dir is not None:
+            merge_llm_caches(llm_backend, llm_cache_dir)
+            shutil.rmtree(llm_cache_dir, ignore_errors=True)
+
+    results = pd.DataFrame(rows)
+    parameter_columns = [column for column in results.columns if column not in METRIC_COLUMNS]
+    return results[parameter_columns + METRIC_COLUMNS]
+
+
+def merge_llm_caches(backend: SQLiteCacheBackend, llm_cache_dir: str):
+    """Copy the LLM responses the workers cached in llm_cache_dir into the shared response cache."""
+    for name in sorted(os.listdir(llm_cache_dir)):
+        try:
+            backend.merge_from(os.path.join(llm_cache_dir, name))
+        except sqlite3.Error as e:
+            print(f"Warning: could not merge cached LLM responses from {name}: {e}")
+
+
+def print_sweep_results(results: pd.DataFrame) -> None:
+    """Print the sweep results table."""
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}SWEEP RESULTS:{Style.RESET_ALL}")
+    print(tabulate(results.fillna(""), headers="keys", tablefmt="grid", showindex=False, floatfmt=".2f"))
+
+
+def _split_list(value: str, cast=str) -> list:
+    return [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a backtest for every combination of parameters, in parallel processes")
+    parser.add_argument("--tickers", type=str, required=True, help="Comma-separated list of stock ticker symbols (e.g., AAPL,MSFT,GOOGL)")
+    parser.add_argument(
+        "--analysts",
+        type=str,
+        action="append",
+        help="Comma-separated analyst subset to try; repeat the flag for several subsets (default: all analysts)",
+    )
+    parser.add_argument("--models", type=str, default="gpt-4o", help="Comma-separated model names to try (default: gpt-4o)")
+    parser.add_argument("--margin-requirements", type=str, default="0.0", help="Comma-separated margin ratios to try (default: 0.0)")
+    parser.add_argument("--initial-capitals", type=str, default="100000", help="Comma-separated initial capital amounts to try (default: 100000)")
+    parser.add_argument(
+        "--windows",
+        type=str,
+        default=f"{(datetime.now() - relativedelta(months=1)).strftime('%Y-%m-%d')}:{datetime.now().strftime('%Y-%m-%d')}",
+        help="Comma-separated START:END date windows in YYYY-MM-DD format (default: the last month)",
+    )
+    parser.add_argument("--signal-modes", type=str, default="llm", help=f"Comma-separated persona signal modes to try, from {', '.join(SIGNAL_MODES)} (default: llm)")
+    parser.add_argument("--workers", type=int, help="Number of backtests running at once (default: one per CPU)")
+    parser.add_argument("--cache-path", type=str, help="SQLite file for the market data shared by the workers (default: FINANCIAL_DATA_CACHE_PATH)")
+    parser.add_argument("--output", type=str, help="Save the results table to a .csv or .xlsx file")
+    parser.add_argument("--verbose", action="store_true", help="Show the console output of each backtest")
+
+    args = parser.parse_args()
+
+    signal_modes = _split_list(args.signal_modes)
+    invalid_modes = [mode for mode in signal_modes if mode not in SIGNAL_MODES]
+    if invalid_modes:
+        parser.error(f"Unknown signal mode(s): {', '.join(invalid_modes)}")
+
+    grid = {
+        "selected_analysts": [_split_list(analysts) for analysts in args.analysts] if args.analysts else [[value for _, value in ANALYST_ORDER]],
+        "model_name": _split_list(args.models),
+        "initial_margin_requirement": _split_list(args.margin_requirements, float),
+        "initial_capital": _split_list(args.initial_capitals, float),
+        "window": [tuple(window.split(":")) for window in _split_list(args.windows)],
+        "signal_mode": signal_modes,
+    }
+
+    results = run_sweep(
+        tickers=_split_list(args.tickers),
+        grid=grid,
+        max_workers=args.workers,
+        cache_path=args.cache_path,
+        quiet=not args.verbose,
+    )
+    print_sweep_results(results)
+
+    if args.output:
+        if args.output.endswith(".xlsx"):
+            results.to_excel(args.output, index=False)
+        else:
+            results.to_csv(args.output, index=False)
+        print(f"\nResults exported to {args.output}")
@@ -1,17 +1,21 @@
+import asyncio
 import datetime
+import math
 import os
+import weakref
 import pandas as pd
-import requests
 import logging
 
-from src.data.cache import get_cache
+from src.data.cache import MIN_DATE, PriceFrame, get_cache, shift_date
+from src.tools.http_client import get_client
+from src.tools.single_flight import coalesce
+from src.tools.input_recorder import record_input
 from src.data.models import (
     CompanyNews,
     CompanyNewsResponse,
     FinancialMetrics,
     FinancialMetricsResponse,
     Price,
-    PriceResponse,
     LineItem,
     LineItemResponse,
     InsiderTrade,
@@ -37,79 +41,109 @@ def normalize_ticker(ticker: str) -> str:
 
 
 def try_hk_ticker_formats(api_func, ticker, *args, **kwargs):
-    """Try all common HK ticker formats and return the first successful result."""
+    """Try HK ticker formats and return the first successful result.
+
+    The working format and the formats known to fail are remembered per base code,
+    so later calls (for any dataset) go straight to the right spelling.
+    """
     # Remove .HK/.hk/.HK:/.hk: for base
     base = ticker.upper().replace('.HK', '').replace(':HK', '')
-    formats = [
+    code = base.zfill(4)
+    formats = list(dict.fromkeys([
         base.zfill(4) + '.HK',
         base + '.HK',
         base.zfill(4) + ':HK',
         base + ':HK',
         base.zfill(4),
         base,
-    ]
+    ]))
+
+    resolution = _cache.get_hk_symbol(code) or {"resolved": None, "failed": []}
     errors = []
-    for fmt in formats:
+    if resolved := resolution["resolved"]:
+        try:
+            result = api_func(resolved, *args, **kwargs)
+        except Exception as e:
+            # The known format may have stopped working, so fall back to the others
+            errors.append(str(e))
+        else:
+            if result is not None and len(result) > 0:
+                return result
+            # An empty result for the known format means there is no data, not a wrong spelling
+            raise Exception(f"No data for HK ticker {ticker} using {resolved}")
+        formats = [fmt for fmt in formats if fmt != resolved]
+
+    # Skip formats known to fail, unless every candidate has failed before
+    candidates = [fmt for fmt in formats if fmt not in resolution["failed"]] or formats
+    for fmt in candidates:
         try:
             result = api_func(fmt, *args, **kwargs)
-            if result:
+            if result is not None and len(result) > 0:
                 logging.info(f"HK ticker {ticker}: worked with {fmt}")
+                _cache.record_hk_symbol(code, fmt, succeeded=True)
                 return result
         except Exception as e:
             errors.append(str(e))
-            continue
+        _cache.record_hk_symbol(code, fmt, succeeded=False)
     raise Exception(f"All HK ticker formats failed for {ticker}. Errors: {errors}")
 
 
-def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
-    """Fetch price data from cache or API."""
+def parse_price_columns(payload: dict[str, any]) -> pd.DataFrame:
+    """Parse a /prices/ response into typed columns, validating each column at once instead of per row."""
+    prices = payload.get("prices")
+    if not isinstance(prices, list):
+        raise Exception("Invalid price data: response has no 'prices' list")
+
+    frame = pd.DataFrame.from_records(prices, columns=PriceFrame.COLUMNS)
+    for col in ["open", "close", "high", "low", "volume"]:
+        values = pd.to_numeric(frame[col], errors="coerce")
+        if values.isna().any():
+            raise Exception(f"Invalid price data: non-numeric or missing '{col}' values")
+        frame[col] = values.astype("float64")
+    if (frame["volume"] % 1 != 0).any():
+        raise Exception("Invalid price data: non-integer 'volume' values")
+    frame["volume"] = frame["volume"].astype("int64")
+    if not frame["time"].map(lambda value: isinstance(value, str)).all():
+        raise Exception("Invalid price data: missing or non-string 'time' values")
+    return frame
+
+
+def _fetch_price_frame(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Fetch the date ranges of one symbol's prices missing from the cache, then serve the range as a Date-indexed frame."""
+    for gap_start, gap_end in _cache.get_missing_ranges("prices", ticker, start_date, end_date):
+        url = f"{get_client().base_url}/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={gap_start}&end_date={gap_end}"
+        response = get_client().get(url)
+        logging.info(f"API response for {ticker} ({gap_start} to {gap_end}): {response.status_code}")
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        _cache.set_prices(ticker, parse_price_columns(response.json()), covered=(gap_start, gap_end))
+    return _cache.get_prices(ticker, start_date, end_date).set_index("Date")
+
+
+@record_input(daily=True)
+@coalesce
+def get_price_frame(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """Fetch daily OHLCV prices as a Date-indexed DataFrame without building Price models."""
     # If HK ticker, try all formats
     if ticker.upper().endswith('.HK') or ticker.isdigit() or (':' in ticker and ticker.upper().endswith(':HK')):
         def api_call(fmt, *a, **kw):
             logging.info(f"Trying HK ticker format: {fmt}")
-            # Check cache first
-            if cached_data := _cache.get_prices(fmt):
-                filtered_data = [Price(**price) for price in cached_data if start_date <= price["time"] <= end_date]
-                if filtered_data:
-                    return filtered_data
-            headers = {}
-            if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-                headers["X-API-KEY"] = api_key
-            url = f"https://api.financialdatasets.ai/prices/?ticker={fmt}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-            response = requests.get(url, headers=headers)
-            logging.info(f"API response for {fmt}: {response.status_code}")
-            if response.status_code != 200:
-                raise Exception(f"Error fetching data: {fmt} - {response.status_code} - {response.text}")
-            price_response = PriceResponse(**response.json())
-            prices = price_response.prices
-            if not prices:
-                return []
-            _cache.set_prices(fmt, [p.model_dump() for p in prices])
-            return prices
+            return _fetch_price_frame(fmt, start_date, end_date)
         return try_hk_ticker_formats(api_call, ticker)
     # ... original logic for non-HK ...
     ticker = normalize_ticker(ticker)
     logging.info(f"Fetching prices for ticker: {ticker}")
-    if cached_data := _cache.get_prices(ticker):
-        filtered_data = [Price(**price) for price in cached_data if start_date <= price["time"] <= end_date]
-        if filtered_data:
-            return filtered_data
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-    url = f"https://api.financialdatasets.ai/prices/?ticker={ticker}&interval=day&interval_multiplier=1&start_date={start_date}&end_date={end_date}"
-    response = requests.get(url, headers=headers)
-    logging.info(f"API response for {ticker}: {response.status_code}")
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-    price_response = PriceResponse(**response.json())
-    prices = price_response.prices
-    if not prices:
-        return []
-    _cache.set_prices(ticker, [p.model_dump() for p in prices])
-    return prices
+    return _fetch_price_frame(ticker, start_date, end_date)
 
 
+@record_input(daily=True)
+def get_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Fetch price data from cache or API."""
+    return _frame_to_prices(get_price_frame(ticker, start_date, end_date))
+
+
+@record_input()
+@coalesce
 def get_financial_metrics(
     ticker: str,
     end_date: str,
@@ -126,11 +160,8 @@ def get_financial_metrics(
                 filtered_data.sort(key=lambda x: x.report_period, reverse=True)
                 if filtered_data:
                     return filtered_data[:limit]
-            headers = {}
-            if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-                headers["X-API-KEY"] = api_key
-            url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={fmt}&report_period_lte={end_date}&limit={limit}&period={period}"
-            response = requests.get(url, headers=headers)
+            url = f"{get_client().base_url}/financial-metrics/?ticker={fmt}&report_period_lte={end_date}&limit={limit}&period={period}"
+            response = get_client().get(url)
             logging.info(f"API response for {fmt}: {response.status_code}")
             if response.status_code != 200:
                 raise Exception(f"Error fetching data: {fmt} - {response.status_code} - {response.text}")
@@ -149,11 +180,8 @@ def get_financial_metrics(
         filtered_data.sort(key=lambda x: x.report_period, reverse=True)
         if filtered_data:
             return filtered_data[:limit]
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-    url = f"https://api.financialdatasets.ai/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
-    response = requests.get(url, headers=headers)
+    url = f"{get_client().base_url}/financial-metrics/?ticker={ticker}&report_period_lte={end_date}&limit={limit}&period={period}"
+    response = get_client().get(url)
     logging.info(f"API response for {ticker}: {response.status_code}")
     if response.status_code != 200:
         raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
@@ -165,6 +193,8 @@ def get_financial_metrics(
     return financial_metrics[:limit]
 
 
+@record_input()
+@coalesce
 def search_line_items(
     ticker: str,
     line_items: list[str],
@@ -172,163 +202,208 @@ def search_line_items(
     period: str = "ttm",
     limit: int = 10,
 ) -> list[LineItem]:
-    """Fetch line items from API."""
+    """Fetch line items from cache or API."""
     ticker = normalize_ticker(ticker)
     logging.info(f"Searching line items for ticker: {ticker}")
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    url = "https://api.financialdatasets.ai/financials/search/line-items"
-
-    body = {
-        "tickers": [ticker],
-        "line_items": line_items,
-        "end_date": end_date,
-        "period": period,
-        "limit": limit,
-    }
-    response = requests.post(url, headers=headers, json=body)
-    logging.info(f"API response for {ticker}: {response.status_code}")
-    if response.status_code != 200:
-        raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-    data = response.json()
-    response_model = LineItemResponse(**data)
-    search_results = response_model.search_results
-    if not search_results:
-        return []
 
-    # Cache the results
-    return search_results[:limit]
+    # Only fetch the fields that no earlier (superset) request has already cached
+    missing_line_items = _cache.get_missing_line_items(ticker, line_items, end_date, period, limit)
+    if missing_line_items:
+        url = f"{get_client().base_url}/financials/search/line-items"
+
+        body = {
+            "tickers": [ticker],
+            "line_items": missing_line_items,
+            "end_date": end_date,
+            "period": period,
+            "limit": limit,
+        }
+        response = get_client().post(url, json=body)
+        logging.info(f"API response for {ticker}: {response.status_code}")
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        data = response.json()
+        response_model = LineItemResponse(**data)
+        search_results = response_model.search_results
+
+        # Cache the results
+        _cache.set_line_items(ticker, missing_line_items, end_date, period, limit, [item.model_dump() for item in search_results[:limit]])
+
+    cached_data = _cache.get_line_items(ticker, line_items, end_date, period, limit) or []
+    return [LineItem(**item) for item in cached_data]
+
+
+def prefetch_line_items(tickers: list[str], end_date: str, requests: list[dict[str, any]]) -> None:
+    """Fetch planned line item requests for many tickers with one POST per request and seed the cache.
+
+    Tickers the combined response cannot be trusted to hold in full are fetched on their own.
+    Failures are only logged: agents fall back to fetching their own line items.
+    """
+    tickers = list(dict.fromkeys(normalize_ticker(ticker) for ticker in tickers))
+    url = f"{get_client().base_url}/financials/search/line-items"
+
+    for request in requests:
+        period, limit = request["period"], request["limit"]
+        missing_by_ticker = {ticker: _cache.get_missing_line_items(ticker, request["line_items"], end_date, period, limit) for ticker in tickers}
+        pending = [ticker for ticker, missing in missing_by_ticker.items() if missing]
+        if not pending:
+            continue
+        line_items = list(dict.fromkeys(item for ticker in pending for item in missing_by_ticker[ticker]))
+
+        # The endpoint's limit may apply across all tickers, so ask for enough rows for every ticker
+        body = {
+            "tickers": pending,
+            "line_items": line_items,
+            "end_date": end_date,
+            "period": period,
+            "limit": limit * len(pending),
+        }
+        try:
+            response = get_client().post(url, json=body)
+            if response.status_code != 200:
+                raise Exception(f"{response.status_code} - {response.text}")
+            search_results = LineItemResponse(**response.json()).search_results
+        except Exception as e:
+            logging.warning(f"Line item prefetch failed for {pending}: {e}")
+            continue
+
+        results_by_ticker: dict[str, list[LineItem]] = {}
+        for item in search_results:
+            results_by_ticker.setdefault(item.ticker, []).append(item)
+        response_complete = len(search_results) < body["limit"]
+
+        for ticker in pending:
+            results = sorted(results_by_ticker.get(ticker, []), key=lambda item: item.report_period, reverse=True)
+            # Only seed tickers whose rows are known to be complete for this limit
+            if len(results) >= limit or response_complete:
+                _cache.set_line_items(ticker, line_items, end_date, period, limit, [item.model_dump() for item in results[:limit]])
+            else:
+                try:
+                    search_line_items(ticker, line_items, end_date, period=period, limit=limit)
+                except Exception as e:
+                    logging.warning(f"Line item prefetch failed for {ticker}: {e}")
+
+
+# Upper bound on the report periods a company files per year, by line item period
+REPORT_PERIODS_PER_YEAR = {"annual": 1, "quarterly": 4, "ttm": 4}
 
 
+def extend_line_item_requests(requests: list[dict[str, any]], start_date: str, end_date: str) -> list[dict[str, any]]:
+    """Raise each request's limit by the report periods that can be filed between start_date and end_date.
+
+    Prefetched at end_date, the extended requests answer the original requests for every end_date
+    in the window from the cache, since at least `limit` of their report periods precede each date.
+    """
+    days = (datetime.date.fromisoformat(end_date) - datetime.date.fromisoformat(start_date)).days
+    extended = []
+    for request in requests:
+        per_year = REPORT_PERIODS_PER_YEAR.get(request["period"], 4)
+        extended.append({**request, "limit": request["limit"] + math.ceil(max(days, 0) * per_year / 365) + 1})
+    return extended
+
+
+def _fetch_dated_pages(ticker: str, build_url, parse_page, date_field: str, start_date: str | None, end_date: str, limit: int) -> tuple[list, str]:
+    """Page backwards from end_date until start_date is reached.
+
+    Returns the fetched items and the earliest date from which the fetch is known to be complete.
+    Without a start_date only one page is fetched, matching the API's "latest `limit` items" semantics.
+    """
+    items = []
+    current_end_date = end_date
+    while True:
+        response = get_client().get(build_url(start_date, current_end_date))
+        if response.status_code != 200:
+            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
+        page = parse_page(response.json())
+        items.extend(page)
+
+        # A partial page means nothing older is left in the requested range
+        if len(page) < limit:
+            return items, start_date or MIN_DATE
+
+        oldest_date = min(getattr(item, date_field) for item in page).split("T")[0]
+        if oldest_date == current_end_date:
+            # The API cannot page within a day, so a full page inside one day is all it will return for that day:
+            # count the day as covered and continue strictly before it
+            if not start_date or oldest_date <= start_date:
+                return items, start_date or oldest_date
+            current_end_date = shift_date(oldest_date, -1)
+            continue
+
+        # A full page may have cut off part of its oldest day, so that day is not complete yet
+        if not start_date:
+            return items, shift_date(oldest_date, 1)
+        current_end_date = oldest_date
+
+
+def _sync_dated_dataset(dataset: str, ticker: str, start_date: str | None, end_date: str, limit: int, build_url, parse_page, date_field: str) -> list[dict[str, any]]:
+    """Fetch only the date ranges missing from the cache and return the cached rows within [start_date, end_date]."""
+    get_cached, set_cached = getattr(_cache, f"get_{dataset}"), getattr(_cache, f"set_{dataset}")
+
+    # Newest gaps first, so a request without a start_date can stop once `limit` rows are known
+    for gap_start, gap_end in reversed(_cache.get_missing_ranges(dataset, ticker, start_date, end_date)):
+        if start_date is None:
+            newer = [row for row in get_cached(ticker) or [] if gap_end < row[date_field][:10] <= end_date]
+            if len(newer) >= limit:
+                break
+        items, covered_from = _fetch_dated_pages(
+            ticker, build_url, parse_page, date_field, None if gap_start == MIN_DATE else gap_start, gap_end, limit
+        )
+        set_cached(ticker, [item.model_dump() for item in items], covered=(covered_from, gap_end))
+
+    rows = [row for row in get_cached(ticker) or [] if (start_date is None or row[date_field][:10] >= start_date) and row[date_field][:10] <= end_date]
+    if start_date is None:
+        # Without a start date the API returns the latest `limit` rows
+        rows = sorted(rows, key=lambda row: row[date_field], reverse=True)[:limit]
+    return rows
+
+
+@record_input(daily=True)
+@coalesce
 def get_insider_trades(
     ticker: str,
     end_date: str,
     start_date: str | None = None,
     limit: int = 1000,
 ) -> list[InsiderTrade]:
-    """Fetch insider trades from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_insider_trades(ticker):
-        # Filter cached data by date range
-        filtered_data = [InsiderTrade(**trade) for trade in cached_data 
-                        if (start_date is None or (trade.get("transaction_date") or trade["filing_date"]) >= start_date)
-                        and (trade.get("transaction_date") or trade["filing_date"]) <= end_date]
-        filtered_data.sort(key=lambda x: x.transaction_date or x.filing_date, reverse=True)
-        if filtered_data:
-            return filtered_data
-
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
+    """Fetch insider trades filed within the date range, fetching only the ranges missing from the cache."""
 
-    all_trades = []
-    current_end_date = end_date
-    
-    while True:
-        url = f"https://api.financialdatasets.ai/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
-        if start_date:
-            url += f"&filing_date_gte={start_date}"
-        url += f"&limit={limit}"
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-        
-        data = response.json()
-        response_model = InsiderTradeResponse(**data)
-        insider_trades = response_model.insider_trades
-        
-        if not insider_trades:
-            break
-            
-        all_trades.extend(insider_trades)
-        
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(insider_trades) < limit:
-            break
-            
-        # Update end_date to the oldest filing date from current batch for next iteration
-        current_end_date = min(trade.filing_date for trade in insider_trades).split('T')[0]
-        
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
-
-    if not all_trades:
-        return []
+    def build_url(gap_start, current_end_date):
+        url = f"{get_client().base_url}/insider-trades/?ticker={ticker}&filing_date_lte={current_end_date}"
+        if gap_start:
+            url += f"&filing_date_gte={gap_start}"
+        return url + f"&limit={limit}"
 
-    # Cache the results
-    _cache.set_insider_trades(ticker, [trade.model_dump() for trade in all_trades])
-    return all_trades
+    trades = _sync_dated_dataset(
+        "insider_trades", ticker, start_date, end_date, limit, build_url, lambda data: InsiderTradeResponse(**data).insider_trades, "filing_date"
+    )
+    trades.sort(key=lambda trade: trade.get("transaction_date") or trade["filing_date"], reverse=True)
+    return [InsiderTrade(**trade) for trade in trades]
 
 
+@record_input(daily=True)
+@coalesce
 def get_company_news(
     ticker: str,
     end_date: str,
     start_date: str | None = None,
     limit: int = 1000,
 ) -> list[CompanyNews]:
-    """Fetch company news from cache or API."""
-    # Check cache first
-    if cached_data := _cache.get_company_news(ticker):
-        # Filter cached data by date range
-        filtered_data = [CompanyNews(**news) for news in cached_data 
-                        if (start_date is None or news["date"] >= start_date)
-                        and news["date"] <= end_date]
-        filtered_data.sort(key=lambda x: x.date, reverse=True)
-        if filtered_data:
-            return filtered_data
+    """Fetch company news within the date range, fetching only the ranges missing from the cache."""
 
-    # If not in cache or insufficient data, fetch from API
-    headers = {}
-    if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-        headers["X-API-KEY"] = api_key
-
-    all_news = []
-    current_end_date = end_date
-    
-    while True:
-        url = f"https://api.financialdatasets.ai/news/?ticker={ticker}&end_date={current_end_date}"
-        if start_date:
-            url += f"&start_date={start_date}"
-        url += f"&limit={limit}"
-        
-        response = requests.get(url, headers=headers)
-        if response.status_code != 200:
-            raise Exception(f"Error fetching data: {ticker} - {response.status_code} - {response.text}")
-        
-        data = response.json()
-        response_model = CompanyNewsResponse(**data)
-        company_news = response_model.news
-        
-        if not company_news:
-            break
-            
-        all_news.extend(company_news)
-        
-        # Only continue pagination if we have a start_date and got a full page
-        if not start_date or len(company_news) < limit:
-            break
-            
-        # Update end_date to the oldest date from current batch for next iteration
-        current_end_date = min(news.date for news in company_news).split('T')[0]
-        
-        # If we've reached or passed the start_date, we can stop
-        if current_end_date <= start_date:
-            break
-
-    if not all_news:
-        return []
+    def build_url(gap_start, current_end_date):
+        url = f"{get_client().base_url}/news/?ticker={ticker}&end_date={current_end_date}"
+        if gap_start:
+            url += f"&start_date={gap_start}"
+        return url + f"&limit={limit}"
 
-    # Cache the results
-    _cache.set_company_news(ticker, [news.model_dump() for news in all_news])
-    return all_news
+    news = _sync_dated_dataset("company_news", ticker, start_date, end_date, limit, build_url, lambda data: CompanyNewsResponse(**data).news, "date")
+    news.sort(key=lambda item: item["date"], reverse=True)
+    return [CompanyNews(**item) for item in news]
 
 
+@record_input()
+@coalesce
 def get_market_cap(
     ticker: str,
     end_date: str,
@@ -337,12 +412,8 @@ def get_market_cap(
     # Check if end_date is today
     if end_date == datetime.datetime.now().strftime("%Y-%m-%d"):
         # Get the market cap from company facts API
-        headers = {}
-        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
-            headers["X-API-KEY"] = api_key
-            
-        url = f"https://api.financialdatasets.ai/company/facts/?ticker={ticker}"
-        response = requests.get(url, headers=headers)
+        url = f"{get_client().base_url}/company/facts/?ticker={ticker}"
+        response = get_client().get(url)
         if response.status_code != 200:
             print(f"Error fetching company facts: {ticker} - {response.status_code}")
             return None
@@ -375,7 +446,102 @@ def prices_to_df(prices: list[Price]) -> pd.DataFrame:
     return df
 
 
+def _frame_to_prices(frame: pd.DataFrame) -> list[Price]:
+    """Build Price models from a cached price slice."""
+    return [Price(**row) for row in frame[PriceFrame.COLUMNS].to_dict("records")]
+
+
 # Update the get_price_data function to use the new functions
+@record_input(daily=True)
 def get_price_data(ticker: str, start_date: str, end_date: str) -> pd.DataFrame:
-    prices = get_prices(ticker, start_date, end_date)
-    return prices_to_df(prices)
+    return get_price_frame(ticker, start_date, end_date)
+
+
+##### Async API #####
+# The async fetchers run the sync fetchers on worker threads so they share the
+# pooled client, rate limiter and cache. Concurrency is bounded per event loop.
+_loop_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Get the concurrency limiter for the running event loop."""
+    loop = asyncio.get_running_loop()
+    if loop not in _loop_semaphores:
+        _loop_semaphores[loop] = asyncio.Semaphore(int(os.environ.get("FINANCIAL_DATASETS_MAX_CONCURRENCY", 10)))
+    return _loop_semaphores[loop]
+
+
+async def _run_bounded(func, *args, **kwargs):
+    async with _get_semaphore():
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+async def aget_prices(ticker: str, start_date: str, end_date: str) -> list[Price]:
+    """Async version of get_prices."""
+    return await _run_bounded(get_prices, ticker, start_date, end_date)
+
+
+async def aget_financial_metrics(ticker: str, end_date: str, period: str = "ttm", limit: int = 10) -> list[FinancialMetrics]:
+    """Async version of get_financial_metrics."""
+    return await _run_bounded(get_financial_metrics, ticker, end_date, period=period, limit=limit)
+
+
+async def asearch_line_items(ticker: str, line_items: list[str], end_date: str, period: str = "ttm", limit: int = 10) -> list[LineItem]:
+    """Async version of search_line_items."""
+    return await _run_bounded(search_line_items, ticker, line_items, end_date, period=period, limit=limit)
+
+
+async def aget_insider_trades(ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000) -> list[InsiderTrade]:
+    """Async version of get_insider_trades."""
+    return await _run_bounded(get_insider_trades, ticker, end_date, start_date=start_date, limit=limit)
+
+
+async def aget_company_news(ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000) -> list[CompanyNews]:
+    """Async version of get_company_news."""
+    return await _run_bounded(get_company_news, ticker, end_date, start_date=start_date, limit=limit)
+
+
+async def aget_market_cap(ticker: str, end_date: str) -> float | None:
+    """Async version of get_market_cap."""
+    return await _run_bounded(get_market_cap, ticker, end_date)
+
+
+async def aprefetch_universe(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    price_start_date: str | None = None,
+    line_items: list[str] | None = None,
+) -> dict[str, list[str]]:
+    """Concurrently fetch every dataset for every ticker to warm the cache.
+
+    Returns a mapping of ticker to the datasets that failed to load.
+    """
+    tasks = []
+    for ticker in tickers:
+        tasks.append((ticker, "prices", aget_prices(ticker, price_start_date or start_date, end_date)))
+        tasks.append((ticker, "financial_metrics", aget_financial_metrics(ticker, end_date, limit=10)))
+        tasks.append((ticker, "insider_trades", aget_insider_trades(ticker, end_date, start_date=start_date, limit=1000)))
+        tasks.append((ticker, "company_news", aget_company_news(ticker, end_date, start_date=start_date, limit=1000)))
+        if line_items:
+            tasks.append((ticker, "line_items", asearch_line_items(ticker, line_items, end_date)))
+
+    results = await asyncio.gather(*(request for _, _, request in tasks), return_exceptions=True)
+
+    failures: dict[str, list[str]] = {}
+    for (ticker, dataset, _), result in zip(tasks, results):
+        if isinstance(result, Exception):
+            logging.warning(f"Prefetch of {dataset} failed for {ticker}: {result}")
+            failures.setdefault(ticker, []).append(dataset)
+    return failures
+
+
+def prefetch_universe(
+    tickers: list[str],
+    start_date: str,
+    end_date: str,
+    price_start_date: str | None = None,
+    line_items: list[str] | None = None,
+) -> dict[str, list[str]]:
+    """Blocking entry point for aprefetch_universe."""
+    return asyncio.run(aprefetch_universe(tickers, start_date, end_date, price_start_date=price_start_date, line_items=line_items))
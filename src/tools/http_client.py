@@ -0,0 +1,260 @@
+import email.utils
+import gzip
+import json
+import logging
+import os
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_BASE_URL = "https://api.financialdatasets.ai"
+
+# Client modes that read or write a request archive
+ARCHIVE_MODES = ("record", "replay")
+
+# Status codes that are worth retrying: throttling and transient server errors
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket that limits the request rate."""
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        """
+        :param rate: Tokens added per second (requests per second). 0 disables limiting.
+        :param capacity: Maximum burst size. Defaults to one second worth of tokens.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available. Returns 0 on success, otherwise the seconds until they will be."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until the requested number of tokens is available."""
+        while (wait := self.try_acquire(tokens)) > 0:
+            time.sleep(wait)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RequestArchive:
+    """Gzipped JSON-lines archive of request/response pairs for offline record and replay.
+
+    Each line holds the method, url and body of a request together with the final response status
+    and text. Requests are keyed by method, url and body; when the same request was recorded more
+    than once, replay serves the responses in recorded order and then keeps repeating the last one.
+    """
+
+    def __init__(self, path: str):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._responses: dict[tuple[str, str, str], list[dict[str, any]]] | None = None
+        self._replayed: dict[tuple[str, str, str], int] = {}
+
+    @staticmethod
+    def request_key(method: str, url: str, body: any = None) -> tuple[str, str, str]:
+        return (method.upper(), url, json.dumps(body, sort_keys=True) if body is not None else "")
+
+    def record(self, method: str, url: str, body: any, response: requests.Response):
+        """Append one request/response pair. Each write is its own gzip member, so the file stays valid if interrupted."""
+        entry = {"method": method.upper(), "url": url, "body": body, "status_code": response.status_code, "text": response.text}
+        with self._lock:
+            if directory := os.path.dirname(self.path):
+                os.makedirs(directory, exist_ok=True)
+            with gzip.open(self.path, "at", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def replay(self, method: str, url: str, body: any = None) -> requests.Response:
+        """Build the recorded response for a request, raising if it was never recorded."""
+        key = self.request_key(method, url, body)
+        with self._lock:
+            if self._responses is None:
+                self._responses = self._read()
+            recorded = self._responses.get(key)
+            if not recorded:
+                raise Exception(f"No recorded response for {method.upper()} {url} in {self.path}")
+            index = self._replayed.get(key, 0)
+            self._replayed[key] = index + 1
+            entry = recorded[min(index, len(recorded) - 1)]
+
+        response = requests.Response()
+        response.status_code = entry["status_code"]
+        response._content = entry["text"].encode("utf-8")
+        response.encoding = "utf-8"
+        response.url = url
+        return response
+
+    def _read(self) -> dict[tuple[str, str, str], list[dict[str, any]]]:
+        responses = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                entry = json.loads(line)
+                responses.setdefault(self.request_key(entry["method"], entry["url"], entry["body"]), []).append(entry)
+        return responses
+
+
+class FinancialDatasetsClient:
+    """Shared HTTP client for financialdatasets.ai with connection pooling, rate limiting and retries."""
+
+    def __init__(
+        self,
+        pool_size: int = 20,
+        requests_per_second: float = 0.0,
+        burst: float | None = None,
+        max_retries: int = 4,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0,
+        mode: str = "live",
+        archive: RequestArchive | None = None,
+        base_url: str = DEFAULT_BASE_URL,
+    ):
+        """
+        :param pool_size: Number of keep-alive connections kept per host.
+        :param requests_per_second: Token bucket refill rate. 0 disables rate limiting.
+        :param burst: Token bucket capacity (defaults to one second worth of requests).
+        :param max_retries: Retries for 429/5xx responses and connection errors.
+        :param backoff_base: Base delay in seconds for exponential backoff.
+        :param backoff_max: Upper bound for a single backoff delay.
+        :param timeout: Per-request timeout in seconds.
+        :param mode: "live" to call the API, "record" to call it and append every response to the archive,
+            or "replay" to serve responses from the archive without touching the network.
+        :param archive: Archive used by the record and replay modes.
+        :param base_url: API root, e.g. a local mock server.
+        """
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"Unknown client mode: {mode}")
+        if mode != "live" and archive is None:
+            raise ValueError(f"The {mode} mode needs an archive")
+        self.mode = mode
+        self.archive = archive
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(requests_per_second, burst)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def _headers(self) -> dict[str, str]:
+        headers = {}
+        if api_key := os.environ.get("FINANCIAL_DATASETS_API_KEY"):
+            headers["X-API-KEY"] = api_key
+        return headers
+
+    def _backoff_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * (2**attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request (or replay it from the archive), recording the final response in record mode."""
+        if self.mode == "replay":
+            return self.archive.replay(method, url, kwargs.get("json"))
+
+        response = self._send(method, url, **kwargs)
+        if self.mode == "record":
+            self.archive.record(method, url, kwargs.get("json"), response)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request, retrying throttled, failed and transient responses with backoff."""
+        headers = {**self._headers(), **kwargs.pop("headers", {})}
+        kwargs.setdefault("timeout", self.timeout)
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, headers=headers, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff_delay(attempt)
+                logging.info(f"Request to {url} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code not in RETRY_STATUS_CODES or attempt == self.max_retries:
+                return response
+
+            delay = self._backoff_delay(attempt, parse_retry_after(response.headers.get("Retry-After")))
+            logging.info(f"Request to {url} returned {response.status_code}, retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+def get_mode_from_env() -> str:
+    """The client mode set by FINANCIAL_DATASETS_MODE ("live", "record" or "replay")."""
+    return os.environ.get("FINANCIAL_DATASETS_MODE", "live").lower()
+
+
+def create_client_from_env() -> FinancialDatasetsClient:
+    """Build a client configured by the FINANCIAL_DATASETS_* environment variables."""
+    mode = get_mode_from_env()
+    archive_path = os.environ.get("FINANCIAL_DATASETS_ARCHIVE_PATH")
+    return FinancialDatasetsClient(
+        pool_size=int(os.environ.get("FINANCIAL_DATASETS_POOL_SIZE", 20)),
+        requests_per_second=float(os.environ.get("FINANCIAL_DATASETS_REQUESTS_PER_SECOND", 0)),
+        max_retries=int(os.environ.get("FINANCIAL_DATASETS_MAX_RETRIES", 4)),
+        mode=mode,
+        archive=RequestArchive(archive_path) if archive_path else None,
+        base_url=os.environ.get("FINANCIAL_DATASETS_BASE_URL", DEFAULT_BASE_URL),
+    )
+
+
+_client: FinancialDatasetsClient | None = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> FinancialDatasetsClient:
+    """Get the global client instance, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_client_from_env()
+    return _client
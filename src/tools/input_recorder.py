@@ -0,0 +1,87 @@
+"""Records the data calls an analyst makes, so its inputs can be fingerprinted and replayed later."""
+
+import contextlib
+import contextvars
+import functools
+import hashlib
+import inspect
+import json
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RecordedCall:
+    func: callable
+    arguments: dict[str, any]
+    # Price- and news-based inputs move every day, so they are never worth fingerprinting
+    daily: bool
+
+
+class InputRecorder:
+    """Collects the recorded data calls made while it is active, grouped by ticker."""
+
+    def __init__(self):
+        self._calls: dict[str, list[tuple[RecordedCall, any]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: RecordedCall, result: any):
+        with self._lock:
+            self._calls.setdefault(call.arguments["ticker"], []).append((call, result))
+
+    def calls(self, ticker: str) -> list[tuple[RecordedCall, any]]:
+        with self._lock:
+            return list(self._calls.get(ticker, []))
+
+
+_active_recorder: contextvars.ContextVar[InputRecorder | None] = contextvars.ContextVar("input_recorder", default=None)
+
+
+@contextlib.contextmanager
+def recording(recorder: InputRecorder):
+    """Record data calls made in this context (and in threads started with a copy of it) to recorder."""
+    token = _active_recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        _active_recorder.reset(token)
+
+
+def record_input(daily: bool = False):
+    """Decorator for data functions taking a ticker and an end_date; calls are recorded while a recorder is active."""
+
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            recorder = _active_recorder.get()
+            if recorder is not None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                recorder.record(RecordedCall(wrapper, dict(bound.arguments), daily), result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def fingerprint(calls: list[tuple[RecordedCall, any]]) -> str:
+    """Hash of the calls' results and arguments other than end_date, so the same inputs on another day match."""
+    material = [
+        (call.func.__name__, {name: value for name, value in call.arguments.items() if name != "end_date"}, result)
+        for call, result in calls
+    ]
+    encoded = json.dumps(material, sort_keys=True, default=lambda value: value.model_dump() if hasattr(value, "model_dump") else str(value))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def replay(calls: list[tuple[RecordedCall, any]], end_date: str) -> list[tuple[RecordedCall, any]]:
+    """Repeat the recorded calls for another end_date, with their new results."""
+    replayed = []
+    for call, _ in calls:
+        arguments = {**call.arguments, "end_date": end_date}
+        replayed.append((RecordedCall(call.func, arguments, call.daily), call.func(**arguments)))
+    return replayed
@@ -0,0 +1,249 @@
+"""Local stand-in for the financialdatasets.ai endpoints used by src/tools/api.py.
+
+Serves deterministic synthetic data for any ticker, with the same query parameters and
+pagination semantics as the real API, and can inject latency, errors and rate limits:
+
+    python -m src.tools.mock_server --port 8001 --latency-ms 50 --error-rate 0.01 --rate-limit 20
+    FINANCIAL_DATASETS_BASE_URL=http://localhost:8001 poetry run python src/main.py --ticker AAPL
+"""
+
+import argparse
+import asyncio
+import datetime
+import functools
+import os
+import random
+
+import numpy as np
+from fastapi import Body, FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+from src.data.models import FinancialMetrics
+from src.tools.http_client import TokenBucket
+
+# Synthetic history starts here; queries without a lower bound page back to it
+HISTORY_START = datetime.date(2000, 1, 1)
+HISTORY_END = datetime.date(2035, 12, 31)
+
+FINANCIAL_METRIC_FIELDS = [name for name in FinancialMetrics.model_fields if name not in ("ticker", "report_period", "period", "currency")]
+
+
+def _rng(*parts) -> random.Random:
+    """Random generator seeded by its arguments, so every value is reproducible across runs."""
+    return random.Random(":".join(str(part) for part in parts))
+
+
+def _parse_date(value: str | None, default: datetime.date) -> datetime.date:
+    return datetime.date.fromisoformat(value[:10]) if value else default
+
+
+def _days_descending(start: datetime.date, end: datetime.date):
+    day = end
+    while day >= start:
+        yield day
+        day -= datetime.timedelta(days=1)
+
+
+@functools.lru_cache(maxsize=1024)
+def _price_history(ticker: str) -> tuple[np.ndarray, ...]:
+    """Business days with OHLCV of a geometric random walk for the ticker over the whole synthetic history."""
+    days = np.arange(np.datetime64(HISTORY_START), np.datetime64(HISTORY_END) + 1)
+    days = days[np.is_busday(days)]
+    rng = np.random.default_rng(_rng(ticker, "prices").getrandbits(64))
+    start_price = rng.uniform(10, 500)
+    closes = start_price * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(days))))
+    spreads = np.abs(rng.normal(0, 0.01, len(days))) * closes
+    volumes = rng.integers(100_000, 50_000_000, len(days))
+    return days, closes - spreads / 2, closes, closes + spreads, closes - spreads, volumes
+
+
+def _report_periods(end_date: datetime.date, period: str, limit: int) -> list[str]:
+    """Most recent report period ends on or before end_date: quarter ends, or fiscal year ends for annual."""
+    months = (12,) if period == "annual" else (3, 6, 9, 12)
+    periods = []
+    for year in range(end_date.year, HISTORY_START.year - 1, -1):
+        for month in reversed(months):
+            report_period = datetime.date(year, month, 1) + datetime.timedelta(days=31)
+            report_period = report_period.replace(day=1) - datetime.timedelta(days=1)
+            if report_period <= end_date:
+                periods.append(report_period.isoformat())
+                if len(periods) >= limit:
+                    return periods
+    return periods
+
+
+def _line_item_value(ticker: str, report_period: str, line_item: str) -> float:
+    rng = _rng(ticker, report_period, line_item)
+    if line_item.endswith(("_margin", "_ratio", "_rate")):
+        return round(rng.uniform(-0.1, 0.6), 4)
+    if line_item in ("outstanding_shares", "weighted_average_shares"):
+        return float(rng.randint(10_000_000, 5_000_000_000))
+    if line_item in ("earnings_per_share", "book_value_per_share", "dividends_per_share"):
+        return round(rng.uniform(-2, 20), 2)
+    return round(rng.uniform(-1e9, 5e10), 2)
+
+
+def _insider_trades_on(ticker: str, day: datetime.date) -> list[dict[str, any]]:
+    rng = _rng(ticker, day, "insider_trades")
+    trades = []
+    for i in range(rng.choice((0, 0, 0, 1, 1, 2))):
+        shares = float(rng.randint(-50_000, 50_000))
+        price = round(rng.uniform(10, 500), 2)
+        transaction_date = (day - datetime.timedelta(days=rng.randint(0, 3))).isoformat()
+        trades.append(
+            {
+                "ticker": ticker,
+                "issuer": f"{ticker} Inc.",
+                "name": f"Insider {rng.randint(1, 20)}",
+                "title": rng.choice(("CEO", "CFO", "Director", "VP")),
+                "is_board_director": rng.random() < 0.3,
+                "transaction_date": transaction_date,
+                "transaction_shares": shares,
+                "transaction_price_per_share": price,
+                "transaction_value": round(shares * price, 2),
+                "shares_owned_before_transaction": 1_000_000.0,
+                "shares_owned_after_transaction": 1_000_000.0 + shares,
+                "security_title": "Common Stock",
+                "filing_date": day.isoformat(),
+            }
+        )
+    return trades
+
+
+def _news_on(ticker: str, day: datetime.date) -> list[dict[str, any]]:
+    rng = _rng(ticker, day, "news")
+    news = []
+    for i in range(rng.choice((0, 1, 1, 2, 3))):
+        news.append(
+            {
+                "ticker": ticker,
+                "title": f"{ticker} headline {day.isoformat()} #{i}",
+                "author": f"Author {rng.randint(1, 50)}",
+                "source": rng.choice(("Reuters", "Bloomberg", "CNBC", "MarketWatch")),
+                "date": f"{day.isoformat()}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z",
+                "url": f"https://news.example.com/{ticker}/{day.isoformat()}/{i}",
+                "sentiment": rng.choice(("positive", "negative", "neutral")),
+            }
+        )
+    return news
+
+
+def _latest_by_day(generate, ticker: str, start: datetime.date, end: datetime.date, date_field: str, limit: int) -> list[dict[str, any]]:
+    """Items in [start, end], newest first and truncated to limit, like the paginated API endpoints."""
+    items = []
+    for day in _days_descending(start, end):
+        items.extend(generate(ticker, day))
+        if len(items) >= limit:
+            break
+    items.sort(key=lambda item: item[date_field], reverse=True)
+    return items[:limit]
+
+
+def create_app(latency_ms: float = 0.0, error_rate: float = 0.0, rate_limit: float = 0.0, seed: int = 0) -> FastAPI:
+    """
+    :param latency_ms: Delay added to every response.
+    :param error_rate: Fraction of requests answered with a 503.
+    :param rate_limit: Requests per second before answering 429 with Retry-After (0 = unlimited).
+    :param seed: Seed for the error injection sequence.
+    """
+    app = FastAPI()
+    bucket = TokenBucket(rate_limit)
+    errors = random.Random(seed)
+
+    @app.middleware("http")
+    async def inject_faults(request: Request, call_next):
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+        if (wait := bucket.try_acquire()) > 0:
+            return JSONResponse({"error": "Rate limit exceeded"}, status_code=429, headers={"Retry-After": f"{wait:.3f}"})
+        if error_rate > 0 and errors.random() < error_rate:
+            return JSONResponse({"error": "Injected failure"}, status_code=503)
+        return await call_next(request)
+
+    @app.get("/prices/")
+    def prices(ticker: str, start_date: str, end_date: str, interval: str = "day", interval_multiplier: int = 1):
+        days, opens, closes, highs, lows, volumes = _price_history(ticker)
+        lo = int(np.searchsorted(days, np.datetime64(start_date[:10])))
+        hi = int(np.searchsorted(days, np.datetime64(end_date[:10]), side="right"))
+        return {
+            "ticker": ticker,
+            "prices": [
+                {"open": round(open_, 4), "close": round(close, 4), "high": round(high, 4), "low": round(low, 4), "volume": volume, "time": str(day)}
+                for day, open_, close, high, low, volume in zip(
+                    days[lo:hi], opens[lo:hi].tolist(), closes[lo:hi].tolist(), highs[lo:hi].tolist(), lows[lo:hi].tolist(), volumes[lo:hi].tolist()
+                )
+            ],
+        }
+
+    @app.get("/financial-metrics/")
+    def financial_metrics(ticker: str, report_period_lte: str, limit: int = 10, period: str = "ttm"):
+        rows = []
+        for report_period in _report_periods(_parse_date(report_period_lte, HISTORY_END), period, limit):
+            row = {"ticker": ticker, "report_period": report_period, "period": period, "currency": "USD"}
+            row.update({field: _line_item_value(ticker, report_period, field) for field in FINANCIAL_METRIC_FIELDS})
+            rows.append(row)
+        return {"financial_metrics": rows}
+
+    @app.post("/financials/search/line-items")
+    def search_line_items(body: dict = Body(...)):
+        end_date = _parse_date(body.get("end_date"), HISTORY_END)
+        period, limit = body.get("period", "ttm"), int(body.get("limit", 10))
+        results = []
+        for ticker in body.get("tickers", []):
+            for report_period in _report_periods(end_date, period, limit):
+                row = {"ticker": ticker, "report_period": report_period, "period": period, "currency": "USD"}
+                row.update({item: _line_item_value(ticker, report_period, item) for item in body.get("line_items", [])})
+                results.append(row)
+        # The limit applies to the whole response, not per ticker
+        return {"search_results": results[:limit]}
+
+    @app.get("/insider-trades/")
+    def insider_trades(ticker: str, filing_date_lte: str, filing_date_gte: str | None = None, limit: int = 1000):
+        start, end = _parse_date(filing_date_gte, HISTORY_START), _parse_date(filing_date_lte, HISTORY_END)
+        return {"insider_trades": _latest_by_day(_insider_trades_on, ticker, start, end, "filing_date", limit)}
+
+    @app.get("/news/")
+    def news(ticker: str, end_date: str, start_date: str | None = None, limit: int = 1000):
+        start, end = _parse_date(start_date, HISTORY_START), _parse_date(end_date, HISTORY_END)
+        return {"news": _latest_by_day(_news_on, ticker, start, end, "date", limit)}
+
+    @app.get("/company/facts/")
+    def company_facts(ticker: str = Query(...)):
+        rng = _rng(ticker, "facts")
+        return {
+            "company_facts": {
+                "ticker": ticker,
+                "name": f"{ticker} Inc.",
+                "industry": rng.choice(("Software", "Semiconductors", "Banks", "Retail")),
+                "sector": rng.choice(("Technology", "Financials", "Consumer")),
+                "exchange": "MOCK",
+                "is_active": True,
+                "market_cap": round(rng.uniform(1e9, 3e12), 2),
+                "number_of_employees": rng.randint(100, 200_000),
+                "weighted_average_shares": rng.randint(10_000_000, 5_000_000_000),
+            }
+        }
+
+    return app
+
+
+app = create_app(
+    latency_ms=float(os.environ.get("MOCK_FINANCIAL_DATASETS_LATENCY_MS", 0)),
+    error_rate=float(os.environ.get("MOCK_FINANCIAL_DATASETS_ERROR_RATE", 0)),
+    rate_limit=float(os.environ.get("MOCK_FINANCIAL_DATASETS_RATE_LIMIT", 0)),
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run a local stand-in for the financialdatasets.ai API")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay added to every response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with a 503")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests per second before answering 429 (0 = unlimited)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the error injection sequence")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(args.latency_ms, args.error_rate, args.rate_limit, args.seed), host=args.host, port=args.port)
@@ -0,0 +1,95 @@
+import functools
+import inspect
+import threading
+
+import pandas as pd
+
+
+class _Call:
+    """A fetch in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution whose result is shared."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[tuple, _Call] = {}
+        self.executed = 0
+        self.absorbed = 0
+
+    def do(self, key: tuple, func, *args, **kwargs):
+        """Run func once per key at a time; concurrent callers with the same key wait for its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.absorbed += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict[str, int]:
+        """Number of fetches executed and duplicate concurrent calls absorbed."""
+        with self._lock:
+            return {"executed": self.executed, "absorbed": self.absorbed, "in_flight": len(self._calls)}
+
+
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the global single-flight instance."""
+    return _single_flight
+
+
+def coalesce(func):
+    """Decorator that shares one in-flight execution between concurrent calls with identical arguments."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = (func.__name__, *((name, _freeze(value)) for name, value in bound.arguments.items()))
+        result = _single_flight.do(key, func, *args, **kwargs)
+        # Give every caller its own list or frame so one caller's mutations (e.g. indicator columns) cannot leak into another's
+        if isinstance(result, list):
+            return list(result)
+        if isinstance(result, pd.DataFrame):
+            return result.copy()
+        return result
+
+    return wrapper
+
+
+def _freeze(value):
+    """Make argument values hashable so they can be part of a request key."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
@@ -1,85 +1,99 @@
 """Constants and utilities related to analysts configuration."""
 
-from src.agents.ben_graham import ben_graham_agent
-from src.agents.bill_ackman import bill_ackman_agent
-from src.agents.cathie_wood import cathie_wood_agent
-from src.agents.charlie_munger import charlie_munger_agent
+from src.agents.ben_graham import ben_graham_agent, BEN_GRAHAM_LINE_ITEMS
+from src.agents.bill_ackman import bill_ackman_agent, BILL_ACKMAN_LINE_ITEMS
+from src.agents.cathie_wood import cathie_wood_agent, CATHIE_WOOD_LINE_ITEMS
+from src.agents.charlie_munger import charlie_munger_agent, CHARLIE_MUNGER_LINE_ITEMS
 from src.agents.fundamentals import fundamentals_agent
-from src.agents.michael_burry import michael_burry_agent
-from src.agents.phil_fisher import phil_fisher_agent
-from src.agents.peter_lynch import peter_lynch_agent
+from src.agents.michael_burry import michael_burry_agent, MICHAEL_BURRY_LINE_ITEMS
+from src.agents.phil_fisher import phil_fisher_agent, PHIL_FISHER_LINE_ITEMS
+from src.agents.peter_lynch import peter_lynch_agent, PETER_LYNCH_LINE_ITEMS
 from src.agents.sentiment import sentiment_agent
-from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent
+from src.agents.stanley_druckenmiller import stanley_druckenmiller_agent, STANLEY_DRUCKENMILLER_LINE_ITEMS
 from src.agents.technicals import technical_analyst_agent
-from src.agents.valuation import valuation_agent
-from src.agents.warren_buffett import warren_buffett_agent
+from src.agents.valuation import valuation_agent, VALUATION_LINE_ITEMS
+from src.agents.warren_buffett import warren_buffett_agent, WARREN_BUFFETT_LINE_ITEMS
 
 # Define analyst configuration - single source of truth
+# "line_items" lists the search_line_items requests each analyst makes per ticker
 ANALYST_CONFIG = {
     "ben_graham": {
         "display_name": "Ben Graham",
         "agent_func": ben_graham_agent,
         "order": 0,
+        "line_items": [BEN_GRAHAM_LINE_ITEMS],
     },
     "bill_ackman": {
         "display_name": "Bill Ackman",
         "agent_func": bill_ackman_agent,
         "order": 1,
+        "line_items": [BILL_ACKMAN_LINE_ITEMS],
     },
     "cathie_wood": {
         "display_name": "Cathie Wood",
         "agent_func": cathie_wood_agent,
         "order": 2,
+        "line_items": [CATHIE_WOOD_LINE_ITEMS],
     },
     "charlie_munger": {
         "display_name": "Charlie Munger",
         "agent_func": charlie_munger_agent,
         "order": 3,
+        "line_items": [CHARLIE_MUNGER_LINE_ITEMS],
     },
     "michael_burry": {
         "display_name": "Michael Burry",
         "agent_func": michael_burry_agent,
         "order": 4,
+        "line_items": [MICHAEL_BURRY_LINE_ITEMS],
     },
     "peter_lynch": {
         "display_name": "Peter Lynch",
         "agent_func": peter_lynch_agent,
         "order": 5,
+        "line_items": [PETER_LYNCH_LINE_ITEMS],
     },
     "phil_fisher": {
         "display_name": "Phil Fisher",
         "agent_func": phil_fisher_agent,
         "order": 6,
+        "line_items": [PHIL_FISHER_LINE_ITEMS],
     },
     "stanley_druckenmiller": {
         "display_name": "Stanley Druckenmiller",
         "agent_func": stanley_druckenmiller_agent,
         "order": 7,
+        "line_items": [STANLEY_DRUCKENMILLER_LINE_ITEMS],
     },
     "warren_buffett": {
         "display_name": "Warren Buffett",
         "agent_func": warren_buffett_agent,
         "order": 8,
+        "line_items": [WARREN_BUFFETT_LINE_ITEMS],
     },
     "technical_analyst": {
         "display_name": "Technical Analyst",
         "agent_func": technical_analyst_agent,
         "order": 9,
+        "line_items": [],
     },
     "fundamentals_analyst": {
         "display_name": "Fundamentals Analyst",
         "agent_func": fundamentals_agent,
         "order": 10,
+        "line_items": [],
     },
     "sentiment_analyst": {
         "display_name": "Sentiment Analyst",
         "agent_func": sentiment_agent,
         "order": 11,
+        "line_items": [],
     },
     "valuation_analyst": {
         "display_name": "Valuation Analyst",
         "agent_func": valuation_agent,
         "order": 12,
+        "line_items": [VALUATION_LINE_ITEMS],
     },
 }
 
@@ -90,3 +104,18 @@ ANALYST_ORDER = [(config["display_name"], key) for key, config in sorted(ANALYST
 def get_analyst_nodes():
     """Get the mapping of analyst keys to their (node_name, agent_func) tuples."""
     return {key: (f"{key}_agent", config["agent_func"]) for key, config in ANALYST_CONFIG.items()}
+
+
+def plan_line_item_requests(selected_analysts: list[str]) -> list[dict[str, any]]:
+    """Merge the line item requests of the selected analysts into one request per period.
+
+    Each merged request asks for the union of fields and the largest limit, so it also
+    answers every smaller request for the same period from the cache.
+    """
+    planned: dict[str, dict[str, any]] = {}
+    for analyst_key in selected_analysts:
+        for request in ANALYST_CONFIG.get(analyst_key, {}).get("line_items", []):
+            plan = planned.setdefault(request["period"], {"line_items": [], "period": request["period"], "limit": 0})
+            plan["line_items"].extend(item for item in request["line_items"] if item not in plan["line_items"])
+            plan["limit"] = max(plan["limit"], request["limit"])
+    return list(planned.values())
@@ -1,8 +1,12 @@
 from colorama import Fore, Style
 from tabulate import tabulate
 from .analysts import ANALYST_ORDER
+import abc
 import os
+import re
+import sys
 import json
+from collections import deque
 
 
 def sort_agent_signals(signals):
@@ -226,84 +230,238 @@ def print_trading_output(result: dict) -> None:
         print(f"{Fore.CYAN}{wrapped_reasoning}{Style.RESET_ALL}")
 
 
-def print_backtest_results(table_rows: list) -> None:
+BACKTEST_HEADERS = [
+    "Date",
+    "Ticker",
+    "Action",
+    "Quantity",
+    "Price",
+    "Shares",
+    "Position Value",
+    "Bullish",
+    "Bearish",
+    "Neutral",
+]
+BACKTEST_COLALIGN = (
+    "left",  # Date
+    "left",  # Ticker
+    "center",  # Action
+    "right",  # Quantity
+    "right",  # Price
+    "right",  # Shares
+    "right",  # Position Value
+    "right",  # Bullish
+    "right",  # Bearish
+    "right",  # Neutral
+)
+
+
+def is_summary_row(row: list) -> bool:
+    return isinstance(row[1], str) and "PORTFOLIO SUMMARY" in row[1]
+
+
+def print_backtest_summary(summary_row: list) -> None:
+    """Print the portfolio summary from a summary row of the backtest table"""
+    print(f"\n{Fore.WHITE}{Style.BRIGHT}PORTFOLIO SUMMARY:{Style.RESET_ALL}")
+
+    # Extract values and remove commas before converting to float
+    cash_str = summary_row[7].split("$")[1].split(Style.RESET_ALL)[0].replace(",", "")
+    position_str = summary_row[6].split("$")[1].split(Style.RESET_ALL)[0].replace(",", "")
+    total_str = summary_row[8].split("$")[1].split(Style.RESET_ALL)[0].replace(",", "")
+
+    print(f"Cash Balance: {Fore.CYAN}${float(cash_str):,.2f}{Style.RESET_ALL}")
+    print(f"Total Position Value: {Fore.YELLOW}${float(position_str):,.2f}{Style.RESET_ALL}")
+    print(f"Total Value: {Fore.WHITE}${float(total_str):,.2f}{Style.RESET_ALL}")
+    print(f"Return: {summary_row[9]}")
+
+    # Display performance metrics if available
+    if summary_row[10]:  # Sharpe ratio
+        print(f"Sharpe Ratio: {summary_row[10]}")
+    if summary_row[11]:  # Sortino ratio
+        print(f"Sortino Ratio: {summary_row[11]}")
+    if summary_row[12]:  # Max drawdown
+        print(f"Max Drawdown: {summary_row[12]}")
+
+
+def print_backtest_table(ticker_rows: list) -> None:
+    """Print ticker rows of the backtest table as a grid"""
+    print(tabulate(ticker_rows, headers=BACKTEST_HEADERS, tablefmt="grid", colalign=BACKTEST_COLALIGN))
+
+
+def print_backtest_results(table_rows: list, clear_screen: bool = True) -> None:
     """Print the backtest results in a nicely formatted table"""
     # Clear the screen
-    os.system("cls" if os.name == "nt" else "clear")
+    if clear_screen:
+        os.system("cls" if os.name == "nt" else "clear")
 
     # Split rows into ticker rows and summary rows
     ticker_rows = []
     summary_rows = []
 
     for row in table_rows:
-        if isinstance(row[1], str) and "PORTFOLIO SUMMARY" in row[1]:
+        if is_summary_row(row):
             summary_rows.append(row)
         else:
             ticker_rows.append(row)
 
-    
     # Display latest portfolio summary
     if summary_rows:
-        latest_summary = summary_rows[-1]
-        print(f"\n{Fore.WHITE}{Style.BRIGHT}PORTFOLIO SUMMARY:{Style.RESET_ALL}")
-
-        # Extract values and remove commas before converting to float
-        cash_str = latest_summary[7].split("$")[1].split(Style.RESET_ALL)[0].replace(",", "")
-        position_str = latest_summary[6].split("$")[1].split(Style.RESET_ALL)[0].replace(",", "")
-        total_str = latest_summary[8].split("$")[1].split(Style.RESET_ALL)[0].replace(",", "")
-
-        print(f"Cash Balance: {Fore.CYAN}${float(cash_str):,.2f}{Style.RESET_ALL}")
-        print(f"Total Position Value: {Fore.YELLOW}${float(position_str):,.2f}{Style.RESET_ALL}")
-        print(f"Total Value: {Fore.WHITE}${float(total_str):,.2f}{Style.RESET_ALL}")
-        print(f"Return: {latest_summary[9]}")
-        
-        # Display performance metrics if available
-        if latest_summary[10]:  # Sharpe ratio
-            print(f"Sharpe Ratio: {latest_summary[10]}")
-        if latest_summary[11]:  # Sortino ratio
-            print(f"Sortino Ratio: {latest_summary[11]}")
-        if latest_summary[12]:  # Max drawdown
-            print(f"Max Drawdown: {latest_summary[12]}")
+        print_backtest_summary(summary_rows[-1])
 
     # Add vertical spacing
     print("\n" * 2)
 
     # Print the table with just ticker rows
-    print(
-        tabulate(
-            ticker_rows,
-            headers=[
-                "Date",
-                "Ticker",
-                "Action",
-                "Quantity",
-                "Price",
-                "Shares",
-                "Position Value",
-                "Bullish",
-                "Bearish",
-                "Neutral",
-            ],
-            tablefmt="grid",
-            colalign=(
-                "left",  # Date
-                "left",  # Ticker
-                "center",  # Action
-                "right",  # Quantity
-                "right",  # Price
-                "right",  # Shares
-                "right",  # Position Value
-                "right",  # Bullish
-                "right",  # Bearish
-                "right",  # Neutral
-            ),
-        )
-    )
+    print_backtest_table(ticker_rows)
 
     # Add vertical spacing
     print("\n" * 4)
 
 
+BACKTEST_RENDER_MODES = ("full", "append", "live", "events")
+
+# Ticker rows kept on screen by the live renderer
+DEFAULT_LIVE_ROWS = 20
+
+_ANSI_ESCAPE = re.compile(r"\x1b\[[0-9;]*m")
+
+
+class BacktestRenderer(abc.ABC):
+    """Shows backtest progress. render_day gets all rows so far and the rows added by the latest day."""
+
+    @abc.abstractmethod
+    def render_day(self, table_rows: list, date_rows: list) -> None:
+        pass
+
+    def finish(self, table_rows: list) -> None:
+        pass
+
+
+class FullRenderer(BacktestRenderer):
+    """Clear the screen and reprint every row each day (cost grows with the length of the backtest)."""
+
+    def render_day(self, table_rows: list, date_rows: list) -> None:
+        print_backtest_results(table_rows)
+
+
+class AppendRenderer(BacktestRenderer):
+    """Print only each new day's rows and summary, then the complete results once at the end."""
+
+    def render_day(self, table_rows: list, date_rows: list) -> None:
+        print_backtest_table([row for row in date_rows if not is_summary_row(row)])
+        for row in date_rows:
+            if is_summary_row(row):
+                print_backtest_summary(row)
+        print()
+
+    def finish(self, table_rows: list) -> None:
+        print_backtest_results(table_rows, clear_screen=False)
+
+
+class LiveRenderer(BacktestRenderer):
+    """Redraw a fixed-height view of the latest summary and the last max_rows ticker rows each day."""
+
+    def __init__(self, max_rows: int = DEFAULT_LIVE_ROWS):
+        self.ticker_rows = deque(maxlen=max_rows)
+        self.summary_row = None
+
+    def render_day(self, table_rows: list, date_rows: list) -> None:
+        for row in date_rows:
+            if is_summary_row(row):
+                self.summary_row = row
+            else:
+                self.ticker_rows.append(row)
+
+        # Move the cursor home and clear with ANSI codes rather than spawning a shell every day
+        print("\033[H\033[J", end="")
+        if self.summary_row is not None:
+            print_backtest_summary(self.summary_row)
+        print("\n" * 2)
+        print_backtest_table(list(self.ticker_rows))
+
+    def finish(self, table_rows: list) -> None:
+        print_backtest_results(table_rows)
+
+
+def _plain_value(cell):
+    """A table cell without colors, as a number where it is one ("$1,234.50" -> 1234.5, "" -> None)."""
+    if not isinstance(cell, str):
+        return cell
+    text = _ANSI_ESCAPE.sub("", cell).strip()
+    if not text:
+        return None
+    try:
+        return float(text.replace("$", "").replace(",", "").replace("%", ""))
+    except ValueError:
+        return text
+
+
+def write_json_lines(stream=None):
+    """Event sink writing one JSON object per line to stream (default: stderr, away from the agents' console output on stdout)."""
+
+    def sink(event: dict) -> None:
+        out = stream or sys.stderr
+        out.write(json.dumps(event) + "\n")
+        out.flush()
+
+    return sink
+
+
+class EventRenderer(BacktestRenderer):
+    """Send each day's trades and summary to sink as plain dicts instead of printing tables.
+
+    Day events look like {"event": "day", "date": ..., "trades": [{"ticker": ..., "action": ...}], "summary": {...}};
+    the run ends with {"event": "finish", "days": ...}. Max drawdown is reported as a positive percentage.
+    """
+
+    TRADE_FIELDS = ("date", "ticker", "action", "quantity", "price", "shares", "position_value", "bullish", "bearish", "neutral")
+    SUMMARY_FIELDS = (
+        "date",
+        None,
+        None,
+        None,
+        None,
+        None,
+        "total_position_value",
+        "cash_balance",
+        "total_value",
+        "return_pct",
+        "sharpe_ratio",
+        "sortino_ratio",
+        "max_drawdown",
+    )
+
+    def __init__(self, sink=None):
+        self.sink = sink or write_json_lines()
+        self.days = 0
+
+    def render_day(self, table_rows: list, date_rows: list) -> None:
+        trades, summary = [], None
+        for row in date_rows:
+            if is_summary_row(row):
+                summary = {field: _plain_value(cell) for field, cell in zip(self.SUMMARY_FIELDS, row) if field}
+            else:
+                trades.append({field: _plain_value(cell) for field, cell in zip(self.TRADE_FIELDS, row)})
+        self.days += 1
+        self.sink({"event": "day", "date": date_rows[0][0] if date_rows else None, "trades": trades, "summary": summary})
+
+    def finish(self, table_rows: list) -> None:
+        self.sink({"event": "finish", "days": self.days})
+
+
+def create_backtest_renderer(mode: str = "full", event_sink=None, live_rows: int = DEFAULT_LIVE_ROWS) -> BacktestRenderer:
+    """Renderer for one of BACKTEST_RENDER_MODES."""
+    if mode == "full":
+        return FullRenderer()
+    if mode == "append":
+        return AppendRenderer()
+    if mode == "live":
+        return LiveRenderer(live_rows)
+    if mode == "events":
+        return EventRenderer(event_sink)
+    raise ValueError(f"Unknown render mode: {mode}. Expected one of {', '.join(BACKTEST_RENDER_MODES)}")
+
+
 def format_backtest_row(
     date: str,
     ticker: str,
@@ -0,0 +1,96 @@
+"""Reuse analyst signals across backtest days when an analyst's inputs for a ticker have not changed."""
+
+import functools
+import json
+import threading
+from dataclasses import dataclass
+
+from langchain_core.messages import HumanMessage
+
+from src.graph.state import AgentState
+from src.tools.input_recorder import InputRecorder, fingerprint, recording, replay
+from src.utils.progress import progress
+
+
+@dataclass
+class SignalEntry:
+    calls: list
+    fingerprint: str
+    signal: dict[str, any]
+
+
+class IncrementalSignalCache:
+    """Remembers each analyst's signal per ticker with a fingerprint of the data it was computed from.
+
+    Analyst nodes wrapped with wrap() record the data calls they make for each ticker. On a later
+    date, those calls are replayed (usually from the data cache) and, if their results are unchanged,
+    the previous signal is reused instead of running the analyst for that ticker. Tickers whose
+    analysis used prices, news or insider trades are always recomputed.
+    """
+
+    def __init__(self):
+        self._entries: dict[tuple[str, str], SignalEntry] = {}
+        # Node name -> key the node writes its signals under in analyst_signals
+        self._signal_keys: dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.reused = 0
+        self.computed = 0
+
+    def _is_unchanged(self, entry: SignalEntry, end_date: str) -> bool:
+        try:
+            return fingerprint(replay(entry.calls, end_date)) == entry.fingerprint
+        except Exception:
+            return False
+
+    def wrap(self, node_name: str, node_func):
+        """Wrap an analyst node so it only runs for tickers whose inputs changed since their cached signal."""
+
+        @functools.wraps(node_func)
+        def wrapper(state: AgentState):
+            data = state["data"]
+            tickers = data["tickers"]
+            with self._lock:
+                entries = {ticker: self._entries.get((node_name, ticker)) for ticker in tickers}
+                signal_key = self._signal_keys.get(node_name)
+
+            signals, stale = {}, []
+            for ticker in tickers:
+                entry = entries[ticker]
+                if entry is not None and signal_key is not None and self._is_unchanged(entry, data["end_date"]):
+                    signals[ticker] = entry.signal
+                    # Report under the name the agent itself uses, so the display keeps one row per agent
+                    progress.update_status(signal_key, ticker, "Done (inputs unchanged)")
+                else:
+                    stale.append(ticker)
+
+            if stale:
+                recorder = InputRecorder()
+                before = set(data["analyst_signals"])
+                with recording(recorder):
+                    result = node_func({**state, "data": {**data, "tickers": stale}})
+                added = result["data"]["analyst_signals"]
+                signal_key = signal_key or next((key for key in added if key not in before), node_name)
+                computed = added.get(signal_key, {})
+                signals.update(computed)
+
+                with self._lock:
+                    self._signal_keys[node_name] = signal_key
+                    for ticker, signal in computed.items():
+                        calls = recorder.calls(ticker)
+                        if not any(call.daily for call, _ in calls):
+                            self._entries[(node_name, ticker)] = SignalEntry(calls, fingerprint(calls), signal)
+
+            with self._lock:
+                self.reused += len(tickers) - len(stale)
+                self.computed += len(stale)
+
+            ordered = {ticker: signals[ticker] for ticker in tickers if ticker in signals}
+            data["analyst_signals"][signal_key] = ordered
+            message = HumanMessage(content=json.dumps(ordered), name=signal_key)
+            return {"messages": [message], "data": data}
+
+        return wrapper
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"reused": self.reused, "computed": self.computed}
@@ -1,9 +1,13 @@
 """Helper functions for LLM"""
 
+import asyncio
 import json
-from typing import TypeVar, Type, Optional, Any
+import os
+import threading
+import time
+from typing import Awaitable, TypeVar, Type, Optional, Any
 from pydantic import BaseModel
-from utils.progress import progress
+from src.utils.progress import progress
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -14,7 +18,8 @@ def call_llm(
     pydantic_model: Type[T],
     agent_name: Optional[str] = None,
     max_retries: int = 3,
-    default_factory = None
+    default_factory = None,
+    priority: int = 0,
 ) -> T:
     """
     Makes an LLM call with retry logic, handling both JSON supported and non-JSON supported models.
@@ -27,35 +32,34 @@ def call_llm(
         agent_name: Optional name of the agent for progress updates
         max_retries: Maximum number of retries (default: 3)
         default_factory: Optional factory function to create default response on failure
+        priority: Queue priority when the provider is at its limits (higher goes first, see llm/scheduler.py)
         
     Returns:
         An instance of the specified Pydantic model
+
+    Responses are cached by provider, model, schema, prompt and temperature (see llm/cache.py).
+    In cache-only mode (LLM_CACHE_MODE=only) a miss raises LLMCacheMissError instead of calling the provider.
     """
-    from llm.models import get_model, get_model_info
-    
-    model_info = get_model_info(model_name)
-    llm = get_model(model_name, model_provider)
-    
-    # For non-JSON support models, we can use structured output
-    if not (model_info and not model_info.has_json_mode()):
-        llm = llm.with_structured_output(
-            pydantic_model,
-            method="json_mode",
-        )
+    from src.llm.scheduler import get_llm_scheduler, retry_delay
+
+    llm, model_info, llm_cache, cache_key, cached, tokens = _prepare_llm_call(prompt, model_name, model_provider, pydantic_model)
+    if cached is not None:
+        return cached
+
+    # Calls wait for a slot within the provider's concurrency and rate limits
+    scheduler = get_llm_scheduler()
     
     # Call the LLM with retries
     for attempt in range(max_retries):
         try:
             # Call the LLM
-            result = llm.invoke(prompt)
-            
-            # For non-JSON support models, we need to extract and parse the JSON manually
-            if model_info and not model_info.has_json_mode():
-                parsed_result = extract_json_from_response(result.content)
-                if parsed_result:
-                    return pydantic_model(**parsed_result)
-            else:
-                return result
+            with scheduler.slot(model_provider, model_name, tokens, priority):
+                result = llm.invoke(prompt)
+
+            response = _parse_llm_result(result, model_info, pydantic_model)
+            if response is not None:
+                llm_cache.set(cache_key, response)
+                return response
                 
         except Exception as e:
             if agent_name:
@@ -68,9 +72,111 @@ def call_llm(
                     return default_factory()
                 return create_default_response(pydantic_model)
 
+            # Back off with jitter so concurrent callers don't retry in lockstep
+            time.sleep(retry_delay(attempt))
+
     # This should never be reached due to the retry logic above
     return create_default_response(pydantic_model)
 
+async def acall_llm(
+    prompt: Any,
+    model_name: str,
+    model_provider: str,
+    pydantic_model: Type[T],
+    agent_name: Optional[str] = None,
+    max_retries: int = 3,
+    default_factory = None,
+    priority: int = 0,
+) -> T:
+    """
+    Async version of call_llm, using the provider's async client (ainvoke). Same arguments, caching,
+    scheduling, retry and default-response behavior.
+
+    Run it on the shared LLM event loop (see run_llm_coroutine) so the cached clients' async
+    connection pools are only ever used from one loop.
+    """
+    from src.llm.scheduler import get_llm_scheduler, retry_delay
+
+    llm, model_info, llm_cache, cache_key, cached, tokens = _prepare_llm_call(prompt, model_name, model_provider, pydantic_model)
+    if cached is not None:
+        return cached
+
+    scheduler = get_llm_scheduler()
+
+    for attempt in range(max_retries):
+        try:
+            async with scheduler.aslot(model_provider, model_name, tokens, priority):
+                result = await llm.ainvoke(prompt)
+
+            response = _parse_llm_result(result, model_info, pydantic_model)
+            if response is not None:
+                llm_cache.set(cache_key, response)
+                return response
+
+        except Exception as e:
+            if agent_name:
+                progress.update_status(agent_name, None, f"Error - retry {attempt + 1}/{max_retries}")
+
+            if attempt == max_retries - 1:
+                print(f"Error in LLM call after {max_retries} attempts: {e}")
+                if default_factory:
+                    return default_factory()
+                return create_default_response(pydantic_model)
+
+            await asyncio.sleep(retry_delay(attempt))
+
+    return create_default_response(pydantic_model)
+
+def _prepare_llm_call(prompt: Any, model_name: str, model_provider: str, pydantic_model: Type[T]):
+    """Shared setup for call_llm and acall_llm: client, model info, response cache lookup and token estimate."""
+    from src.llm.cache import get_llm_cache, render_prompt
+    from src.llm.models import get_model, get_model_info, get_structured_model
+    from src.llm.scheduler import DEFAULT_OUTPUT_TOKENS, estimate_tokens
+
+    model_info = get_model_info(model_name)
+    llm = get_model(model_name, model_provider)
+
+    # Identical prompts (e.g. a rerun backtest) are answered from the response cache
+    llm_cache = get_llm_cache()
+    cache_key = llm_cache.make_key(model_provider, model_name, pydantic_model, prompt, getattr(llm, "temperature", None))
+    cached = llm_cache.get(cache_key, pydantic_model)
+
+    # For non-JSON support models, we can use structured output
+    if not (model_info and not model_info.has_json_mode()):
+        llm = get_structured_model(model_name, model_provider, pydantic_model)
+
+    tokens = estimate_tokens(render_prompt(prompt)) + DEFAULT_OUTPUT_TOKENS
+    return llm, model_info, llm_cache, cache_key, cached, tokens
+
+def _parse_llm_result(result: Any, model_info, pydantic_model: Type[T]) -> Optional[T]:
+    """Structured output as is; for non-JSON support models, extract and parse the JSON manually (None if absent)."""
+    if model_info and not model_info.has_json_mode():
+        parsed_result = extract_json_from_response(result.content)
+        return pydantic_model(**parsed_result) if parsed_result else None
+    return result
+
+def use_async_llm() -> bool:
+    """Whether agents should make LLM calls with acall_llm on the shared event loop (LLM_ASYNC=true)."""
+    return os.environ.get("LLM_ASYNC", "false").lower() in ("1", "true", "yes")
+
+_llm_loop: Optional[asyncio.AbstractEventLoop] = None
+_llm_loop_lock = threading.Lock()
+
+def get_llm_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop that runs all async LLM calls, started on a daemon thread on first use."""
+    global _llm_loop
+    if _llm_loop is None:
+        with _llm_loop_lock:
+            if _llm_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True).start()
+                _llm_loop = loop
+    return _llm_loop
+
+def run_llm_coroutine(coroutine: Awaitable[T]) -> T:
+    """Run a coroutine on the shared LLM event loop and wait for its result. Callable from any thread."""
+    return asyncio.run_coroutine_threadsafe(coroutine, get_llm_event_loop()).result()
+
 def create_default_response(model_class: Type[T]) -> T:
     """Creates a safe default response based on the model's fields."""
     default_values = {}
@@ -0,0 +1,118 @@
+"""Streaming performance metrics for backtests, updated in O(1) per day."""
+
+import math
+
+# Assumes 252 trading days/year
+TRADING_DAYS_PER_YEAR = 252
+RISK_FREE_RATE = 0.0434
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """Float division with NumPy/pandas semantics: x / 0 is +-inf and 0 / 0 is NaN."""
+    if denominator == 0:
+        return float("nan") if numerator == 0 else math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+class RunningMoments:
+    """Welford's online mean and sample variance (ddof=1, NaN with fewer than two values, like pandas).
+
+    Infinite values make the mean infinite (NaN if both signs were seen) and the std NaN, as in pandas.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._finite_count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._has_positive_inf = False
+        self._has_negative_inf = False
+
+    def add(self, value: float):
+        self.count += 1
+        if math.isinf(value):
+            if value > 0:
+                self._has_positive_inf = True
+            else:
+                self._has_negative_inf = True
+            return
+        self._finite_count += 1
+        delta = value - self._mean
+        self._mean += delta / self._finite_count
+        self._m2 += delta * (value - self._mean)
+
+    @property
+    def mean(self) -> float:
+        if self._has_positive_inf and self._has_negative_inf:
+            return float("nan")
+        if self._has_positive_inf or self._has_negative_inf:
+            return math.inf if self._has_positive_inf else -math.inf
+        return self._mean
+
+    @property
+    def std(self) -> float:
+        if self.count < 2 or self._has_positive_inf or self._has_negative_inf:
+            return float("nan")
+        return math.sqrt(self._m2 / (self.count - 1))
+
+
+class PerformanceTracker:
+    """Sharpe and Sortino ratios and max drawdown of a portfolio value series, fed one value at a time.
+
+    Matches the batch formulas on the whole series: daily returns from pct_change, excess returns
+    over a daily risk-free rate, downside deviation as the std of the negative excess returns, and
+    drawdown from the running peak, dated at its first occurrence.
+    """
+
+    def __init__(self, risk_free_rate: float = RISK_FREE_RATE, periods_per_year: int = TRADING_DAYS_PER_YEAR):
+        self.daily_risk_free_rate = risk_free_rate / periods_per_year
+        self.annualization = math.sqrt(periods_per_year)
+        self.excess_returns = RunningMoments()
+        self.downside_returns = RunningMoments()
+        self._last_value = None
+        self._peak = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_date = None
+
+    def update(self, date, value: float):
+        if self._last_value is not None:
+            daily_return = _divide(value, self._last_value) - 1
+            # 0 -> 0 has no return (pandas drops the NaN)
+            if not math.isnan(daily_return):
+                excess_return = daily_return - self.daily_risk_free_rate
+                self.excess_returns.add(excess_return)
+                if excess_return < 0:
+                    self.downside_returns.add(excess_return)
+        self._last_value = value
+
+        self._peak = value if self._peak is None else max(self._peak, value)
+        # NaN while the peak is 0, which never counts as a new maximum drawdown
+        drawdown = _divide(value - self._peak, self._peak)
+        if drawdown < self.max_drawdown:
+            self.max_drawdown = drawdown
+            self.max_drawdown_date = date
+
+    def update_metrics(self, performance_metrics: dict[str, any]):
+        """Write sharpe_ratio, sortino_ratio, max_drawdown (%) and max_drawdown_date once there are two returns."""
+        if self.excess_returns.count < 2:
+            return  # not enough data points
+
+        mean_excess_return = self.excess_returns.mean
+        std_excess_return = self.excess_returns.std
+
+        # Sharpe ratio
+        if std_excess_return > 1e-12:
+            performance_metrics["sharpe_ratio"] = self.annualization * (mean_excess_return / std_excess_return)
+        else:
+            performance_metrics["sharpe_ratio"] = 0.0
+
+        # Sortino ratio
+        downside_std = self.downside_returns.std
+        if self.downside_returns.count > 0 and downside_std > 1e-12:
+            performance_metrics["sortino_ratio"] = self.annualization * (mean_excess_return / downside_std)
+        else:
+            performance_metrics["sortino_ratio"] = float("inf") if mean_excess_return > 0 else 0
+
+        # Maximum drawdown, stored as a negative percentage
+        performance_metrics["max_drawdown"] = self.max_drawdown * 100
+        performance_metrics["max_drawdown_date"] = self.max_drawdown_date.strftime("%Y-%m-%d") if self.max_drawdown < 0 else None
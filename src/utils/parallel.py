@@ -0,0 +1,29 @@
+import contextvars
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# Returned by a map_tickers function to leave its ticker out of the results (e.g. no data to analyze)
+SKIP = object()
+
+
+def get_ticker_concurrency() -> int:
+    """Number of tickers an agent processes at once (AGENT_TICKER_CONCURRENCY, default 4)."""
+    return max(1, int(os.environ.get("AGENT_TICKER_CONCURRENCY", 4)))
+
+
+def map_tickers(func: Callable[[str], any], tickers: list[str], max_workers: int | None = None) -> dict[str, any]:
+    """Run func(ticker) for every ticker on a bounded thread pool.
+
+    Returns {ticker: result} in the order of `tickers`, leaving out tickers for which func returned
+    SKIP; any other result, None included, is kept. If any call raises, the first exception in ticker order
+    is re-raised once all calls have finished. Each call runs in a copy of the caller's context.
+    """
+    max_workers = min(max_workers or get_ticker_concurrency(), len(tickers))
+    if max_workers <= 1:
+        results = [func(ticker) for ticker in tickers]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ticker") as executor:
+            futures = [executor.submit(contextvars.copy_context().run, func, ticker) for ticker in tickers]
+        results = [future.result() for future in futures]
+    return {ticker: result for ticker, result in zip(tickers, results) if result is not SKIP}
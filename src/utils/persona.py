@@ -0,0 +1,223 @@
+"""Shared signal step for the persona agents: rule-based signals, one LLM call per ticker, or batched calls."""
+
+import asyncio
+import functools
+import json
+import os
+from typing import Callable
+
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, create_model
+
+from src.llm.models import DEFAULT_CONTEXT_WINDOW, get_model_info
+from src.llm.scheduler import estimate_tokens
+from src.utils.llm import acall_llm, call_llm, run_llm_coroutine, use_async_llm
+from src.utils.parallel import map_tickers
+from src.utils.progress import progress
+
+# "llm" asks the LLM for every ticker, "rules" emits the rule-based signal without calling it, and "hybrid"
+# calls it only for tickers whose score is within SIGNAL_HYBRID_MARGIN of a signal threshold
+SIGNAL_MODES = ("llm", "rules", "hybrid")
+
+# Score thresholds (as a fraction of the max score) at or above which a persona is bullish / at or below which it is bearish
+DEFAULT_SIGNAL_THRESHOLDS = (0.7, 0.3)
+
+# Rough size of one ticker's signal in the response (reasoning included), in tokens
+OUTPUT_TOKENS_PER_TICKER = 400
+
+BATCH_HUMAN_PROMPT = """Based on the following analysis data, create an investment signal for each ticker as {persona} would:
+
+                Analysis Data by ticker:
+                {analysis_data}
+
+                Return JSON exactly in this format, with one entry under "signals" for every ticker ({tickers}):
+                {{
+                  "signals": {{
+                    "<TICKER>": {{
+                      "signal": "bullish" | "bearish" | "neutral",
+                      "confidence": float between 0 and 100,
+                      "reasoning": "string"
+                    }}
+                  }}
+                }}
+                """
+
+
+def get_persona_max_batch_size() -> int:
+    """Maximum tickers per persona LLM call (PERSONA_MAX_BATCH_SIZE, default 1 = one call per ticker)."""
+    return max(1, int(os.environ.get("PERSONA_MAX_BATCH_SIZE", 1)))
+
+
+def get_hybrid_margin() -> float:
+    """Distance from a threshold, as a fraction of the max score, within which hybrid mode asks the LLM (default 0.05)."""
+    return float(os.environ.get("SIGNAL_HYBRID_MARGIN", 0.05))
+
+
+def _score_ratio(data: dict[str, any]) -> float:
+    score, max_score = data.get("score"), data.get("max_score")
+    if score is None or not max_score:
+        return 0.5
+    return min(1.0, max(0.0, score / max_score))
+
+
+def analyses_through(analysis_data: dict[str, any], ticker: str) -> dict[str, any]:
+    """The analyses of every ticker up to and including ticker, in ticker order.
+
+    This is what a persona's per-ticker prompt received when tickers were analyzed one at a time,
+    so the prompt does not depend on whether tickers now run concurrently.
+    """
+    tickers = list(analysis_data)
+    return {name: analysis_data[name] for name in tickers[: tickers.index(ticker) + 1]}
+
+
+def rule_based_signal(data: dict[str, any], thresholds: tuple[float, float] = DEFAULT_SIGNAL_THRESHOLDS) -> dict[str, any]:
+    """The persona's rule-based signal, with confidence from score / max_score.
+
+    Bullish confidence is the score ratio, bearish its complement, and neutral is highest midway between the thresholds.
+    """
+    ratio = _score_ratio(data)
+    if data["signal"] == "bullish":
+        confidence = ratio
+    elif data["signal"] == "bearish":
+        confidence = 1 - ratio
+    else:
+        bullish, bearish = thresholds
+        confidence = 1 - abs(ratio - (bullish + bearish) / 2) / (bullish - bearish)
+    return {
+        "signal": data["signal"],
+        "confidence": round(100 * min(1.0, max(0.0, confidence)), 1),
+        "reasoning": f"Rule-based signal: score {data.get('score')} of {data.get('max_score')}",
+    }
+
+
+def is_borderline(data: dict[str, any], thresholds: tuple[float, float], margin: float) -> bool:
+    """Whether the score is within margin of a signal threshold."""
+    ratio = _score_ratio(data)
+    # Round away float noise so a score exactly margin from a threshold (e.g. 7 of 10 against 0.75) counts
+    return any(round(abs(ratio - threshold), 9) <= margin for threshold in thresholds)
+
+
+@functools.lru_cache(maxsize=None)
+def batch_signal_model(signal_model: type[BaseModel]) -> type[BaseModel]:
+    """Pydantic model for a batched response: {"signals": {ticker: signal_model}}."""
+    return create_model(f"{signal_model.__name__}Batch", signals=(dict[str, signal_model], ...))
+
+
+def plan_batches(analysis_data: dict[str, any], system_prompt: str, model_name: str, max_batch_size: int) -> list[list[str]]:
+    """Group tickers into batches that fit in half of the model's context window, prompt and response included."""
+    model_info = get_model_info(model_name)
+    budget = (model_info.context_window if model_info else DEFAULT_CONTEXT_WINDOW) // 2 - estimate_tokens(system_prompt + BATCH_HUMAN_PROMPT)
+
+    batches, batch, used = [], [], 0
+    for ticker, data in analysis_data.items():
+        cost = estimate_tokens(json.dumps({ticker: data}, indent=2)) + OUTPUT_TOKENS_PER_TICKER
+        if batch and (len(batch) >= max_batch_size or used + cost > budget):
+            batches.append(batch)
+            batch, used = [], 0
+        batch.append(ticker)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def generate_persona_signals(
+    agent_name: str,
+    persona: str,
+    analysis_data: dict[str, any],
+    system_prompt: str,
+    signal_model: type[BaseModel],
+    generate_single: Callable[[str, Callable], BaseModel],
+    model_name: str,
+    model_provider: str,
+    signal_mode: str = "llm",
+    thresholds: tuple[float, float] = DEFAULT_SIGNAL_THRESHOLDS,
+) -> dict[str, dict[str, any]]:
+    """Turn each ticker's analysis into {signal, confidence, reasoning} with the persona's LLM prompt.
+
+    signal_mode "rules" skips the LLM and uses rule_based_signal for every ticker; "hybrid" does so
+    except for tickers whose score is borderline (see is_borderline) for the persona's thresholds.
+
+    generate_single(ticker, llm_call) is the persona's per-ticker call, made through llm_call
+    (call_llm, or acall_llm when LLM_ASYNC is enabled, in which case all of the agent's calls run
+    concurrently on the shared LLM event loop instead of one thread per ticker).
+
+    With PERSONA_MAX_BATCH_SIZE > 1, several tickers share one prompt built from the persona's system
+    prompt, and the response is validated as {ticker: signal_model}. Tickers missing from a batched
+    response (or from a failed batch) fall back to generate_single.
+    """
+    if signal_mode not in SIGNAL_MODES:
+        raise ValueError(f"Unknown signal mode: {signal_mode}")
+    tickers = list(analysis_data)
+    rule_data = {}
+    if signal_mode == "rules":
+        rule_data = analysis_data
+    elif signal_mode == "hybrid":
+        margin = get_hybrid_margin()
+        rule_data = {ticker: data for ticker, data in analysis_data.items() if not is_borderline(data, thresholds, margin)}
+    rule_signals = {ticker: rule_based_signal(data, thresholds) for ticker, data in rule_data.items()}
+    # Everything else goes to the LLM
+    llm_data = {ticker: data for ticker, data in analysis_data.items() if ticker not in rule_signals}
+
+    max_batch_size = get_persona_max_batch_size()
+    batches = plan_batches(llm_data, system_prompt, model_name, max_batch_size) if max_batch_size > 1 and len(llm_data) > 1 else []
+    template = ChatPromptTemplate.from_messages([("system", system_prompt), ("human", BATCH_HUMAN_PROMPT)])
+    batch_model = batch_signal_model(signal_model)
+
+    def generate_batch(batch: list[str], llm_call: Callable):
+        for ticker in batch:
+            progress.update_status(agent_name, ticker, f"Generating {persona} analysis (batched)")
+        prompt = template.invoke(
+            {
+                "persona": persona,
+                "analysis_data": json.dumps({ticker: llm_data[ticker] for ticker in batch}, indent=2),
+                "tickers": ", ".join(batch),
+            }
+        )
+        return llm_call(
+            prompt=prompt,
+            model_name=model_name,
+            model_provider=model_provider,
+            pydantic_model=batch_model,
+            agent_name=agent_name,
+            default_factory=lambda: batch_model(signals={}),
+        )
+
+    def generate(ticker: str, llm_call: Callable):
+        progress.update_status(agent_name, ticker, f"Generating {persona} analysis")
+        return generate_single(ticker, llm_call)
+
+    if not llm_data:
+        outputs = {}
+    elif use_async_llm():
+        outputs = run_llm_coroutine(_generate_async(llm_data, batches, generate_batch, generate))
+    else:
+        outputs = {}
+        for batch, response in map_tickers(lambda batch: generate_batch(batch, call_llm), [tuple(batch) for batch in batches]).items():
+            outputs.update(_batch_outputs(batch, response))
+        missing = [ticker for ticker in llm_data if ticker not in outputs]
+        outputs.update(map_tickers(lambda ticker: generate(ticker, call_llm), missing))
+
+    signals = {}
+    for ticker in tickers:
+        if ticker in rule_signals:
+            signals[ticker] = rule_signals[ticker]
+        else:
+            output = outputs[ticker]
+            signals[ticker] = {"signal": output.signal, "confidence": output.confidence, "reasoning": output.reasoning}
+        progress.update_status(agent_name, ticker, "Done")
+    return signals
+
+
+def _batch_outputs(batch: list[str], response: BaseModel) -> dict[str, BaseModel]:
+    return {ticker: response.signals[ticker] for ticker in batch if ticker in response.signals}
+
+
+async def _generate_async(analysis_data: dict[str, any], batches: list[list[str]], generate_batch: Callable, generate: Callable) -> dict[str, BaseModel]:
+    outputs = {}
+    responses = await asyncio.gather(*(generate_batch(batch, acall_llm) for batch in batches))
+    for batch, response in zip(batches, responses):
+        outputs.update(_batch_outputs(batch, response))
+    missing = [ticker for ticker in analysis_data if ticker not in outputs]
+    outputs.update(zip(missing, await asyncio.gather(*(generate(ticker, acall_llm) for ticker in missing))))
+    return outputs
@@ -1,3 +1,5 @@
+import threading
+
 from rich.console import Console
 from rich.live import Live
 from rich.table import Table
@@ -9,10 +11,11 @@ console = Console()
 
 
 class AgentProgress:
-    """Manages progress tracking for multiple agents."""
+    """Manages progress tracking for multiple agents. Safe to update from several threads."""
 
     def __init__(self):
         self.agent_status: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.RLock()
         self.table = Table(show_header=False, box=None, padding=(0, 1))
         self.live = Live(self.table, console=console, refresh_per_second=4)
         self.started = False
@@ -32,22 +35,24 @@ class AgentProgress:
 
     def update_status(self, agent_name: str, ticker: Optional[str] = None, status: str = ""):
         """Update the status of an agent."""
-        if agent_name not in self.agent_status:
-            self.agent_status[agent_name] = {"status": "", "ticker": None}
+        with self._lock:
+            if agent_name not in self.agent_status:
+                self.agent_status[agent_name] = {"status": "", "ticker": None}
 
-        if ticker:
-            self.agent_status[agent_name]["ticker"] = ticker
-        if status:
-            self.agent_status[agent_name]["status"] = status
+            if ticker:
+                self.agent_status[agent_name]["ticker"] = ticker
+            if status:
+                self.agent_status[agent_name]["status"] = status
 
-        self._refresh_display()
-        if self.on_update:
-            self.on_update(agent_name, ticker, status)
+            self._refresh_display()
+            if self.on_update:
+                self.on_update(agent_name, ticker, status)
 
     def _refresh_display(self):
         """Refresh the progress display."""
-        self.table.columns.clear()
-        self.table.add_column(width=100)
+        # Build a new table and swap it in, so the live display never renders a half-built one
+        table = Table(show_header=False, box=None, padding=(0, 1))
+        table.add_column(width=100)
 
         # Sort agents with Risk Management and Portfolio Management at the bottom
         def sort_key(item):
@@ -83,7 +88,10 @@ class AgentProgress:
                 status_text.append(f"[{ticker}] ", style=Style(color="cyan"))
             status_text.append(status, style=style)
 
-            self.table.add_row(status_text)
+            table.add_row(status_text)
+
+        self.table = table
+        self.live.update(table)
 
 
 # Create a global instance
@@ -0,0 +1,119 @@
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+import src.tools.api as api
+import src.tools.http_client as http_client
+from src.data.cache import MIN_DATE, Cache, merge_ranges, missing_ranges, shift_date
+from src.tools.http_client import FinancialDatasetsClient
+
+
+def test_shift_date_crosses_month_and_year():
+    assert shift_date("2024-02-28", 2) == "2024-03-01"
+    assert shift_date("2024-01-01", -1) == "2023-12-31"
+
+
+@pytest.mark.parametrize(
+    "ranges, merged",
+    [
+        ([], []),
+        ([["2024-01-01", "2024-01-10"]], [["2024-01-01", "2024-01-10"]]),
+        # Overlapping
+        ([["2024-01-05", "2024-01-20"], ["2024-01-01", "2024-01-10"]], [["2024-01-01", "2024-01-20"]]),
+        # Adjacent days merge
+        ([["2024-01-01", "2024-01-10"], ["2024-01-11", "2024-01-15"]], [["2024-01-01", "2024-01-15"]]),
+        # Contained
+        ([["2024-01-01", "2024-01-31"], ["2024-01-05", "2024-01-06"]], [["2024-01-01", "2024-01-31"]]),
+        # One-day gap stays separate
+        ([["2024-01-01", "2024-01-10"], ["2024-01-12", "2024-01-15"]], [["2024-01-01", "2024-01-10"], ["2024-01-12", "2024-01-15"]]),
+    ],
+)
+def test_merge_ranges(ranges, merged):
+    assert merge_ranges(ranges) == merged
+
+
+@pytest.mark.parametrize(
+    "ranges, start, end, gaps",
+    [
+        ([], "2024-01-01", "2024-01-31", [("2024-01-01", "2024-01-31")]),
+        ([["2024-01-01", "2024-01-31"]], "2024-01-05", "2024-01-20", []),
+        ([["2024-01-10", "2024-01-20"]], "2024-01-01", "2024-01-31", [("2024-01-01", "2024-01-09"), ("2024-01-21", "2024-01-31")]),
+        ([["2024-01-01", "2024-01-10"], ["2024-01-15", "2024-01-20"]], "2024-01-05", "2024-01-25", [("2024-01-11", "2024-01-14"), ("2024-01-21", "2024-01-25")]),
+        # Ranges entirely before or after the request are ignored
+        ([["2023-01-01", "2023-02-01"], ["2024-03-01", "2024-04-01"]], "2024-01-01", "2024-01-31", [("2024-01-01", "2024-01-31")]),
+        # Covered up to exactly the end date
+        ([["2024-01-01", "2024-01-31"]], "2024-01-15", "2024-01-31", []),
+        ([["2024-01-01", "2024-01-30"]], "2024-01-15", "2024-01-31", [("2024-01-31", "2024-01-31")]),
+    ],
+)
+def test_missing_ranges(ranges, start, end, gaps):
+    assert missing_ranges(ranges, start, end) == gaps
+
+
+def test_cache_tracks_covered_ranges_per_ticker():
+    cache = Cache()
+    cache.set_insider_trades("AAPL", [{"ticker": "AAPL", "filing_date": "2024-01-05", "name": "a"}], covered=("2024-01-01", "2024-01-10"))
+    cache.set_insider_trades("AAPL", [{"ticker": "AAPL", "filing_date": "2024-01-25", "name": "b"}], covered=("2024-01-20", "2024-01-31"))
+
+    assert cache.get_missing_ranges("insider_trades", "AAPL", "2024-01-01", "2024-01-31") == [("2024-01-11", "2024-01-19")]
+    assert cache.get_missing_ranges("insider_trades", "MSFT", None, "2024-01-31") == [(MIN_DATE, "2024-01-31")]
+
+
+def test_coverage_is_never_recorded_past_today():
+    cache = Cache()
+    cache.set_company_news("AAPL", [], covered=("2024-01-01", "2999-12-31"))
+    gaps = cache.get_missing_ranges("company_news", "AAPL", "2024-01-01", "2999-12-31")
+    assert len(gaps) == 1 and gaps[0][1] == "2999-12-31" and gaps[0][0] > "2024-01-01"
+
+
+# Five trades filed on one day, more than a page holds
+FILING_DATES = ["2024-03-15"] * 5 + ["2024-03-10"] * 2 + ["2024-03-01"]
+TRADE = {field: None for field in api.InsiderTrade.model_fields} | {"ticker": "AAPL"}
+
+
+class FakeInsiderTradeServer:
+    """Insider trades endpoint returning the newest `limit` trades filed within the requested days."""
+
+    def __init__(self):
+        self.urls = []
+
+    def __call__(self, method, url, **kwargs):
+        self.urls.append(url)
+        query = {key: values[0] for key, values in parse_qs(urlparse(url).query).items()}
+        trades = [
+            {**TRADE, "name": f"insider {i}", "transaction_shares": i, "filing_date": filing_date}
+            for i, filing_date in enumerate(FILING_DATES)
+            if query.get("filing_date_gte", MIN_DATE) <= filing_date <= query["filing_date_lte"]
+        ]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"insider_trades": trades[: int(query["limit"])]}).encode("utf-8")
+        return response
+
+
+@pytest.fixture
+def insider_server(monkeypatch):
+    fake = FakeInsiderTradeServer()
+    client = FinancialDatasetsClient(base_url="http://mock")
+    monkeypatch.setattr(client.session, "request", fake)
+    monkeypatch.setattr(http_client, "_client", client)
+    monkeypatch.setattr(api, "_cache", Cache())
+    return fake
+
+
+def test_full_page_within_one_day_is_not_refetched(insider_server):
+    first = api.get_insider_trades("AAPL", "2024-03-15", limit=3)
+    assert [trade.filing_date for trade in first] == ["2024-03-15"] * 3
+    assert api.get_insider_trades("AAPL", "2024-03-15", limit=3) == first
+    assert len(insider_server.urls) == 1
+
+
+def test_paging_continues_before_a_day_that_fills_a_page(insider_server):
+    trades = api.get_insider_trades("AAPL", "2024-03-15", start_date="2024-03-01", limit=3)
+    assert sorted(trade.filing_date for trade in trades) == ["2024-03-01"] + ["2024-03-10"] * 2 + ["2024-03-15"] * 3
+    requests_made = len(insider_server.urls)
+
+    assert api.get_insider_trades("AAPL", "2024-03-15", start_date="2024-03-01", limit=3) == trades
+    assert len(insider_server.urls) == requests_made
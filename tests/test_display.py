@@ -0,0 +1,123 @@
+import io
+import json
+
+import pytest
+
+from src.utils.display import (
+    AppendRenderer,
+    BacktestRenderer,
+    EventRenderer,
+    FullRenderer,
+    LiveRenderer,
+    create_backtest_renderer,
+    format_backtest_row,
+    write_json_lines,
+)
+
+
+def day_rows(date: str) -> list:
+    return [
+        format_backtest_row(date, "AAPL", "buy", 10, 185.5, 10, 1855.0, 3, 1, 2),
+        format_backtest_row(
+            date,
+            "",
+            "",
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            0,
+            is_summary=True,
+            total_value=100250.0,
+            return_pct=0.25,
+            cash_balance=98395.0,
+            total_position_value=1855.0,
+            sharpe_ratio=1.5,
+            sortino_ratio=None,
+            max_drawdown=-2.5,
+        ),
+    ]
+
+
+def test_backtest_renderer_is_abstract():
+    with pytest.raises(TypeError):
+        BacktestRenderer()
+
+    class Incomplete(BacktestRenderer):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+@pytest.mark.parametrize(
+    "mode, renderer_type",
+    [("full", FullRenderer), ("append", AppendRenderer), ("live", LiveRenderer), ("events", EventRenderer)],
+)
+def test_create_backtest_renderer(mode, renderer_type):
+    assert type(create_backtest_renderer(mode)) is renderer_type
+
+
+def test_create_backtest_renderer_rejects_unknown_modes():
+    with pytest.raises(ValueError, match="Unknown render mode"):
+        create_backtest_renderer("fancy")
+
+
+def test_event_renderer_sends_plain_values_to_the_sink():
+    events = []
+    renderer = EventRenderer(events.append)
+    rows = day_rows("2024-01-02")
+    renderer.render_day(rows, rows)
+    renderer.finish(rows)
+
+    assert events == [
+        {
+            "event": "day",
+            "date": "2024-01-02",
+            "trades": [
+                {
+                    "date": "2024-01-02",
+                    "ticker": "AAPL",
+                    "action": "BUY",
+                    "quantity": 10.0,
+                    "price": 185.5,
+                    "shares": 10.0,
+                    "position_value": 1855.0,
+                    "bullish": 3.0,
+                    "bearish": 1.0,
+                    "neutral": 2.0,
+                }
+            ],
+            "summary": {
+                "date": "2024-01-02",
+                "total_position_value": 1855.0,
+                "cash_balance": 98395.0,
+                "total_value": 100250.0,
+                "return_pct": 0.25,
+                "sharpe_ratio": 1.5,
+                "sortino_ratio": None,
+                "max_drawdown": 2.5,
+            },
+        },
+        {"event": "finish", "days": 1},
+    ]
+
+
+def test_events_default_to_stderr(capsys):
+    renderer = create_backtest_renderer("events")
+    rows = day_rows("2024-01-02")
+    renderer.render_day(rows, rows)
+    renderer.finish(rows)
+
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert [json.loads(line)["event"] for line in captured.err.splitlines()] == ["day", "finish"]
+
+
+def test_write_json_lines_to_a_stream():
+    stream = io.StringIO()
+    sink = write_json_lines(stream)
+    sink({"event": "finish", "days": 2})
+    assert stream.getvalue() == '{"event": "finish", "days": 2}\n'
@@ -0,0 +1,57 @@
+from langgraph.graph import END, StateGraph
+
+from src.graph.state import AgentState, isolate_analyst_signals, merge_data
+
+
+def test_merge_data_combines_analyst_signals_per_agent():
+    a = {"tickers": ["AAPL"], "analyst_signals": {"x_agent": {"AAPL": 1}}}
+    b = {"analyst_signals": {"y_agent": {"AAPL": 2}}}
+    assert merge_data(a, b) == {"tickers": ["AAPL"], "analyst_signals": {"x_agent": {"AAPL": 1}, "y_agent": {"AAPL": 2}}}
+
+
+def test_merge_data_later_update_replaces_an_agents_signals():
+    a = {"analyst_signals": {"x_agent": {"AAPL": 1}}}
+    b = {"analyst_signals": {"x_agent": {"AAPL": 3}}}
+    assert merge_data(a, b)["analyst_signals"] == {"x_agent": {"AAPL": 3}}
+
+
+def test_merge_data_without_signals_is_a_plain_merge():
+    assert merge_data({"a": 1}, {"b": 2}) == {"a": 1, "b": 2}
+    assert merge_data({"analyst_signals": {"x": {}}}, {"end_date": "2024-01-01"}) == {"analyst_signals": {"x": {}}, "end_date": "2024-01-01"}
+
+
+def test_isolated_node_returns_only_its_own_signals_and_leaves_state_untouched():
+    existing = {"x_agent": {"AAPL": 1}}
+    state = {"messages": [], "data": {"tickers": ["AAPL"], "analyst_signals": existing}, "metadata": {}}
+
+    def node(state):
+        state["data"]["analyst_signals"]["y_agent"] = {"AAPL": 2}
+        return {"messages": [], "data": state["data"]}
+
+    result = isolate_analyst_signals(node)(state)
+    assert result["data"] == {"analyst_signals": {"y_agent": {"AAPL": 2}}}
+    assert existing == {"x_agent": {"AAPL": 1}}
+
+
+def test_parallel_analyst_nodes_keep_every_signal():
+    def analyst(name):
+        def node(state):
+            state["data"]["analyst_signals"][name] = {ticker: name for ticker in state["data"]["tickers"]}
+            return {"messages": [], "data": state["data"]}
+
+        return isolate_analyst_signals(node)
+
+    workflow = StateGraph(AgentState)
+    workflow.add_node("start", lambda state: state)
+    names = [f"analyst_{i}" for i in range(5)]
+    for name in names:
+        workflow.add_node(name, analyst(name))
+        workflow.add_edge("start", name)
+        workflow.add_edge(name, END)
+    workflow.set_entry_point("start")
+
+    state = {"messages": [], "data": {"tickers": ["AAPL", "MSFT"], "analyst_signals": {}}, "metadata": {}}
+    final = workflow.compile().invoke(state, config={"max_concurrency": 5})
+
+    assert final["data"]["tickers"] == ["AAPL", "MSFT"]
+    assert final["data"]["analyst_signals"] == {name: {"AAPL": name, "MSFT": name} for name in names}
@@ -0,0 +1,165 @@
+import email.utils
+import time
+
+import pytest
+import requests
+
+import src.tools.http_client as http_client
+from src.tools.http_client import FinancialDatasetsClient, TokenBucket, parse_retry_after
+
+URL = "http://mock/prices/?ticker=AAPL"
+
+
+def make_response(status_code: int, headers: dict[str, str] | None = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"{}"
+    response.headers.update(headers or {})
+    return response
+
+
+class StubSession:
+    """Stands in for requests.Session, answering each request with the next scripted response or exception."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url, kwargs))
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return make_response(*outcome) if isinstance(outcome, tuple) else make_response(outcome)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(http_client.time, "sleep", sleeps.append)
+    # Full jitter draws the longest delay, so the backoff schedule is deterministic
+    monkeypatch.setattr(http_client.random, "uniform", lambda low, high: high)
+    return sleeps
+
+
+def make_client(session: StubSession, **kwargs) -> FinancialDatasetsClient:
+    client = FinancialDatasetsClient(base_url="http://mock", backoff_base=0.5, backoff_max=4.0, **kwargs)
+    client.session = session
+    return client
+
+
+def test_transient_errors_are_retried_with_exponential_backoff(sleeps):
+    session = StubSession(503, 502, 429, 500, 200)
+    response = make_client(session).get(URL)
+    assert response.status_code == 200
+    assert len(session.calls) == 5
+    assert sleeps == [0.5, 1.0, 2.0, 4.0]
+
+
+def test_retries_stop_after_max_retries(sleeps):
+    session = StubSession(503)
+    response = make_client(session, max_retries=2).get(URL)
+    assert response.status_code == 503
+    assert len(session.calls) == 3
+    assert len(sleeps) == 2
+
+
+@pytest.mark.parametrize("status_code", [200, 400, 401, 403, 404, 422])
+def test_other_status_codes_are_not_retried(sleeps, status_code):
+    session = StubSession(status_code, 200)
+    assert make_client(session).get(URL).status_code == status_code
+    assert len(session.calls) == 1
+    assert sleeps == []
+
+
+def test_retry_after_seconds_are_honoured(sleeps):
+    session = StubSession((429, {"Retry-After": "7"}), 200)
+    assert make_client(session).get(URL).status_code == 200
+    assert sleeps == [7.0]
+
+
+def test_retry_after_http_date_is_honoured(sleeps):
+    retry_at = email.utils.formatdate(time.time() + 120, usegmt=True)
+    session = StubSession((503, {"Retry-After": retry_at}), 200)
+    assert make_client(session).get(URL).status_code == 200
+    assert len(sleeps) == 1 and 118 < sleeps[0] <= 120
+
+
+def test_short_retry_after_does_not_shorten_the_backoff(sleeps):
+    session = StubSession(503, 503, (503, {"Retry-After": "1"}), 200)
+    make_client(session).get(URL)
+    assert sleeps == [0.5, 1.0, 2.0]
+
+
+@pytest.mark.parametrize("error", [requests.ConnectionError("reset"), requests.Timeout("slow")])
+def test_connection_errors_are_retried_then_raised(sleeps, error):
+    session = StubSession(error, 200)
+    assert make_client(session).get(URL).status_code == 200
+
+    session = StubSession(error)
+    with pytest.raises(type(error)):
+        make_client(session, max_retries=3).get(URL)
+    assert len(session.calls) == 4
+    assert len(sleeps) == 1 + 3
+
+
+def test_requests_carry_the_api_key_and_timeout(monkeypatch, sleeps):
+    monkeypatch.setenv("FINANCIAL_DATASETS_API_KEY", "secret")
+    session = StubSession(200)
+    make_client(session, timeout=12).post(URL, json={"tickers": ["AAPL"]}, headers={"X-Trace": "1"})
+    method, url, kwargs = session.calls[0]
+    assert (method, url) == ("POST", URL)
+    assert kwargs["headers"] == {"X-API-KEY": "secret", "X-Trace": "1"}
+    assert kwargs["timeout"] == 12
+    assert kwargs["json"] == {"tickers": ["AAPL"]}
+
+
+@pytest.mark.parametrize("value, seconds", [("3", 3.0), ("1.5", 1.5), ("-5", 0.0), (None, None), ("", None), ("soon", None)])
+def test_parse_retry_after(value, seconds):
+    assert parse_retry_after(value) == seconds
+
+
+def test_parse_retry_after_dates():
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert 58 < parse_retry_after(email.utils.formatdate(time.time() + 60, usegmt=True)) <= 60
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.now += seconds
+
+
+def test_token_bucket_allows_a_burst_then_paces_requests(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(http_client, "time", clock)
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+    clock.now += 0.25
+    assert bucket.try_acquire() == pytest.approx(0.25)
+    clock.now += 10
+    # Tokens never accumulate beyond the capacity
+    assert [bucket.try_acquire() for _ in range(4)][-1] == pytest.approx(0.5)
+
+    start = clock.now
+    bucket.acquire()
+    assert clock.now - start == pytest.approx(0.5)
+
+
+def test_token_bucket_without_a_rate_never_waits():
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.try_acquire() == 0.0 for _ in range(1000))
+
+
+def test_client_rejects_unknown_modes_and_archive_modes_without_an_archive():
+    with pytest.raises(ValueError, match="Unknown client mode"):
+        FinancialDatasetsClient(mode="offline")
+    with pytest.raises(ValueError, match="needs an archive"):
+        FinancialDatasetsClient(mode="replay")
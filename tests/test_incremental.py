@@ -0,0 +1,88 @@
+import src.utils.incremental as incremental
+from src.tools.input_recorder import record_input
+from src.utils.incremental import IncrementalSignalCache
+
+FUNDAMENTALS = {"AAPL": 1.0, "MSFT": 2.0}
+
+
+@record_input()
+def get_fundamentals(ticker: str, end_date: str) -> float:
+    return FUNDAMENTALS[ticker]
+
+
+@record_input(daily=True)
+def get_price(ticker: str, end_date: str) -> str:
+    return end_date
+
+
+class RecordingProgress:
+    def __init__(self):
+        self.updates = []
+
+    def update_status(self, agent_name, ticker=None, status=""):
+        self.updates.append((agent_name, ticker, status))
+
+
+def make_node(calls: list, uses_prices: bool = False):
+    def node(state):
+        data = state["data"]
+        signals = {}
+        for ticker in data["tickers"]:
+            calls.append((ticker, data["end_date"]))
+            value = get_fundamentals(ticker, data["end_date"])
+            if uses_prices:
+                get_price(ticker, data["end_date"])
+            signals[ticker] = {"signal": "bullish" if value > 1 else "neutral", "value": value}
+        data["analyst_signals"]["fundamentals_agent"] = signals
+        return {"messages": [], "data": data}
+
+    return node
+
+
+def run(node, end_date, tickers=("AAPL", "MSFT")):
+    state = {"messages": [], "data": {"tickers": list(tickers), "end_date": end_date, "analyst_signals": {}}, "metadata": {}}
+    return node(state)["data"]["analyst_signals"]["fundamentals_agent"]
+
+
+def test_unchanged_inputs_reuse_signals_and_report_under_the_agent_name(monkeypatch):
+    progress = RecordingProgress()
+    monkeypatch.setattr(incremental, "progress", progress)
+    calls = []
+    cache = IncrementalSignalCache()
+    node = cache.wrap("fundamentals_analyst_agent", make_node(calls))
+
+    first = run(node, "2024-01-02")
+    second = run(node, "2024-01-03")
+
+    assert second == first
+    assert calls == [("AAPL", "2024-01-02"), ("MSFT", "2024-01-02")]
+    assert cache.stats() == {"reused": 2, "computed": 2}
+    # The graph node name never shows up as a separate progress row
+    assert {name for name, _, _ in progress.updates} == {"fundamentals_agent"}
+
+
+def test_changed_inputs_are_recomputed(monkeypatch):
+    monkeypatch.setattr(incremental, "progress", RecordingProgress())
+    monkeypatch.setitem(FUNDAMENTALS, "MSFT", 2.0)
+    calls = []
+    node = IncrementalSignalCache().wrap("fundamentals_analyst_agent", make_node(calls))
+
+    run(node, "2024-01-02")
+    FUNDAMENTALS["MSFT"] = 0.5
+    signals = run(node, "2024-01-03")
+
+    assert calls[2:] == [("MSFT", "2024-01-03")]
+    assert signals["MSFT"]["signal"] == "neutral"
+    assert list(signals) == ["AAPL", "MSFT"]
+
+
+def test_daily_inputs_are_never_reused(monkeypatch):
+    monkeypatch.setattr(incremental, "progress", RecordingProgress())
+    calls = []
+    cache = IncrementalSignalCache()
+    node = cache.wrap("technical_analyst_agent", make_node(calls, uses_prices=True))
+
+    run(node, "2024-01-02")
+    run(node, "2024-01-03")
+    assert len(calls) == 4
+    assert cache.stats() == {"reused": 0, "computed": 4}
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+import requests
+
+import src.tools.api as api
+import src.tools.http_client as http_client
+from src.data.cache import Cache
+from src.tools.http_client import FinancialDatasetsClient
+
+REPORT_PERIODS = ["2024-09-30", "2024-06-30", "2024-03-31", "2023-12-31", "2023-09-30", "2023-06-30"]
+
+
+def rows(fields: list[str], report_periods: list[str], period: str = "ttm") -> list[dict]:
+    return [
+        {"ticker": "AAPL", "report_period": rp, "period": period, "currency": "USD", **{field: f"{field}:{rp}" for field in fields}}
+        for rp in report_periods
+    ]
+
+
+@pytest.fixture
+def cache():
+    cache = Cache()
+    cache.set_line_items("AAPL", ["revenue", "net_income", "free_cash_flow"], "2024-12-31", "ttm", 4, rows(["revenue", "net_income", "free_cash_flow"], REPORT_PERIODS[:4]))
+    return cache
+
+
+def test_subset_of_fields_is_served_from_a_superset_entry(cache):
+    assert cache.get_missing_line_items("AAPL", ["net_income", "revenue"], "2024-12-31", "ttm", 4) == []
+    results = cache.get_line_items("AAPL", ["net_income", "revenue"], "2024-12-31", "ttm", 4)
+    assert [row["report_period"] for row in results] == REPORT_PERIODS[:4]
+    assert set(results[0]) == {"ticker", "report_period", "period", "currency", "net_income", "revenue"}
+    assert results[0]["net_income"] == "net_income:2024-09-30"
+
+
+def test_fields_outside_the_entry_are_reported_missing(cache):
+    assert cache.get_missing_line_items("AAPL", ["revenue", "total_debt", "total_debt"], "2024-12-31", "ttm", 4) == ["total_debt"]
+    assert cache.get_line_items("AAPL", ["revenue", "total_debt"], "2024-12-31", "ttm", 4) is None
+
+
+def test_smaller_limit_is_served_and_larger_limit_refetches(cache):
+    assert [row["report_period"] for row in cache.get_line_items("AAPL", ["revenue"], "2024-12-31", "ttm", 2)] == REPORT_PERIODS[:2]
+    assert cache.get_missing_line_items("AAPL", ["revenue", "net_income"], "2024-12-31", "ttm", 5) == ["revenue", "net_income"]
+    assert cache.get_line_items("AAPL", ["revenue"], "2024-12-31", "ttm", 5) is None
+
+
+def test_other_period_is_not_served(cache):
+    assert cache.get_missing_line_items("AAPL", ["revenue"], "2024-12-31", "annual", 4) == ["revenue"]
+    assert cache.get_line_items("AAPL", ["revenue"], "2024-12-31", "annual", 4) is None
+
+
+def test_later_query_answers_an_earlier_end_date_only_with_enough_periods(cache):
+    # Two of the four cached periods are on or before 2024-03-31
+    assert [row["report_period"] for row in cache.get_line_items("AAPL", ["revenue"], "2024-03-31", "ttm", 2)] == ["2024-03-31", "2023-12-31"]
+    assert cache.get_line_items("AAPL", ["revenue"], "2024-03-31", "ttm", 3) is None
+    # A query never answers a later end date, which may have newer filings
+    assert cache.get_line_items("AAPL", ["revenue"], "2025-03-31", "ttm", 2) is None
+
+
+def test_short_response_answers_any_limit():
+    cache = Cache()
+    cache.set_line_items("AAPL", ["revenue"], "2024-12-31", "ttm", 10, rows(["revenue"], REPORT_PERIODS[:3]))
+    assert [row["report_period"] for row in cache.get_line_items("AAPL", ["revenue"], "2024-12-31", "ttm", 20)] == REPORT_PERIODS[:3]
+
+
+class FakeLineItemServer:
+    def __init__(self):
+        self.bodies = []
+
+    def __call__(self, method, url, json=None, **kwargs):
+        self.bodies.append(json)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = _dumps({"search_results": rows(json["line_items"], REPORT_PERIODS, json["period"])[: json["limit"]]})
+        return response
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeLineItemServer()
+    client = FinancialDatasetsClient(base_url="http://mock")
+    monkeypatch.setattr(client.session, "request", fake)
+    monkeypatch.setattr(http_client, "_client", client)
+    monkeypatch.setattr(api, "_cache", Cache())
+    return fake
+
+
+def test_search_line_items_requests_only_what_the_cache_cannot_answer(server):
+    api.search_line_items("AAPL", ["revenue", "net_income"], "2024-12-31", period="ttm", limit=4)
+    api.search_line_items("AAPL", ["revenue"], "2024-12-31", period="ttm", limit=3)
+    assert len(server.bodies) == 1
+
+    items = api.search_line_items("AAPL", ["revenue", "total_debt"], "2024-12-31", period="ttm", limit=4)
+    assert server.bodies[-1]["line_items"] == ["total_debt"]
+    assert [(item.revenue, item.total_debt) for item in items[:1]] == [("revenue:2024-09-30", "total_debt:2024-09-30")]
+
+    api.search_line_items("AAPL", ["revenue"], "2024-12-31", period="ttm", limit=6)
+    api.search_line_items("AAPL", ["revenue"], "2024-12-31", period="annual", limit=4)
+    assert [(body["period"], body["limit"]) for body in server.bodies[2:]] == [("ttm", 6), ("annual", 4)]
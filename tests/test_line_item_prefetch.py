@@ -0,0 +1,117 @@
+import json
+
+import pandas as pd
+import pytest
+import requests
+
+import src.tools.api as api
+import src.tools.http_client as http_client
+from src.data.cache import Cache
+from src.tools.http_client import FinancialDatasetsClient
+
+# Quarterly filings from 2019 to 2024 for every ticker
+REPORT_PERIODS = [day.date().isoformat() for day in pd.date_range("2019-03-31", "2024-12-31", freq="QE")]
+
+
+class FakeLineItemServer:
+    """Line item search endpoint whose limit applies across all tickers of a request, like the real one."""
+
+    def __init__(self):
+        self.bodies = []
+
+    def __call__(self, method, url, json=None, **kwargs):
+        self.bodies.append(json)
+        rows = [
+            {"ticker": ticker, "report_period": report_period, "period": json["period"], "currency": "USD", **{item: f"{ticker}:{item}:{report_period}" for item in json["line_items"]}}
+            for ticker in json["tickers"]
+            for report_period in sorted(REPORT_PERIODS, reverse=True)
+            if report_period <= json["end_date"]
+        ]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = _dumps({"search_results": rows[: json["limit"]]})
+        return response
+
+
+def _dumps(payload) -> bytes:
+    return json.dumps(payload).encode("utf-8")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeLineItemServer()
+    client = FinancialDatasetsClient(base_url="http://mock")
+    monkeypatch.setattr(client.session, "request", fake)
+    monkeypatch.setattr(http_client, "_client", client)
+    monkeypatch.setattr(api, "_cache", Cache())
+    return fake
+
+
+REQUEST = {"line_items": ["revenue", "net_income"], "period": "ttm", "limit": 5}
+
+
+def test_extended_requests_raise_the_limit_by_the_filings_in_the_window():
+    (extended,) = api.extend_line_item_requests([REQUEST], "2024-01-01", "2024-12-31")
+    assert extended["limit"] == 5 + 4 + 1
+    (annual,) = api.extend_line_item_requests([{**REQUEST, "period": "annual"}], "2024-01-01", "2024-12-31")
+    assert annual["limit"] == 5 + 1 + 1
+
+
+def test_one_prefetch_answers_every_day_of_the_window(server):
+    days = [day.date().isoformat() for day in pd.bdate_range("2024-01-01", "2024-12-31")]
+    expected = {}
+    for day in days[::20]:
+        api._cache = Cache()
+        expected[day] = [item.model_dump() for item in api.search_line_items("AAPL", REQUEST["line_items"], day, period="ttm", limit=5)]
+
+    api._cache = Cache()
+    server.bodies.clear()
+    api.prefetch_line_items(["AAPL", "MSFT"], days[-1], api.extend_line_item_requests([REQUEST], days[0], days[-1]))
+    prefetch_requests = len(server.bodies)
+
+    for day in days:
+        for ticker in ("AAPL", "MSFT"):
+            items = api.search_line_items(ticker, REQUEST["line_items"], day, period="ttm", limit=5)
+            assert len(items) == 5
+            assert all(item.report_period <= day for item in items)
+            if ticker == "AAPL" and day in expected:
+                assert [item.model_dump() for item in items] == expected[day]
+
+    # Nothing was fetched after the prefetch
+    assert len(server.bodies) == prefetch_requests
+
+
+def test_tickers_cut_off_by_the_combined_limit_are_fetched_on_their_own(server):
+    class Truncating(FakeLineItemServer):
+        def __call__(self, method, url, json=None, **kwargs):
+            # Return only the first ticker's rows, filling the combined limit
+            response = super().__call__(method, url, json={**json, "tickers": json["tickers"][:1]}, **kwargs)
+            self.bodies[-1] = json
+            return response
+
+    truncating = Truncating()
+    http_client._client.session.request = truncating
+    api.prefetch_line_items(["AAPL", "MSFT"], "2024-06-30", [{**REQUEST, "limit": 10}])
+
+    # AAPL alone filled the combined response, so MSFT was fetched separately
+    assert [body["tickers"] for body in truncating.bodies] == [["AAPL", "MSFT"], ["MSFT"]]
+    assert api._cache.get_missing_line_items("MSFT", REQUEST["line_items"], "2024-06-30", "ttm", 10) == []
+
+
+def test_sweep_prefetch_answers_every_analyst_subset(server, monkeypatch):
+    import src.sweep as sweep
+    from src.utils.analysts import plan_line_item_requests
+
+    monkeypatch.setattr(sweep, "prefetch_universe", lambda *args, **kwargs: {})
+    windows = [("2024-01-02", "2024-03-28"), ("2024-04-01", "2024-06-28")]
+    subsets = [["warren_buffett"], ["ben_graham", "valuation_analyst"], None]
+    sweep.prefetch_windows(["AAPL", "MSFT"], windows, subsets)
+    assert server.bodies
+
+    # What each worker's Backtester.prefetch_data asks for is already cached
+    server.bodies.clear()
+    for start_date, end_date in windows:
+        for subset in subsets:
+            requests = plan_line_item_requests(subset or list(sweep.ANALYST_CONFIG))
+            api.prefetch_line_items(["AAPL", "MSFT"], end_date, api.extend_line_item_requests(requests, start_date, end_date))
+    assert server.bodies == []
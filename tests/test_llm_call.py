@@ -0,0 +1,45 @@
+import sys
+
+from pydantic import BaseModel
+
+import src.llm.cache as llm_cache_module
+import src.llm.models as models
+from src.llm.cache import LLMResponseCache
+from src.utils.llm import call_llm
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: float
+
+
+class DictBackend:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, dataset, key):
+        return self.entries.get((dataset, key))
+
+    def set(self, dataset, key, value):
+        self.entries[(dataset, key)] = value
+
+
+def test_call_llm_uses_the_configured_response_cache(monkeypatch):
+    # A response cached in src.llm.cache's global cache answers call_llm without touching the provider
+    monkeypatch.setattr(models, "get_model", lambda *args: object())
+    monkeypatch.setattr(models, "get_structured_model", lambda *args: object())
+    cache = LLMResponseCache(DictBackend(), mode="only")
+    monkeypatch.setattr(llm_cache_module, "_llm_cache", cache)
+
+    prompt = "Analyze AAPL"
+    key = cache.make_key("OpenAI", "gpt-4o", Signal, prompt, None)
+    cache.backend.set("llm_responses", key, {"signal": "bullish", "confidence": 80.0})
+
+    assert call_llm(prompt, "gpt-4o", "OpenAI", Signal) == Signal(signal="bullish", confidence=80.0)
+    assert cache.stats() == {"hits": 1, "misses": 0}
+
+
+def test_llm_helpers_load_each_module_once():
+    assert "llm.cache" not in sys.modules
+    assert "llm.scheduler" not in sys.modules
+    assert "utils.progress" not in sys.modules
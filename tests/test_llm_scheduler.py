@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.llm.scheduler import PRIORITY_ANALYST, PRIORITY_PORTFOLIO_MANAGER, LLMScheduler, MinuteBudget
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+def run_concurrently(scheduler, count, hold_until_all_admitted=True, timeout=5.0):
+    """Start count callers that each hold a slot until every caller is admitted. Returns how many got in together."""
+    admitted = threading.Barrier(count, timeout=timeout) if hold_until_all_admitted else None
+    together = []
+
+    def call():
+        with scheduler.slot("OpenAI", "gpt-4o"):
+            try:
+                admitted.wait()
+                together.append(True)
+            except threading.BrokenBarrierError:
+                together.append(False)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=timeout * 2)
+    return sum(together)
+
+
+@pytest.mark.parametrize("round_", range(5))
+def test_all_slots_are_used_again_after_a_pause(round_):
+    scheduler = LLMScheduler(environ={"LLM_OPENAI_MAX_CONCURRENCY": "4"})
+    limits = scheduler._limits("OpenAI")
+    limits.paused_until = time.monotonic() + 0.2
+    assert run_concurrently(scheduler, 4, timeout=2.0) == 4
+
+
+def test_all_slots_are_used_again_after_a_rate_budget_wait():
+    scheduler = LLMScheduler(environ={"LLM_OPENAI_MAX_CONCURRENCY": "4", "LLM_OPENAI_RPM": "6000"})
+    limits = scheduler._limits("OpenAI")
+    # Spend the budget so the next calls wait for it to refill (100 requests/second)
+    limits.requests.consume(limits.requests.capacity)
+    assert run_concurrently(scheduler, 4, timeout=2.0) == 4
+
+
+def test_concurrency_cap_is_respected():
+    scheduler = LLMScheduler(environ={"LLM_OPENAI_MAX_CONCURRENCY": "2"})
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def call():
+        with scheduler.slot("OpenAI", "gpt-4o"):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    assert peak[0] == 2
+
+
+def test_rate_limit_pauses_and_halves_concurrency_then_recovers():
+    scheduler = LLMScheduler(environ={"LLM_OPENAI_MAX_CONCURRENCY": "4"})
+    with pytest.raises(RateLimitError):
+        with scheduler.slot("OpenAI", "gpt-4o"):
+            raise RateLimitError()
+    limits = scheduler._limits("OpenAI")
+    assert limits.concurrency == 2
+    assert limits.paused_until > time.monotonic()
+
+    limits.paused_until = 0.0
+    for _ in range(2):
+        with scheduler.slot("OpenAI", "gpt-4o"):
+            pass
+    assert limits.concurrency == 4
+
+
+def test_higher_priority_waiter_goes_first():
+    scheduler = LLMScheduler(environ={"LLM_OPENAI_MAX_CONCURRENCY": "1"})
+    order = []
+    scheduler.acquire("OpenAI", "gpt-4o")
+
+    def call(name, priority):
+        with scheduler.slot("OpenAI", "gpt-4o", priority=priority):
+            order.append(name)
+
+    analyst = threading.Thread(target=call, args=("analyst", PRIORITY_ANALYST))
+    analyst.start()
+    time.sleep(0.05)
+    manager = threading.Thread(target=call, args=("portfolio_manager", PRIORITY_PORTFOLIO_MANAGER))
+    manager.start()
+    time.sleep(0.05)
+    scheduler.release("OpenAI", "gpt-4o")
+    analyst.join(timeout=5)
+    manager.join(timeout=5)
+    assert order == ["portfolio_manager", "analyst"]
+
+
+def test_async_waiters_use_all_slots_after_a_pause():
+    scheduler = LLMScheduler(environ={"LLM_OPENAI_MAX_CONCURRENCY": "4"})
+    scheduler._limits("OpenAI").paused_until = time.monotonic() + 0.2
+
+    async def main():
+        admitted = 0
+        all_in = asyncio.Event()
+
+        async def call():
+            nonlocal admitted
+            async with scheduler.aslot("OpenAI", "gpt-4o"):
+                admitted += 1
+                if admitted == 4:
+                    all_in.set()
+                await asyncio.wait_for(all_in.wait(), timeout=2.0)
+
+        await asyncio.gather(*(call() for _ in range(4)))
+
+    asyncio.run(main())
+
+
+def test_minute_budget_wait_time():
+    budget = MinuteBudget(60)
+    assert budget.wait_time(60) == 0.0
+    budget.consume(60)
+    assert budget.wait_time(1) == pytest.approx(1.0, abs=0.05)
+    assert MinuteBudget(0).wait_time(10**9) == 0.0
@@ -0,0 +1,110 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.metrics import PerformanceTracker, RunningMoments
+
+
+def batch_metrics(dates, values) -> dict:
+    """The whole-series pandas computation the backtester used before metrics were streamed."""
+    metrics = {}
+    values_df = pd.DataFrame({"Portfolio Value": values}, index=dates)
+    clean_returns = values_df["Portfolio Value"].pct_change().dropna()
+    if len(clean_returns) < 2:
+        return metrics
+
+    excess_returns = clean_returns - 0.0434 / 252
+    mean_excess_return = excess_returns.mean()
+    std_excess_return = excess_returns.std()
+    metrics["sharpe_ratio"] = np.sqrt(252) * (mean_excess_return / std_excess_return) if std_excess_return > 1e-12 else 0.0
+
+    negative_returns = excess_returns[excess_returns < 0]
+    downside_std = negative_returns.std() if len(negative_returns) > 0 else float("nan")
+    if len(negative_returns) > 0 and downside_std > 1e-12:
+        metrics["sortino_ratio"] = np.sqrt(252) * (mean_excess_return / downside_std)
+    else:
+        metrics["sortino_ratio"] = float("inf") if mean_excess_return > 0 else 0
+
+    rolling_max = values_df["Portfolio Value"].cummax()
+    drawdown = (values_df["Portfolio Value"] - rolling_max) / rolling_max
+    min_drawdown = drawdown.min()
+    metrics["max_drawdown"] = min_drawdown * 100
+    metrics["max_drawdown_date"] = drawdown.idxmin().strftime("%Y-%m-%d") if min_drawdown < 0 else None
+    return metrics
+
+
+def assert_metrics_equal(expected: dict, actual: dict):
+    assert expected.keys() == actual.keys()
+    for key, value in expected.items():
+        if isinstance(value, (float, np.floating)) and not math.isfinite(value):
+            assert (math.isnan(value) and math.isnan(actual[key])) or value == actual[key], key
+        elif isinstance(value, (float, np.floating)):
+            assert actual[key] == pytest.approx(value, rel=1e-8, abs=1e-9), key
+        else:
+            assert actual[key] == value, key
+
+
+def stream(dates, values) -> list[dict]:
+    """Metrics after each day, as the backtester reads them."""
+    tracker = PerformanceTracker()
+    results = []
+    for date, value in zip(dates, values):
+        tracker.update(date, value)
+        metrics = {}
+        tracker.update_metrics(metrics)
+        results.append(metrics)
+    return results
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_streaming_matches_batch_formulas(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(3, 200))
+    dates = pd.date_range("2024-01-01", periods=n, freq="B")
+    values = 1e5 * np.cumprod(1 + rng.normal(0.0005, 0.02, n))
+    streamed = stream(dates, values)
+    for day in range(n):
+        assert_metrics_equal(batch_metrics(dates[: day + 1], values[: day + 1]), streamed[day])
+
+
+@pytest.mark.filterwarnings("ignore:invalid value encountered:RuntimeWarning")
+@pytest.mark.parametrize(
+    "values",
+    [
+        [100.0, 50.0, 0.0, 10.0, 20.0],  # recovery from zero: infinite return
+        [100.0, 0.0, 0.0, 5.0],  # 0 -> 0 has no return
+        [0.0, 0.0, 10.0, 20.0, 15.0],  # starts at zero: NaN drawdowns
+        [100.0, 120.0, 0.0, 0.0],
+        [100.0, -20.0, -50.0, 10.0, 30.0],  # negative values after losses on shorts
+        [100.0, 100.0, 100.0, 100.0],  # flat
+        [100.0, 101.0, 102.0, 103.0],  # no downside
+    ],
+)
+def test_edge_cases_match_batch_formulas(values):
+    dates = pd.date_range("2024-01-01", periods=len(values), freq="B")
+    streamed = stream(dates, values)
+    for day in range(len(values)):
+        assert_metrics_equal(batch_metrics(dates[: day + 1], values[: day + 1]), streamed[day])
+
+
+def test_zero_value_does_not_raise_and_gives_full_drawdown():
+    dates = pd.date_range("2024-01-01", periods=4, freq="B")
+    metrics = stream(dates, [100.0, 80.0, 0.0, 0.0])[-1]
+    assert metrics["max_drawdown"] == -100.0
+    assert metrics["max_drawdown_date"] == "2024-01-03"
+
+
+def test_running_moments_match_pandas_and_handle_infinities():
+    moments = RunningMoments()
+    assert math.isnan(moments.std)
+    for value in [1.0, 2.0, 4.0]:
+        moments.add(value)
+    assert moments.mean == pytest.approx(pd.Series([1.0, 2.0, 4.0]).mean())
+    assert moments.std == pytest.approx(pd.Series([1.0, 2.0, 4.0]).std())
+
+    moments.add(math.inf)
+    assert moments.mean == math.inf and math.isnan(moments.std)
+    moments.add(-math.inf)
+    assert math.isnan(moments.mean)
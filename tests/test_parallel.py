@@ -0,0 +1,89 @@
+import contextvars
+import threading
+import time
+
+import pytest
+
+from src.utils.parallel import SKIP, map_tickers
+
+TICKERS = ["AAPL", "MSFT", "GOOG", "AMZN", "NVDA", "META"]
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_results_follow_ticker_order_not_completion_order():
+    # Earlier tickers finish last
+    delays = {ticker: 0.01 * (len(TICKERS) - i) for i, ticker in enumerate(TICKERS)}
+    finished = []
+
+    def analyze(ticker):
+        time.sleep(delays[ticker])
+        finished.append(ticker)
+        return ticker.lower()
+
+    results = map_tickers(analyze, TICKERS, max_workers=len(TICKERS))
+    assert list(results) == TICKERS
+    assert list(results.values()) == [ticker.lower() for ticker in TICKERS]
+    assert finished != TICKERS
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_skip_leaves_a_ticker_out_but_none_is_kept(max_workers):
+    results = map_tickers(lambda ticker: SKIP if ticker == "MSFT" else None if ticker == "GOOG" else 1, TICKERS, max_workers=max_workers)
+    assert list(results) == ["AAPL", "GOOG", "AMZN", "NVDA", "META"]
+    assert results["GOOG"] is None
+
+
+def test_first_exception_in_ticker_order_is_raised_after_every_call_finished():
+    finished = []
+
+    def analyze(ticker):
+        if ticker == "AMZN":
+            raise KeyError(ticker)
+        if ticker == "MSFT":
+            time.sleep(0.05)
+            raise ValueError(ticker)
+        time.sleep(0.02)
+        finished.append(ticker)
+        return ticker
+
+    with pytest.raises(ValueError, match="MSFT"):
+        map_tickers(analyze, TICKERS, max_workers=3)
+    assert sorted(finished) == sorted(["AAPL", "GOOG", "NVDA", "META"])
+
+
+def test_calls_run_in_a_copy_of_the_callers_context():
+    def analyze(ticker):
+        seen = request_id.get()
+        request_id.set(ticker)
+        return seen
+
+    token = request_id.set("backtest-1")
+    try:
+        assert set(map_tickers(analyze, TICKERS, max_workers=3).values()) == {"backtest-1"}
+        assert request_id.get() == "backtest-1"
+    finally:
+        request_id.reset(token)
+
+
+def test_concurrency_is_bounded(monkeypatch):
+    monkeypatch.setenv("AGENT_TICKER_CONCURRENCY", "2")
+    lock = threading.Lock()
+    active, peak = 0, 0
+
+    def analyze(ticker):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return ticker
+
+    assert list(map_tickers(analyze, TICKERS)) == TICKERS
+    assert peak == 2
+
+
+def test_no_tickers():
+    assert map_tickers(lambda ticker: ticker, []) == {}
@@ -0,0 +1,216 @@
+import json
+import threading
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+import src.utils.persona as persona
+from src.llm.scheduler import estimate_tokens
+from src.utils.persona import BATCH_HUMAN_PROMPT, analyses_through, OUTPUT_TOKENS_PER_TICKER, generate_persona_signals, is_borderline, plan_batches, rule_based_signal
+
+SYSTEM_PROMPT = "You are a value investor."
+TICKERS = ["AAPL", "MSFT", "GOOG", "AMZN", "NVDA"]
+
+
+class Signal(BaseModel):
+    signal: str
+    confidence: float
+    reasoning: str
+
+
+class NoProgress:
+    def update_status(self, *args, **kwargs):
+        pass
+
+
+class StubLLM:
+    """Records every LLM call; batched responses leave out the tickers in `omit`."""
+
+    def __init__(self, omit: tuple[str, ...] = ()):
+        self.omit = omit
+        self.batches = []
+        self.singles = []
+        self._lock = threading.Lock()
+
+    def batch_response(self, prompt, pydantic_model):
+        tickers = json.loads(prompt.to_messages()[1].content.split("Analysis Data by ticker:")[1].split("Return JSON")[0])
+        with self._lock:
+            self.batches.append(list(tickers))
+        signals = {ticker: Signal(signal="bullish", confidence=70, reasoning="batched") for ticker in tickers if ticker not in self.omit}
+        return pydantic_model(signals=signals)
+
+    def __call__(self, prompt, pydantic_model, **kwargs):
+        if pydantic_model is Signal:
+            with self._lock:
+                self.singles.append(prompt)
+            return Signal(signal="bearish", confidence=40, reasoning="single")
+        return self.batch_response(prompt, pydantic_model)
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    monkeypatch.setattr(persona, "progress", NoProgress())
+    monkeypatch.delenv("LLM_ASYNC", raising=False)
+    stub = StubLLM()
+    monkeypatch.setattr(persona, "call_llm", stub)
+
+    async def acall_llm(**kwargs):
+        return stub(**kwargs)
+
+    monkeypatch.setattr(persona, "acall_llm", acall_llm)
+    return stub
+
+
+def analysis(score: float = 5, max_score: float = 10, signal: str = "neutral") -> dict:
+    return {"signal": signal, "score": score, "max_score": max_score, "details": "x" * 200}
+
+
+def generate(tickers=TICKERS, signal_mode="llm", thresholds=persona.DEFAULT_SIGNAL_THRESHOLDS, data=None):
+    data = data or {ticker: analysis() for ticker in tickers}
+    return generate_persona_signals(
+        agent_name="test_agent",
+        persona="Test Investor",
+        analysis_data=data,
+        system_prompt=SYSTEM_PROMPT,
+        signal_model=Signal,
+        generate_single=lambda ticker, llm_call: llm_call(prompt=ticker, model_name="gpt-4o", model_provider="OpenAI", pydantic_model=Signal),
+        model_name="gpt-4o",
+        model_provider="OpenAI",
+        signal_mode=signal_mode,
+        thresholds=thresholds,
+    )
+
+
+def ticker_cost(ticker: str) -> int:
+    return estimate_tokens(json.dumps({ticker: analysis()}, indent=2)) + OUTPUT_TOKENS_PER_TICKER
+
+
+def context_window_for(tickers_per_batch: int) -> int:
+    """The smallest context window whose budget (half of it, minus the prompt) fits tickers_per_batch tickers."""
+    return 2 * (estimate_tokens(SYSTEM_PROMPT + BATCH_HUMAN_PROMPT) + tickers_per_batch * ticker_cost("AAPL"))
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_ticker_missing_from_a_batch_falls_back_to_one_call(llm, monkeypatch, use_async):
+    monkeypatch.setenv("PERSONA_MAX_BATCH_SIZE", "5")
+    monkeypatch.setenv("LLM_ASYNC", "true" if use_async else "false")
+    llm.omit = ("GOOG",)
+
+    signals = generate()
+
+    assert llm.batches == [TICKERS]
+    assert llm.singles == ["GOOG"]
+    assert signals["GOOG"] == {"signal": "bearish", "confidence": 40, "reasoning": "single"}
+    assert all(signals[ticker]["reasoning"] == "batched" for ticker in TICKERS if ticker != "GOOG")
+    assert list(signals) == TICKERS
+
+
+def test_batch_size_one_calls_per_ticker(llm, monkeypatch):
+    monkeypatch.setenv("PERSONA_MAX_BATCH_SIZE", "1")
+    generate()
+    assert llm.batches == []
+    assert sorted(llm.singles) == sorted(TICKERS)
+
+
+@pytest.mark.parametrize("tickers_per_batch, expected", [(1, [[t] for t in TICKERS]), (2, [TICKERS[:2], TICKERS[2:4], TICKERS[4:]]), (5, [TICKERS])])
+def test_batches_are_split_to_fit_the_context_window(llm, monkeypatch, tickers_per_batch, expected):
+    monkeypatch.setenv("PERSONA_MAX_BATCH_SIZE", "10")
+    monkeypatch.setattr(persona, "get_model_info", lambda model_name: SimpleNamespace(context_window=context_window_for(tickers_per_batch)))
+
+    assert plan_batches({ticker: analysis() for ticker in TICKERS}, SYSTEM_PROMPT, "gpt-4o", 10) == expected
+    generate()
+    assert sorted(llm.batches) == sorted(expected)
+    assert llm.singles == []
+
+
+def test_budget_one_token_short_moves_a_ticker_to_the_next_batch(monkeypatch):
+    monkeypatch.setattr(persona, "get_model_info", lambda model_name: SimpleNamespace(context_window=context_window_for(2) - 2))
+    assert plan_batches({ticker: analysis() for ticker in TICKERS[:2]}, SYSTEM_PROMPT, "gpt-4o", 10) == [["AAPL"], ["MSFT"]]
+
+
+def test_max_batch_size_caps_a_batch(monkeypatch):
+    monkeypatch.setattr(persona, "get_model_info", lambda model_name: SimpleNamespace(context_window=1_000_000))
+    assert plan_batches({ticker: analysis() for ticker in TICKERS}, SYSTEM_PROMPT, "gpt-4o", 2) == [TICKERS[:2], TICKERS[2:4], TICKERS[4:]]
+
+
+# Thresholds of the 0-10 scored personas (Munger, Lynch, Fisher, Druckenmiller)
+PERSONA_THRESHOLDS = (0.75, 0.45)
+
+
+@pytest.mark.parametrize(
+    "data, confidence",
+    [
+        (analysis(8, signal="bullish"), 80.0),
+        (analysis(3, signal="bearish"), 70.0),
+        # Neutral is most confident midway between the thresholds and falls off linearly towards them
+        (analysis(6, signal="neutral"), 100.0),
+        (analysis(7, signal="neutral"), 66.7),
+        (analysis(4.5, signal="neutral"), 50.0),
+        # Scores outside [0, max_score] are clamped, and a missing score counts as midway
+        (analysis(12, signal="bullish"), 100.0),
+        (analysis(-2, signal="bearish"), 100.0),
+        (analysis(None, signal="neutral"), 66.7),
+        (analysis(5, 0, signal="bullish"), 50.0),
+    ],
+)
+def test_rule_based_confidence(data, confidence):
+    signal = rule_based_signal(data, PERSONA_THRESHOLDS)
+    assert signal["signal"] == data["signal"]
+    assert signal["confidence"] == confidence
+    assert signal["reasoning"] == f"Rule-based signal: score {data['score']} of {data['max_score']}"
+
+
+@pytest.mark.parametrize(
+    "score, borderline",
+    [(7.0, True), (7.5, True), (8.0, True), (8.1, False), (6.9, False), (6.0, False), (5.0, True), (4.0, True), (3.9, False), (None, True)],
+)
+def test_is_borderline_for_persona_thresholds(score, borderline):
+    assert is_borderline(analysis(score), PERSONA_THRESHOLDS, margin=0.05) is borderline
+
+
+def test_is_borderline_without_margin_only_at_a_threshold():
+    assert is_borderline(analysis(7.5), PERSONA_THRESHOLDS, margin=0)
+    assert not is_borderline(analysis(7.4), PERSONA_THRESHOLDS, margin=0)
+
+
+@pytest.mark.parametrize("batch_size", ["1", "5"])
+def test_rules_mode_makes_no_llm_calls(llm, monkeypatch, batch_size):
+    monkeypatch.setenv("PERSONA_MAX_BATCH_SIZE", batch_size)
+    data = {"AAPL": analysis(8, signal="bullish"), "MSFT": analysis(7.5, signal="bullish"), "GOOG": analysis(2, signal="bearish")}
+
+    signals = generate(signal_mode="rules", thresholds=PERSONA_THRESHOLDS, data=data)
+
+    assert llm.batches == [] and llm.singles == []
+    assert signals == {ticker: rule_based_signal(data[ticker], PERSONA_THRESHOLDS) for ticker in data}
+
+
+def test_hybrid_mode_asks_the_llm_only_for_borderline_tickers(llm, monkeypatch):
+    monkeypatch.setenv("SIGNAL_HYBRID_MARGIN", "0.05")
+    data = {
+        "AAPL": analysis(9, signal="bullish"),
+        "MSFT": analysis(7.3, signal="neutral"),
+        "GOOG": analysis(6, signal="neutral"),
+        "AMZN": analysis(4.6, signal="neutral"),
+        "NVDA": analysis(1, signal="bearish"),
+    }
+
+    signals = generate(signal_mode="hybrid", thresholds=PERSONA_THRESHOLDS, data=data)
+
+    assert sorted(llm.singles) == ["AMZN", "MSFT"]
+    for ticker in ("AAPL", "GOOG", "NVDA"):
+        assert signals[ticker] == rule_based_signal(data[ticker], PERSONA_THRESHOLDS)
+    assert signals["MSFT"]["reasoning"] == signals["AMZN"]["reasoning"] == "single"
+    assert list(signals) == list(data)
+
+
+def test_unknown_signal_mode_is_rejected(llm):
+    with pytest.raises(ValueError, match="Unknown signal mode"):
+        generate(signal_mode="vibes")
+
+
+def test_each_prompt_gets_the_analyses_up_to_its_ticker():
+    data = {ticker: analysis(i) for i, ticker in enumerate(TICKERS)}
+    assert analyses_through(data, "AAPL") == {"AAPL": data["AAPL"]}
+    assert list(analyses_through(data, "GOOG")) == ["AAPL", "MSFT", "GOOG"]
+    assert analyses_through(data, "NVDA") == data
@@ -0,0 +1,174 @@
+import random
+
+import numpy as np
+import pytest
+
+from src.portfolio_engine import BUY, COVER, HOLD, SELL, SHORT, PortfolioEngine
+
+
+class ReferencePortfolio:
+    """The per-ticker dict accounting the engine replaced, kept as the reference for its results."""
+
+    def __init__(self, tickers, cash, margin_requirement):
+        self.tickers = tickers
+        self.cash = cash
+        self.margin_used = 0.0
+        self.margin_requirement = margin_requirement
+        self.positions = {t: {"long": 0, "short": 0, "long_cost_basis": 0.0, "short_cost_basis": 0.0, "short_margin_used": 0.0} for t in tickers}
+        self.realized_gains = {t: {"long": 0.0, "short": 0.0} for t in tickers}
+
+    def execute_trade(self, ticker, action, quantity, price):
+        if quantity <= 0:
+            return 0
+        quantity = int(quantity)
+        position = self.positions[ticker]
+
+        if action == "buy":
+            if quantity * price > self.cash:
+                quantity = int(self.cash / price)
+                if quantity <= 0:
+                    return 0
+            cost = quantity * price
+            total_shares = position["long"] + quantity
+            if total_shares > 0:
+                position["long_cost_basis"] = (position["long_cost_basis"] * position["long"] + cost) / total_shares
+            position["long"] += quantity
+            self.cash -= cost
+            return quantity
+
+        if action == "sell":
+            quantity = min(quantity, position["long"])
+            if quantity > 0:
+                avg_cost_per_share = position["long_cost_basis"] if position["long"] > 0 else 0
+                self.realized_gains[ticker]["long"] += (price - avg_cost_per_share) * quantity
+                position["long"] -= quantity
+                self.cash += quantity * price
+                if position["long"] == 0:
+                    position["long_cost_basis"] = 0.0
+                return quantity
+
+        elif action == "short":
+            proceeds = price * quantity
+            margin_required = proceeds * self.margin_requirement
+            if margin_required > self.cash:
+                ratio = self.margin_requirement
+                quantity = int(self.cash / (price * ratio)) if ratio > 0 else 0
+                if quantity <= 0:
+                    return 0
+                proceeds = price * quantity
+                margin_required = proceeds * ratio
+            total_shares = position["short"] + quantity
+            if total_shares > 0:
+                position["short_cost_basis"] = (position["short_cost_basis"] * position["short"] + price * quantity) / total_shares
+            position["short"] += quantity
+            position["short_margin_used"] += margin_required
+            self.margin_used += margin_required
+            self.cash += proceeds
+            self.cash -= margin_required
+            return quantity
+
+        elif action == "cover":
+            quantity = min(quantity, position["short"])
+            if quantity > 0:
+                cover_cost = quantity * price
+                avg_short_price = position["short_cost_basis"] if position["short"] > 0 else 0
+                portion = quantity / position["short"] if position["short"] > 0 else 1.0
+                margin_to_release = portion * position["short_margin_used"]
+                position["short"] -= quantity
+                position["short_margin_used"] -= margin_to_release
+                self.margin_used -= margin_to_release
+                self.cash += margin_to_release
+                self.cash -= cover_cost
+                self.realized_gains[ticker]["short"] += (avg_short_price - price) * quantity
+                if position["short"] == 0:
+                    position["short_cost_basis"] = 0.0
+                    position["short_margin_used"] = 0.0
+                return quantity
+        return 0
+
+    def total_value(self, prices):
+        total = self.cash
+        for ticker in self.tickers:
+            position = self.positions[ticker]
+            total += position["long"] * prices[ticker]
+            if position["short"] > 0:
+                total += position["short"] * (position["short_cost_basis"] - prices[ticker])
+        return total
+
+    def to_dict(self):
+        return {
+            "cash": self.cash,
+            "margin_used": self.margin_used,
+            "margin_requirement": self.margin_requirement,
+            "positions": self.positions,
+            "realized_gains": self.realized_gains,
+        }
+
+
+def random_day(rnd, tickers):
+    prices = {t: round(rnd.uniform(1, 500), 2) for t in tickers}
+    decisions = {
+        t: {"action": rnd.choice(["buy", "sell", "short", "cover", "hold", "unknown"]), "quantity": rnd.choice([0, 0.5, 1, 3, 10, 50, 200, 5000, -3])}
+        for t in tickers
+        if rnd.random() < 0.9
+    }
+    return prices, decisions
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_engine_matches_reference_accounting(seed):
+    rnd = random.Random(seed)
+    tickers = [f"T{i}" for i in range(12)]
+    margin_requirement = rnd.choice([0.0, 0.5, 1.0])
+    cash = rnd.choice([1e3, 1e5, 1e7])
+    reference = ReferencePortfolio(tickers, cash, margin_requirement)
+    engine = PortfolioEngine(tickers, cash, margin_requirement)
+
+    for _ in range(40):
+        prices, decisions = random_day(rnd, tickers)
+        expected = [reference.execute_trade(t, decisions.get(t, {}).get("action", "hold"), decisions.get(t, {}).get("quantity", 0), prices[t]) for t in tickers]
+        price_array = np.array([prices[t] for t in tickers])
+        actions, quantities = engine.encode_decisions(decisions)
+        executed = engine.execute_trades(actions, quantities, price_array)
+
+        assert executed.tolist() == expected
+        assert engine.to_dict() == reference.to_dict()
+        assert engine.total_value(price_array) == reference.total_value(prices)
+        long_exposure = sum(reference.positions[t]["long"] * prices[t] for t in tickers)
+        short_exposure = sum(reference.positions[t]["short"] * prices[t] for t in tickers)
+        assert engine.exposures(price_array) == (long_exposure, short_exposure)
+
+
+def test_affordable_trades_take_the_vectorized_path():
+    engine = PortfolioEngine(["A", "B"], 10000.0, 0.5)
+    assert engine._execute_vectorized(np.array([BUY, SHORT]), np.array([10.0, 10.0]), np.array([100.0, 50.0]))
+    assert engine.long.tolist() == [10, 0] and engine.short.tolist() == [0, 10]
+    assert engine.cash == 10000.0 - 1000.0 + 500.0 - 250.0
+    assert engine.margin_used == 250.0
+
+
+def test_unaffordable_buy_falls_back_to_partial_fill():
+    engine = PortfolioEngine(["A", "B"], 1000.0)
+    actions, quantities, prices = np.array([BUY, BUY]), np.array([8.0, 5.0]), np.array([100.0, 100.0])
+    assert not engine._execute_vectorized(actions, quantities, prices)
+    # The rejected fast path leaves the portfolio unchanged
+    assert engine.cash == 1000.0 and engine.long.tolist() == [0, 0]
+
+    assert engine.execute_trades(actions, quantities, prices).tolist() == [8, 2]
+    assert engine.cash == 0.0
+
+
+def test_sell_and_cover_are_capped_at_the_position():
+    engine = PortfolioEngine(["A"], 10000.0, 0.5)
+    engine.execute_trades(np.array([BUY]), np.array([5.0]), np.array([10.0]))
+    assert engine.execute_trades(np.array([SELL]), np.array([50.0]), np.array([12.0])).tolist() == [5]
+    assert engine.realized_long.tolist() == [10.0]
+    assert engine.long_cost_basis.tolist() == [0.0]
+    assert engine.execute_trades(np.array([COVER]), np.array([3.0]), np.array([12.0])).tolist() == [0]
+
+
+def test_encode_decisions_treats_missing_and_unknown_actions_as_hold():
+    engine = PortfolioEngine(["A", "B", "C"], 0.0)
+    actions, quantities = engine.encode_decisions({"A": {"action": "buy", "quantity": 3}, "B": {"action": "moon", "quantity": 9}, "Z": {"action": "sell"}})
+    assert actions.tolist() == [BUY, HOLD, HOLD]
+    assert quantities.tolist() == [3.0, 9.0, 0.0]
@@ -0,0 +1,91 @@
+import datetime
+import json
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+import pytest
+import requests
+
+import src.tools.api as api
+import src.tools.http_client as http_client
+from src.data.cache import Cache, create_backend_from_env
+from src.tools.http_client import FinancialDatasetsClient, RequestArchive
+
+
+def fake_prices_response(method, url, **kwargs):
+    """Serve one price row per business day of the requested range."""
+    query = parse_qs(urlparse(url).query)
+    days = pd.bdate_range(query["start_date"][0], query["end_date"][0])
+    rows = [{"open": 1.0, "close": 2.0 + i, "high": 3.0, "low": 0.5, "volume": 100, "time": f"{day.date()}T00:00:00Z"} for i, day in enumerate(days)]
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"ticker": query["ticker"][0], "prices": rows}).encode("utf-8")
+    response.encoding = "utf-8"
+    return response
+
+
+def fetch_all():
+    # The second call overlaps the first, so only its missing sub-range is requested
+    return [api.get_price_frame("AAPL", "2024-01-01", "2024-01-31"), api.get_price_frame("AAPL", "2024-01-15", "2024-02-15")]
+
+
+def freeze_today(monkeypatch, today: datetime.date):
+    class FrozenDate(datetime.date):
+        @classmethod
+        def today(cls):
+            return today
+
+    monkeypatch.setattr("src.data.cache.datetime.date", FrozenDate)
+
+
+@pytest.fixture
+def use_client(monkeypatch):
+    def install(client):
+        monkeypatch.setattr(http_client, "_client", client)
+        monkeypatch.setattr(api, "_cache", Cache())
+
+    return install
+
+
+def test_record_clear_replay_round_trip(tmp_path, monkeypatch, use_client):
+    archive_path = str(tmp_path / "archive.jsonl.gz")
+
+    monkeypatch.setenv("FINANCIAL_DATASETS_MODE", "record")
+    recorder = FinancialDatasetsClient(mode="record", archive=RequestArchive(archive_path), base_url="http://mock")
+    monkeypatch.setattr(recorder.session, "request", fake_prices_response)
+    use_client(recorder)
+    # Recorded while part of the requested range was still in the future
+    freeze_today(monkeypatch, datetime.date(2024, 1, 20))
+    recorded = fetch_all()
+
+    # Replay on a clean cache, on another day, with no network
+    monkeypatch.setenv("FINANCIAL_DATASETS_MODE", "replay")
+    replayer = FinancialDatasetsClient(mode="replay", archive=RequestArchive(archive_path), base_url="http://mock")
+    monkeypatch.setattr(replayer.session, "request", lambda *args, **kwargs: pytest.fail("replay touched the network"))
+    use_client(replayer)
+    freeze_today(monkeypatch, datetime.date(2024, 2, 10))
+    replayed = fetch_all()
+
+    for expected, actual in zip(recorded, replayed):
+        pd.testing.assert_frame_equal(expected, actual)
+
+
+def test_replay_of_unrecorded_request_raises(tmp_path):
+    archive_path = tmp_path / "archive.jsonl.gz"
+    client = FinancialDatasetsClient(mode="record", archive=RequestArchive(str(archive_path)))
+    client.archive.record("GET", "http://mock/a", None, fake_prices_response("GET", "http://mock/?ticker=A&start_date=2024-01-02&end_date=2024-01-02"))
+
+    archive = RequestArchive(str(archive_path))
+    assert archive.replay("GET", "http://mock/a").status_code == 200
+    with pytest.raises(Exception, match="No recorded response"):
+        archive.replay("GET", "http://mock/b")
+
+
+@pytest.mark.parametrize("mode", ["record", "replay"])
+def test_archive_modes_bypass_the_persistent_cache(tmp_path, monkeypatch, mode):
+    monkeypatch.setenv("FINANCIAL_DATA_CACHE_PATH", str(tmp_path / "cache.db"))
+    monkeypatch.setenv("FINANCIAL_DATASETS_MODE", mode)
+    assert create_backend_from_env() is None
+
+    monkeypatch.setenv("FINANCIAL_DATASETS_MODE", "live")
+    assert create_backend_from_env() is not None
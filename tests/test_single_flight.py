@@ -0,0 +1,149 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from src.tools.single_flight import SingleFlight, _freeze, coalesce, get_single_flight
+
+
+def test_concurrent_calls_with_same_key_run_once():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return "result"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do(("key",), fetch)))
+    leader.start()
+    assert started.wait(timeout=5)
+
+    followers = [threading.Thread(target=lambda: results.append(flight.do(("key",), fetch))) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    # Followers register as absorbed before the leader finishes
+    deadline = time.monotonic() + 5
+    while flight.stats()["absorbed"] < 4 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(timeout=5)
+
+    assert calls == [1]
+    assert results == ["result"] * 5
+    assert flight.stats() == {"executed": 1, "absorbed": 4, "in_flight": 0}
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do(("a",), lambda: 1) == 1
+    assert flight.do(("b",), lambda: 2) == 2
+    assert flight.stats()["executed"] == 2
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+    for _ in range(3):
+        flight.do(("key",), calls.append, 1)
+    assert len(calls) == 3
+
+
+def test_error_is_shared_with_waiters_and_key_is_released():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(timeout=5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def run():
+        try:
+            flight.do(("key",), failing)
+        except ValueError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=run)
+    leader.start()
+    assert started.wait(timeout=5)
+    follower = threading.Thread(target=run)
+    follower.start()
+    while flight.stats()["absorbed"] < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join(timeout=5)
+    follower.join(timeout=5)
+
+    assert errors == ["boom", "boom"]
+    assert flight.stats()["in_flight"] == 0
+    # The failed key can be fetched again
+    assert flight.do(("key",), lambda: "ok") == "ok"
+
+
+def test_coalesce_returns_a_separate_list_per_caller():
+    @coalesce
+    def fetch(ticker: str, fields: list[str] | None = None):
+        return [ticker]
+
+    first = fetch("AAPL", fields=["a"])
+    first.append("mutated")
+    assert fetch("AAPL", fields=["a"]) == ["AAPL"]
+
+
+def test_coalesce_returns_a_separate_frame_to_each_concurrent_caller():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    @coalesce
+    def get_frame(ticker: str) -> pd.DataFrame:
+        calls.append(ticker)
+        started.set()
+        release.wait(timeout=5)
+        return pd.DataFrame({"close": [1.0, 2.0, 3.0]})
+
+    absorbed = get_single_flight().stats()["absorbed"]
+    frames = []
+    threads = [threading.Thread(target=lambda: frames.append(get_frame("AAPL"))) for _ in range(4)]
+    threads[0].start()
+    assert started.wait(timeout=5)
+    for thread in threads[1:]:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while get_single_flight().stats()["absorbed"] < absorbed + 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == ["AAPL"]
+    assert len({id(frame) for frame in frames}) == 4
+    # Adding indicator columns to one caller's frame, like calculate_adx does, leaves the others untouched
+    frames[0]["tr"] = frames[0]["close"].diff()
+    frames[0].loc[0, "close"] = 99.0
+    for frame in frames[1:]:
+        assert list(frame.columns) == ["close"]
+        assert frame["close"].tolist() == [1.0, 2.0, 3.0]
+
+
+@pytest.mark.parametrize(
+    "value, frozen",
+    [
+        ([1, [2, 3]], (1, (2, 3))),
+        ({"b": 1, "a": [2]}, (("a", (2,)), ("b", 1))),
+        ("text", "text"),
+    ],
+)
+def test_freeze_makes_arguments_hashable(value, frozen):
+    assert _freeze(value) == frozen
+    hash(_freeze(value))
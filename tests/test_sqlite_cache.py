@@ -0,0 +1,172 @@
+import json
+import sqlite3
+
+import pytest
+
+import src.data.cache as cache_module
+from src.data.cache import CacheBackend, SQLiteCacheBackend, create_backend_from_env
+
+
+class Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "cache" / "financial_data.db")
+
+
+def entry_size(value) -> int:
+    return len(json.dumps(value))
+
+
+def test_cache_backend_is_abstract():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+
+def test_values_round_trip_and_persist(path):
+    backend = SQLiteCacheBackend(path)
+    backend.set("prices", "AAPL", {"close": [1.5, 2.5]})
+    backend.set("prices", "AAPL", {"close": [3.5]})
+
+    assert SQLiteCacheBackend(path).get("prices", "AAPL") == {"close": [3.5]}
+    assert backend.get("prices", "MSFT") is None
+    assert backend.get("company_news", "AAPL") is None
+
+
+def test_entries_expire_after_their_dataset_ttl(path, clock):
+    backend = SQLiteCacheBackend(path, ttls={"prices": 60, "line_items": 3600})
+    backend.set("prices", "AAPL", [1])
+    backend.set("line_items", "AAPL", [2])
+
+    clock.now += 60
+    assert backend.get("prices", "AAPL") == [1]
+    clock.now += 1
+    assert backend.get("prices", "AAPL") is None
+    assert backend.get("line_items", "AAPL") == [2]
+    # Expired entries are deleted, not just hidden
+    clock.now -= 61
+    assert backend.get("prices", "AAPL") is None
+
+
+def test_eviction_drops_least_recently_accessed_entries(path, clock):
+    value = "x" * 100
+    backend = SQLiteCacheBackend(path, max_size_bytes=3 * entry_size(value))
+    for key in ("a", "b", "c"):
+        clock.now += 1
+        backend.set("prices", key, value)
+
+    # Reading "a" makes "b" the least recently used entry
+    clock.now += 1
+    assert backend.get("prices", "a") == value
+    clock.now += 1
+    backend.set("prices", "d", value)
+
+    assert backend.get("prices", "b") is None
+    assert [backend.get("prices", key) for key in ("a", "c", "d")] == [value] * 3
+
+
+def test_clear_one_dataset_or_everything(path):
+    backend = SQLiteCacheBackend(path)
+    backend.set("prices", "AAPL", [1])
+    backend.set("company_news", "AAPL", [2])
+
+    backend.clear("prices")
+    assert backend.get("prices", "AAPL") is None
+    assert backend.get("company_news", "AAPL") == [2]
+    backend.clear()
+    assert backend.get("company_news", "AAPL") is None
+
+
+def test_read_only_backend_reads_without_changing_the_store(path, clock):
+    writer = SQLiteCacheBackend(path, ttls={"prices": 60})
+    writer.set("prices", "AAPL", [1])
+    writer.set("prices", "MSFT", [2])
+    reader = SQLiteCacheBackend(path, ttls={"prices": 60}, read_only=True)
+
+    reader.set("prices", "GOOG", [3])
+    reader.clear()
+    assert writer.get("prices", "GOOG") is None
+    assert reader.get("prices", "AAPL") == [1]
+
+    # Expired entries are hidden from the reader but left for a writer to delete
+    clock.now += 61
+    assert reader.get("prices", "MSFT") is None
+    count = sqlite3.connect(path).execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+    assert count == 2
+
+
+def test_read_only_backend_needs_an_existing_store(path):
+    with pytest.raises(sqlite3.OperationalError):
+        SQLiteCacheBackend(path, read_only=True)
+
+
+def test_merge_from_copies_and_replaces_entries(path, tmp_path):
+    backend = SQLiteCacheBackend(path)
+    backend.set("llm_responses", "kept", {"text": "kept"})
+    backend.set("llm_responses", "replaced", {"text": "old"})
+    other_path = str(tmp_path / "worker.db")
+    other = SQLiteCacheBackend(other_path)
+    other.set("llm_responses", "replaced", {"text": "new"})
+    other.set("llm_responses", "added", {"text": "added"})
+
+    backend.merge_from(other_path)
+    assert backend.get("llm_responses", "kept") == {"text": "kept"}
+    assert backend.get("llm_responses", "replaced") == {"text": "new"}
+    assert backend.get("llm_responses", "added") == {"text": "added"}
+
+    # The other database is detached again, so a second merge works too
+    backend.merge_from(other_path)
+    SQLiteCacheBackend(path, read_only=True).merge_from(other_path)
+
+
+def test_merge_from_evicts_down_to_the_size_limit(path, tmp_path, clock):
+    value = "x" * 100
+    backend = SQLiteCacheBackend(path, max_size_bytes=2 * entry_size(value))
+    backend.set("prices", "old", value)
+    other_path = str(tmp_path / "worker.db")
+    other = SQLiteCacheBackend(other_path)
+    for key in ("new1", "new2"):
+        clock.now += 1
+        other.set("prices", key, value)
+
+    backend.merge_from(other_path)
+    assert backend.get("prices", "old") is None
+    assert backend.get("prices", "new1") == backend.get("prices", "new2") == value
+
+
+def test_merge_from_a_missing_table_leaves_the_store_usable(path, tmp_path):
+    backend = SQLiteCacheBackend(path)
+    backend.set("prices", "AAPL", [1])
+    with pytest.raises(sqlite3.OperationalError):
+        backend.merge_from(str(tmp_path / "empty.db"))
+    backend.set("prices", "MSFT", [2])
+    assert backend.get("prices", "AAPL") == [1]
+    assert backend.get("prices", "MSFT") == [2]
+
+
+def test_backend_from_env(tmp_path, monkeypatch, caplog):
+    monkeypatch.delenv("FINANCIAL_DATASETS_MODE", raising=False)
+    monkeypatch.setenv("FINANCIAL_DATA_CACHE_PATH", "")
+    assert create_backend_from_env() is None
+
+    monkeypatch.setenv("FINANCIAL_DATA_CACHE_PATH", str(tmp_path / "data.db"))
+    assert isinstance(create_backend_from_env(), SQLiteCacheBackend)
+
+    # A path that cannot be opened disables the cache with a warning
+    (tmp_path / "file").write_text("")
+    monkeypatch.setenv("FINANCIAL_DATA_CACHE_PATH", str(tmp_path / "file" / "data.db"))
+    assert create_backend_from_env() is None
+    assert "Persistent cache disabled" in caplog.text
@@ -0,0 +1,79 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+from pydantic import BaseModel
+
+import src.sweep as sweep
+from src.data.cache import SQLiteCacheBackend
+from src.llm.cache import create_llm_backend_from_env, create_llm_cache_from_env
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def test_expand_grid():
+    runs = sweep.expand_grid({"model_name": ["a", "b"], "window": [("2024-01-01", "2024-02-01")]})
+    assert runs == [
+        {"model_name": "a", "window": ("2024-01-01", "2024-02-01")},
+        {"model_name": "b", "window": ("2024-01-01", "2024-02-01")},
+    ]
+    with pytest.raises(ValueError, match="Unknown sweep parameters: analysts"):
+        sweep.expand_grid({"analysts": [["ben_graham"]]})
+
+
+@pytest.fixture
+def shared_llm_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_responses.db"))
+    monkeypatch.setenv("LLM_CACHE_MODE", "on")
+    monkeypatch.delenv("LLM_CACHE_WRITE_PATH", raising=False)
+    backend = create_llm_backend_from_env()
+    backend.set("llm_responses", "shared", {"text": "shared"})
+    return backend
+
+
+def test_write_path_keeps_new_responses_out_of_the_shared_cache(shared_llm_cache, tmp_path, monkeypatch):
+    (tmp_path / "workers").mkdir()
+    monkeypatch.setenv("LLM_CACHE_WRITE_PATH", str(tmp_path / "workers" / "worker.db"))
+    cache = create_llm_cache_from_env()
+
+    assert cache.backend.read_only
+    assert cache.get("shared", Answer) == Answer(text="shared")
+    cache.set("new", Answer(text="new"))
+    assert cache.get("new", Answer) == Answer(text="new")
+    assert shared_llm_cache.get("llm_responses", "new") is None
+
+    sweep.merge_llm_caches(shared_llm_cache, str(tmp_path / "workers"))
+    assert shared_llm_cache.get("llm_responses", "new") == {"text": "new"}
+
+
+def cache_responses(worker: int, count: int) -> int:
+    cache = create_llm_cache_from_env()
+    assert cache.get("shared", Answer) == Answer(text="shared")
+    for i in range(count):
+        cache.set(f"{worker}-{i}", Answer(text=f"{worker}-{i}"))
+    return os.getpid()
+
+
+def test_workers_cache_responses_in_their_own_files_and_the_parent_merges_them(shared_llm_cache, tmp_path):
+    data_path = str(tmp_path / "financial_data.db")
+    SQLiteCacheBackend(data_path)
+    llm_cache_dir = tmp_path / "workers"
+    llm_cache_dir.mkdir()
+
+    with ProcessPoolExecutor(
+        max_workers=4,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=sweep._init_worker,
+        initargs=(data_path, str(llm_cache_dir), False),
+    ) as executor:
+        pids = set(executor.map(cache_responses, range(8), [25] * 8))
+
+    assert sorted(os.listdir(llm_cache_dir)) == sorted(f"llm_responses_{pid}.db" for pid in pids)
+    sweep.merge_llm_caches(shared_llm_cache, str(llm_cache_dir))
+    for worker in range(8):
+        for i in range(25):
+            assert shared_llm_cache.get("llm_responses", f"{worker}-{i}") == {"text": f"{worker}-{i}"}
+    assert shared_llm_cache.get("llm_responses", "shared") == {"text": "shared"}